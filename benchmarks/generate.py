@@ -0,0 +1,243 @@
+"""
+    Generates synthetic ELF files for the benchmarks, in pure Python (no compiler or binutils needed).
+    The files are deterministic: the same parameters always generate the same bytes, so results of different
+    commits (and machines) are measured on identical input.
+
+    A generated file consists of one LOAD segment with the code, which is split into many small executable
+    sections, a symbol table with one FUNC symbol per slice of the code and the string tables.
+    Files with 0xff00 or more sections use the extended section numbering (e_shnum = 0, the amount of sections
+    is stored in the first section header).
+"""
+
+import argparse
+import bisect
+import os
+import random
+import struct
+
+# (isThirtyTwo, isLittleEndian) -> e_machine. Big endian files use PowerPC, like real MSB binaries
+MACHINES = {
+    (True, True): 3,       # 386
+    (False, True): 62,     # x86-64
+    (True, False): 20,     # PowerPC
+    (False, False): 21,    # PowerPC 64
+}
+
+SHN_LORESERVE = 0xff00
+SHN_ABS = 0xfff1
+SHN_XINDEX = 0xffff
+
+SHT_PROGBITS = 1
+SHT_SYMTAB = 2
+SHT_STRTAB = 3
+
+SHF_ALLOC = 0x2
+SHF_EXECINSTR = 0x4
+
+# Sections besides the code sections: NULL, .symtab, .strtab, .shstrtab
+FIXED_SECTIONS = 4
+
+
+def file_name(thirty_two: bool, little_endian: bool, sections: int, symbols: int, name_length: int, text_size: int,
+              seed: int = 0) -> str:
+    """
+        Name of a generated file, containing all parameters (used to reuse already generated files)
+    """
+    return f"synthetic-{32 if thirty_two else 64}-{'lsb' if little_endian else 'msb'}-{sections}sec-{symbols}sym-" \
+           f"{name_length}name-{text_size}text-{seed}.elf"
+
+
+def padded_name(prefix: str, index: int, length: int) -> bytes:
+    """
+        Returns a unique name of at least length characters (the index is padded with letters)
+    """
+    name = f"{prefix}{index}"
+    if len(name) < length:
+        name += "_" + "abcdefghijklmnopqrstuvwxyz"[index % 26] * (length - len(name) - 1)
+    return name.encode()
+
+
+def build_string_table(names: list[bytes]) -> tuple[bytearray, list[int]]:
+    """
+        Returns the string table (starting with the empty string) and the offset of every name
+    """
+    table = bytearray(b"\x00")
+    offsets = []
+    for name in names:
+        offsets.append(len(table))
+        table += name + b"\x00"
+    return table, offsets
+
+
+def align(value: int, alignment: int) -> int:
+    return (value + alignment - 1) & ~(alignment - 1)
+
+
+def code_range(thirty_two: bool, sections: int, text_size: int) -> tuple[int, int]:
+    """
+        Returns the virtual address and the size of the code of a generated file
+    """
+    header_size = 52 + 32 if thirty_two else 64 + 56
+    base = 0x08048000 if thirty_two else 0x400000
+    return base + align(header_size, 16), max(text_size, sections - FIXED_SECTIONS)
+
+
+def generate(path: str, thirty_two: bool = False, little_endian: bool = True, sections: int = 1000,
+             symbols: int = 10000, name_length: int = 24, text_size: int = 1024 * 1024, seed: int = 0) -> dict:
+    """
+        Writes a synthetic ELF file
+
+        Parameters:
+            path: str
+                Path of the generated file
+            thirty_two: bool (default=False)
+                Generate a 32-bit file instead of a 64-bit file
+            little_endian: bool (default=True)
+                Byte order of the file
+            sections: int (default=1000)
+                Total amount of sections (at least 5), including the NULL section and the string and symbol tables
+            symbols: int (default=10000)
+                Amount of symbols in .symtab (besides the NULL symbol)
+            name_length: int (default=24)
+                Minimal length of the symbol names, controls the size of .strtab
+            text_size: int (default=1 MB)
+                Size of the code, which is split into the code sections (random bytes)
+            seed: int (default=0)
+                Seed of the random code bytes
+
+        Returns:
+            dict
+                The parameters and facts about the file (size, base address, names of some sections and symbols)
+    """
+    if sections < FIXED_SECTIONS + 1:
+        raise ValueError(f"At least {FIXED_SECTIONS + 1} sections are needed")
+    code_sections = sections - FIXED_SECTIONS
+    text_address, text_size = code_range(thirty_two, sections, text_size)
+    order = "<" if little_endian else ">"
+    if thirty_two:
+        elf_header = struct.Struct(order + "16sHHIIIIIHHHHHH")
+        program_header = struct.Struct(order + "IIIIIIII")
+        section_header = struct.Struct(order + "IIIIIIIIII")
+        symbol = struct.Struct(order + "IIIBBH")
+    else:
+        elf_header = struct.Struct(order + "16sHHIQQQIHHHHHH")
+        program_header = struct.Struct(order + "IIQQQQQQ")
+        section_header = struct.Struct(order + "IIQQQQIIQQ")
+        symbol = struct.Struct(order + "IBBHQQ")
+
+    # File layout: ELF header, program header, code, .symtab, .strtab, .shstrtab, section header table.
+    # The file is mapped at base, so offsets and addresses of the code only differ by base
+    text_offset = align(elf_header.size + program_header.size, 16)
+    base = text_address - text_offset
+    symtab_offset = align(text_offset + text_size, 8)
+    symtab_size = (symbols + 1) * symbol.size
+
+    symbol_names = [padded_name("function_", i, name_length) for i in range(symbols)]
+    strtab, symbol_name_offsets = build_string_table(symbol_names)
+    strtab_offset = symtab_offset + symtab_size
+
+    section_names = [padded_name(".text.", i, 0) for i in range(code_sections)] + [b".symtab", b".strtab", b".shstrtab"]
+    shstrtab, section_name_offsets = build_string_table(section_names)
+    shstrtab_offset = strtab_offset + len(strtab)
+    shoff = align(shstrtab_offset + len(shstrtab), 8)
+    file_size = shoff + sections * section_header.size
+
+    data = bytearray(file_size)
+    symtab_index = code_sections + 1
+    shstrtab_index = symtab_index + 2
+    extended = sections >= SHN_LORESERVE
+    ident = b"\x7fELF" + bytes([1 if thirty_two else 2, 1 if little_endian else 2, 1]) + bytes(9)
+    elf_header.pack_into(data, 0, ident, 2, MACHINES[(thirty_two, little_endian)], 1, base + text_offset,
+                         elf_header.size, shoff, 0, elf_header.size, program_header.size, 1, section_header.size,
+                         0 if extended else sections, SHN_XINDEX if shstrtab_index >= SHN_LORESERVE else shstrtab_index)
+
+    # One LOAD segment (R E) from the start of the file to the end of the code
+    segment_size = text_offset + text_size
+    if thirty_two:
+        program_header.pack_into(data, elf_header.size, 1, 0, base, base, segment_size, segment_size, 5, 0x1000)
+    else:
+        program_header.pack_into(data, elf_header.size, 1, 5, 0, base, base, segment_size, segment_size, 0x1000)
+
+    data[text_offset:text_offset + text_size] = random.Random(seed).randbytes(text_size)
+
+    # The code is split evenly into the code sections, symbols are distributed evenly over the code
+    section_starts = [i * text_size // code_sections for i in range(code_sections + 1)]
+    symbol_size = max(1, text_size // max(symbols, 1))
+    position = symtab_offset + symbol.size
+    for i in range(symbols):
+        start = i * text_size // symbols
+        # Index of the code section containing the symbol (section 0 is NULL)
+        shndx = bisect.bisect_right(section_starts, start)
+        shndx = shndx if shndx < SHN_LORESERVE else SHN_ABS
+        # STB_GLOBAL, STT_FUNC
+        info = (1 << 4) | 2
+        if thirty_two:
+            symbol.pack_into(data, position, symbol_name_offsets[i], base + text_offset + start, symbol_size, info, 0, shndx)
+        else:
+            symbol.pack_into(data, position, symbol_name_offsets[i], info, 0, shndx, base + text_offset + start, symbol_size)
+        position += symbol.size
+
+    data[strtab_offset:strtab_offset + len(strtab)] = strtab
+    data[shstrtab_offset:shstrtab_offset + len(shstrtab)] = shstrtab
+
+    # Section header table. The first entry holds the amount of sections and the .shstrtab index, if they do not fit
+    # into the ELF header
+    def pack_section(index, name, sh_type, flags, address, offset, size, link, info, alignment, entry_size):
+        section_header.pack_into(data, shoff + index * section_header.size, name, sh_type, flags, address, offset,
+                                 size, link, info, alignment, entry_size)
+
+    pack_section(0, 0, 0, 0, 0, 0, sections if extended else 0,
+                 shstrtab_index if shstrtab_index >= SHN_LORESERVE else 0, 0, 0, 0)
+    for i in range(code_sections):
+        start, end = section_starts[i], section_starts[i + 1]
+        pack_section(i + 1, section_name_offsets[i], SHT_PROGBITS, SHF_ALLOC | SHF_EXECINSTR, base + text_offset + start,
+                     text_offset + start, end - start, 0, 0, 1, 0)
+    pack_section(symtab_index, section_name_offsets[code_sections], SHT_SYMTAB, 0, 0, symtab_offset, symtab_size,
+                 symtab_index + 1, 1, 8, symbol.size)
+    pack_section(symtab_index + 1, section_name_offsets[code_sections + 1], SHT_STRTAB, 0, 0, strtab_offset, len(strtab),
+                 0, 0, 1, 0)
+    pack_section(shstrtab_index, section_name_offsets[code_sections + 2], SHT_STRTAB, 0, 0, shstrtab_offset,
+                 len(shstrtab), 0, 0, 1, 0)
+
+    with open(path, "wb") as file:
+        file.write(data)
+
+    return {
+        "path": path,
+        "thirty_two": thirty_two,
+        "little_endian": little_endian,
+        "sections": sections,
+        "symbols": symbols,
+        "name_length": name_length,
+        "text_size": text_size,
+        "seed": seed,
+        "size": file_size,
+        "text_address": base + text_offset,
+        "section_names": [name.decode() for name in section_names],
+        "symbol_names": [name.decode() for name in symbol_names],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates a synthetic ELF file")
+    parser.add_argument("output", help="Path of the generated file (a directory: the name contains the parameters)")
+    parser.add_argument("--32", dest="thirty_two", action="store_true", help="Generate a 32-bit file")
+    parser.add_argument("--msb", action="store_true", help="Generate a big endian file")
+    parser.add_argument("--sections", type=int, default=1000, help="Total amount of sections")
+    parser.add_argument("--symbols", type=int, default=10000, help="Amount of symbols")
+    parser.add_argument("--name-length", type=int, default=24, help="Minimal length of the symbol names")
+    parser.add_argument("--text-size", type=int, default=1024 * 1024, help="Size of the code in bytes")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random code bytes")
+    args = parser.parse_args()
+
+    path = args.output
+    if os.path.isdir(path):
+        path = os.path.join(path, file_name(args.thirty_two, not args.msb, args.sections, args.symbols,
+                                            args.name_length, args.text_size, args.seed))
+    info = generate(path, args.thirty_two, not args.msb, args.sections, args.symbols, args.name_length,
+                    args.text_size, args.seed)
+    print(f"{path}: {info['size']} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""
+    Benchmarks twelfe on synthetic ELF files (see generate.py).
+    Times parsing, name resolution, the getters, read_at_address, the pattern search and the CLI, and reports the throughput
+    and the peak memory.
+    Results can be written as JSON and compared to the results of another commit, to catch regressions:
+
+        python3 benchmarks/run.py --output before.json --repo /tmp/twelfe-old
+        python3 benchmarks/run.py --compare before.json
+
+    The generated files only depend on their parameters, so both runs measure identical input.
+    The run fails, if a benchmark exceeds its budget (BUDGETS and RATIOS), for example the search of 50 patterns.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from generate import code_range, file_name, generate, padded_name
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Name -> parameters of generate (thirty_two, little_endian, sections, symbols, name_length, text_size)
+FILES = {
+    "tiny-64-lsb": (False, True, 10, 100, 24, 64 * 1024),
+    "medium-32-lsb": (True, True, 1000, 10000, 24, 1024 * 1024),
+    "medium-32-msb": (True, False, 1000, 10000, 24, 1024 * 1024),
+    "medium-64-lsb": (False, True, 1000, 10000, 24, 1024 * 1024),
+    "medium-64-msb": (False, False, 1000, 10000, 24, 1024 * 1024),
+    "large-64-lsb": (False, True, 100000, 500000, 64, 8 * 1024 * 1024),
+    "large-32-msb": (True, False, 100000, 500000, 64, 8 * 1024 * 1024),
+    # 100 MB of code for the pattern search
+    "search-64-lsb": (False, True, 100, 1000, 24, 100 * 1024 * 1024),
+}
+QUICK_FILES = ("tiny-64-lsb", "medium-64-lsb", "medium-32-msb")
+
+# Amount of lookups of the lookup benchmarks
+LOOKUPS = 1000
+
+# Search patterns with wildcards. Every pattern has another first byte
+SEARCH_PATTERNS = [f"{i * 5 % 256:02x} {(i * 37 + 1) % 256:02x} ?? {(i * 11 + 7) % 256:02x}" for i in range(50)]
+
+# (file, benchmark) -> maximum seconds. All patterns are searched in one pass over the 100 MB of code
+# (see twelfe.search.BYTE_SEARCH), so 50 patterns have to take well under a second
+BUDGETS = {("search-64-lsb", "search_50_patterns"): 1.0}
+# (file, benchmark, reference benchmark) -> maximum ratio of the times, independent of the speed of the machine
+RATIOS = {("search-64-lsb", "search_50_patterns", "search_5_patterns"): 3.0}
+
+# Runs read_twelfe.py in a fresh interpreter and prints its peak resident memory (KB)
+CLI_CODE = """
+import os, resource, runpy, sys
+repository, path = sys.argv[1:3]
+sys.path.insert(0, repository)
+sys.argv = [os.path.join(repository, "read_twelfe.py"), "-f", path, "-a"]
+stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+except SystemExit:
+    pass
+stdout.write(str(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+"""
+
+
+class BENCHMARK_FILE(object):
+    def __init__(self, name: str, path: str, parameters: tuple) -> None:
+        """
+            A generated file and the samples of its lookups (section names, symbol names and addresses, spread evenly)
+        """
+        thirty_two, little_endian, sections, symbols, name_length, text_size = parameters
+        self.name = name
+        self.path = path
+        self.parameters = parameters
+        self.sections = sections
+        self.symbols = symbols
+        self.size = os.path.getsize(path)
+        with open(path, "rb") as file:
+            self.data = bytearray(file.read())
+        self.section_names = [f".text.{i * (sections - 4) // LOOKUPS}" for i in range(LOOKUPS)]
+        self.symbol_names = [padded_name("function_", i * symbols // LOOKUPS, name_length).decode() for i in range(LOOKUPS)]
+        address, size = code_range(thirty_two, sections, text_size)
+        self.text_size = size
+        self.addresses = [address + i * size // LOOKUPS for i in range(LOOKUPS)]
+
+
+def timed(function, setup, repeat: int) -> float:
+    """
+        Returns the fastest of repeat runs of function (in seconds). setup is called before every run and not timed,
+        its result is passed to function
+    """
+    best = None
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        function(state)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(function, setup) -> int:
+    """
+        Returns the peak of the Python allocations (in bytes) of one run of function, measured with tracemalloc.
+        Allocations of setup are not counted, memory mappings are not traced
+    """
+    state = setup()
+    tracemalloc.start()
+    try:
+        function(state)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmarks(ELF, file: BENCHMARK_FILE) -> list[tuple]:
+    """
+        Returns the benchmarks of a file: (name, setup, function, amount of processed units, unit)
+    """
+    def lazy():
+        return ELF(file.path, file.data, lazy=True)
+
+    def parsed():
+        return ELF(file.path, file.data)
+
+    def from_file_mmap(_):
+        elf = ELF.from_file(file.path, use_mmap=True)
+        elf.close()
+
+    def section_names(elf):
+        for sh in elf.section_headers:
+            sh.name
+
+    def section_by_name(elf):
+        for name in file.section_names:
+            elf.get_section_by_name(name)
+
+    def section_by_address(elf):
+        for address in file.addresses:
+            elf.get_section_by_address(address)
+
+    def symbol_by_name(elf):
+        for name in file.symbol_names:
+            elf.get_symbol_by_name(name)
+
+    def symbol_by_address(elf):
+        for address in file.addresses:
+            elf.get_symbol_by_address(address)
+
+    def read_at_address(elf):
+        for address in file.addresses:
+            elf.read_at_address(address, 16)
+
+    def search(count):
+        return lambda elf: elf.search(SEARCH_PATTERNS[:count])
+
+    return [
+        ("from_file", lambda: None, lambda _: ELF.from_file(file.path), file.size, "B"),
+        ("from_file_mmap", lambda: None, from_file_mmap, file.size, "B"),
+        ("read_section_headers", lazy, lambda elf: elf.read_section_headers(), file.sections, "sections"),
+        ("section_names", lazy, section_names, file.sections, "sections"),
+        ("get_section_by_name", lazy, section_by_name, LOOKUPS, "lookups"),
+        ("get_section_by_address", parsed, section_by_address, LOOKUPS, "lookups"),
+        ("get_section_by_flag", lazy, lambda elf: elf.get_section_by_flag("X"), file.sections, "sections"),
+        ("get_symbol_by_name", lazy, symbol_by_name, LOOKUPS, "lookups"),
+        ("get_symbol_by_address", parsed, symbol_by_address, LOOKUPS, "lookups"),
+        ("read_at_address", parsed, read_at_address, LOOKUPS, "reads"),
+        ("search_5_patterns", parsed, search(5), file.text_size, "B"),
+        ("search_50_patterns", parsed, search(50), file.text_size, "B"),
+    ]
+
+
+def run_cli(repository: str, path: str, repeat: int) -> tuple[float, int]:
+    """
+        Runs the CLI (read_twelfe.py -a) end to end in a new interpreter
+
+        Returns:
+            tuple[float, int]
+                The fastest wall time (in seconds) and the peak resident memory (in bytes)
+    """
+    best = None
+    peak = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", CLI_CODE, repository, path], capture_output=True, check=True)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        peak = max(peak, int(result.stdout) * 1024)
+    return best, peak
+
+
+def run(repository: str, files: list[str], directory: str, repeat: int, memory: bool = True) -> dict:
+    """
+        Generates the files and runs all benchmarks on them
+
+        Returns:
+            dict
+                File name -> {"parameters", "size", "benchmarks": benchmark name -> result}
+    """
+    sys.path.insert(0, repository)
+    from twelfe.elf import ELF
+
+    results = {}
+    for name in files:
+        parameters = FILES[name]
+        path = os.path.join(directory, file_name(*parameters))
+        if not os.path.isfile(path):
+            generate(path, *parameters)
+        file = BENCHMARK_FILE(name, path, parameters)
+        file_results = {}
+        results[name] = {"parameters": list(parameters), "size": file.size, "benchmarks": file_results}
+
+        for benchmark, setup, function, units, unit in benchmarks(ELF, file):
+            try:
+                seconds = timed(function, setup, repeat)
+                peak = peak_memory(function, setup) if memory else None
+            except Exception as e:
+                # For example, the benchmarked commit does not have this API yet
+                file_results[benchmark] = {"error": f"{type(e).__name__}: {e}"}
+            else:
+                file_results[benchmark] = {"seconds": seconds, "per_second": units / seconds if seconds else None,
+                                           "unit": unit, "peak_memory": peak}
+            print_result(name, benchmark, file_results[benchmark])
+
+        try:
+            seconds, peak = run_cli(repository, path, repeat)
+        except subprocess.CalledProcessError as e:
+            file_results["cli"] = {"error": e.stderr.decode(errors="replace").strip().splitlines()[-1]}
+        else:
+            file_results["cli"] = {"seconds": seconds, "per_second": file.size / seconds, "unit": "B", "peak_memory": peak}
+        print_result(name, "cli", file_results["cli"])
+    return results
+
+
+def format_rate(per_second: float, unit: str) -> str:
+    if unit == "B":
+        return f"{per_second / (1024 * 1024):10.1f} MB/s"
+    return f"{per_second:10.0f} {unit}/s"
+
+
+def print_result(file: str, benchmark: str, result: dict) -> None:
+    if "error" in result:
+        print(f"{file:<15}{benchmark:<25}failed ({result['error']})")
+        return
+    memory = "" if result["peak_memory"] is None else f"{result['peak_memory'] / 1024:12.0f} KB peak"
+    print(f"{file:<15}{benchmark:<25}{result['seconds'] * 1000:10.2f} ms"
+          f"{format_rate(result['per_second'], result['unit']):>22}{memory}")
+
+
+def git_commit(repository: str) -> str:
+    """
+        Returns the commit of the benchmarked repository (None, if it is not a git repository)
+    """
+    try:
+        result = subprocess.run(["git", "-C", repository, "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> int:
+    """
+        Prints the ratio of every time to the time of the baseline. Only files with the same parameters are compared
+
+        Returns:
+            int
+                Amount of benchmarks which are slower than the baseline by more than threshold (for example 0.1 = 10%)
+    """
+    regressions = 0
+    print(f"\nCompared to {baseline['meta'].get('commit')} ({baseline['meta'].get('date')})")
+    for name, file_results in results.items():
+        base = baseline["results"].get(name)
+        if base is None or base["parameters"] != file_results["parameters"]:
+            continue
+        for benchmark, result in file_results["benchmarks"].items():
+            base_result = base["benchmarks"].get(benchmark)
+            if "seconds" not in result or base_result is None or "seconds" not in base_result:
+                continue
+            ratio = result["seconds"] / base_result["seconds"]
+            regression = ratio > 1 + threshold
+            regressions += regression
+            print(f"{name:<15}{benchmark:<25}{ratio:8.2f}x time" + ("   REGRESSION" if regression else ""))
+    return regressions
+
+
+def check_budgets(results: dict) -> int:
+    """
+        Checks the benchmarks of BUDGETS and RATIOS, which were run
+
+        Returns:
+            int
+                Amount of benchmarks which exceed their budget
+    """
+    failures = 0
+    for (name, benchmark), budget in BUDGETS.items():
+        result = results.get(name, {}).get("benchmarks", {}).get(benchmark, {})
+        if "seconds" in result and result["seconds"] > budget:
+            print(f"{name:<15}{benchmark:<25}{result['seconds']:8.2f} s, budget {budget:.2f} s   OVER BUDGET")
+            failures += 1
+    for (name, benchmark, reference), budget in RATIOS.items():
+        file_results = results.get(name, {}).get("benchmarks", {})
+        result, reference_result = file_results.get(benchmark, {}), file_results.get(reference, {})
+        if "seconds" in result and "seconds" in reference_result:
+            ratio = result["seconds"] / reference_result["seconds"]
+            if ratio > budget:
+                print(f"{name:<15}{benchmark:<25}{ratio:8.2f}x {reference}, budget {budget:.2f}x   OVER BUDGET")
+                failures += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks twelfe on synthetic ELF files")
+    parser.add_argument("--repo", default=REPOSITORY,
+                        help="Checkout of twelfe to benchmark, for example a git worktree of another commit")
+    parser.add_argument("--files", nargs="+", choices=FILES, help="Files to benchmark (default: all)")
+    parser.add_argument("--quick", action="store_true", help="Only benchmark the small and medium files")
+    parser.add_argument("--repeat", type=int, default=5, help="Amount of runs, the fastest run is reported")
+    parser.add_argument("--no-memory", action="store_true", help="Do not measure the peak memory (faster)")
+    parser.add_argument("--directory", default=os.path.join(tempfile.gettempdir(), "twelfe-benchmarks"),
+                        help="Directory of the generated files (generated files are reused)")
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--compare", metavar="JSON", help="Compare the results to the results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative slowdown reported as regression (default: 0.1 = 10%%)")
+    args = parser.parse_args()
+
+    files = args.files or (QUICK_FILES if args.quick else list(FILES))
+    os.makedirs(args.directory, exist_ok=True)
+    repository = os.path.abspath(args.repo)
+    results = run(repository, files, args.directory, args.repeat, not args.no_memory)
+    failures = check_budgets(results)
+
+    report = {
+        "meta": {
+            "commit": git_commit(repository),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        failures += compare(results, baseline, args.threshold)
+    if failures:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,16 @@
 """
 
 import argparse
+import itertools
+import os
+import sys
+from twelfe import instrumentation
+from twelfe.batch import scan
+from twelfe.dependencies import DEPENDENCY_RESOLVER
 from twelfe.elf import ELF
-from typing import Any
+from twelfe.instrumentation import STATS
+from twelfe.output import FORMATS, write_records
+from typing import Any, Iterator
 # from twelfe import elf.ELF
 
 
@@ -18,17 +26,51 @@ def main():
     args = read_args()
     file = args["file"]
 
+    if args["batch"]:
+        batch(args)
+        exit(0)
+
     if file == "":
         print("[!]: No file specified")
         exit(-1)
 
-    elffile = ELF.from_file(file)
+    if not args["stats"]:
+        inspect(file, args)
+        exit(0)
+
+    with instrumentation.collect() as stats:
+        with instrumentation.stage("total"):
+            inspect(file, args)
+    print(f"\nStatistics of {file}:\n{stats}", file=sys.stderr)
+
+
+def inspect(file: str, args: dict[str, Any]):
+    """
+        Prints the requested parts of one file
+
+        Parameters:
+            file: str
+                Path to the ELF file
+            args: dict[str, Any]
+                The dictionary of read command line arguments
+    """
+    elffile = ELF.from_file(file, use_mmap=args["mmap"], use_pread=args["pread"])
+
+    if args["format"] != "text":
+        records = elffile.iter_records(elf=args["all"] or args["elf"],
+                                       program=args["all"] or args["program"],
+                                       section=args["all"] or args["section"],
+                                       dynamic=args["dynamic"], relocations=args["relocs"], notes=args["notes"])
+        if args["ldd"]:
+            records = itertools.chain(records, iter_dependency_records(file, args["sysroot"]))
+        write_records(records, sys.stdout, args["format"])
+        return
 
     if args["all"]:
         elffile.print_elf_header()
         elffile.print_program_headers()
         elffile.print_section_headers()
-        exit(0)
+        return
 
     if args["elf"]:
         elffile.print_elf_header()
@@ -39,6 +81,103 @@ def main():
     if args["section"]:
         elffile.print_section_headers()
 
+    if args["dynamic"]:
+        elffile.print_dynamic()
+
+    if args["relocs"]:
+        elffile.print_relocations()
+
+    if args["notes"]:
+        elffile.print_notes()
+
+    if args["ldd"]:
+        print_dependencies(file, args["sysroot"])
+
+
+def resolve_dependencies(file: str, sysroot: str) -> list[tuple[str, str]]:
+    """
+        Resolves the shared library dependencies of a file, like ldd
+
+        Parameters:
+            file: str
+                Path to the ELF file (located inside the sysroot)
+            sysroot: str
+                The root directory libraries are searched in
+
+        Returns:
+            list[tuple[str, str]]
+                The needed names and their paths inside the sysroot (None, if not found)
+    """
+    resolver = DEPENDENCY_RESOLVER(sysroot)
+    dependencies = resolver.resolve("/" + os.path.relpath(os.path.abspath(file), os.path.abspath(sysroot)))
+    return dependencies or []
+
+
+def print_dependencies(file: str, sysroot: str):
+    """
+        Prints the resolved shared library dependencies of a file, like ldd (see resolve_dependencies)
+    """
+    for name, path in resolve_dependencies(file, sysroot):
+        if "/" in name:
+            print(f"\t{name}" + ("" if path is not None else " => not found"))
+        else:
+            print(f"\t{name} => {path if path is not None else 'not found'}")
+
+
+def iter_dependency_records(file: str, sysroot: str) -> Iterator[dict[str, Any]]:
+    """
+        Yields the resolved shared library dependencies of a file as records (see resolve_dependencies and ELF.iter_records)
+    """
+    for name, path in resolve_dependencies(file, sysroot):
+        yield {"file": file, "record": "dependency", "name": name, "path": path}
+
+
+def batch(args: dict[str, Any]):
+    """
+        Batch mode. Prints a summary line for every ELF file of the passed files, directories and glob patterns.
+        Lines are printed as soon as files are analyzed
+
+        Parameters:
+            args: dict[str, Any]
+                The dictionary of read command line arguments
+    """
+    results = scan(args["batch"], workers=args["workers"], chunk_size=args["chunk_size"], stats=args["stats"])
+    total = STATS()
+    if args["stats"]:
+        results = collect_stats(results, total)
+
+    if args["format"] != "text":
+        write_records(results, sys.stdout, args["format"])
+    else:
+        for result in results:
+            if "error" in result:
+                print(f"[!] {result['path']}: {result['error']}")
+                continue
+            print(f"{result['path']}: {result['class']}, {result['data']}, {result['type']}, {result['machine']}, "
+                  f"entry 0x{result['entry']:x}, {result['program_headers']} program headers, {result['section_headers']} section headers")
+
+    if args["stats"]:
+        print(f"\nStatistics of {total.calls.get('total', 0)} files:\n{total}", file=sys.stderr)
+
+
+def collect_stats(results: Iterator[dict[str, Any]], total: STATS) -> Iterator[dict[str, Any]]:
+    """
+        Removes the statistics of the files (collected in the worker processes) from the results,
+        prints them and adds them to total
+
+        Parameters:
+            results: Iterator[dict[str, Any]]
+                The results of scan
+            total: STATS
+                The aggregated statistics of all files
+    """
+    for result in results:
+        file_stats = STATS()
+        file_stats.merge(result.pop("stats"))
+        total.merge(file_stats)
+        print(f"{result['path']}: {file_stats.format_line()}", file=sys.stderr)
+        yield result
+
 
 def read_args() -> dict[str, Any]:
     """
@@ -49,16 +188,41 @@ def read_args() -> dict[str, Any]:
                 The dictionary of read command line arguments
     """
     parser = argparse.ArgumentParser()
-    parser.add_argument("-f", "--file",
-                        help="Path to ELF file", required=True, default="")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("-f", "--file",
+                        help="Path to ELF file", default="")
+    source.add_argument("-b", "--batch", nargs="+", metavar="PATH",
+                        help="Summarize all ELF files of files, directories and glob patterns")
     parser.add_argument("-e", "--elf",
                         help="Print ELF Header", action="store_true")
     parser.add_argument("-s", "--section",
                         help="Print Section Headers", action="store_true")
     parser.add_argument("-p", "--program",
                         help="Print Program Headers", action="store_true")
+    parser.add_argument("-d", "--dynamic",
+                        help="Print Dynamic Section", action="store_true")
+    parser.add_argument("--relocs",
+                        help="Print Relocations", action="store_true")
+    parser.add_argument("-n", "--notes",
+                        help="Print Notes (for example the build ID)", action="store_true")
+    parser.add_argument("-l", "--ldd",
+                        help="Print the resolved shared library dependencies", action="store_true")
+    parser.add_argument("--sysroot", default="/",
+                        help="Root directory the shared libraries are searched in, for example an extracted image")
     parser.add_argument("-a", "--all",
                         help="Print All Headers", action="store_true")
+    parser.add_argument("-m", "--mmap",
+                        help="Memory-map the file instead of reading it", action="store_true")
+    parser.add_argument("-r", "--pread",
+                        help="Read only the needed byte ranges of the file", action="store_true")
+    parser.add_argument("-o", "--format", choices=("text", *FORMATS), default="text",
+                        help="Output format. json, ndjson and csv write one record per header (or per file in batch mode)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Amount of worker processes in batch mode (default: amount of CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=16,
+                        help="Amount of files sent to a worker at once in batch mode")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print the time per parsing stage and counters to stderr (per file and in total in batch mode)")
     return vars(parser.parse_args())
 
 
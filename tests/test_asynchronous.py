@@ -0,0 +1,38 @@
+"""
+    The async readers read in the thread pool and return copies, also for memory-mapped files.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.elf import ELF  # noqa: E402
+
+TEST_FILE = os.path.join(REPOSITORY, "test")
+
+
+class AsyncReadTest(unittest.TestCase):
+    def test_copies(self):
+        async def read(elf):
+            text = elf.get_section_by_name(".text")
+            return await elf.read_section_async(".text"), await elf.read_range_async(text.sh_offset, 16)
+
+        for mode in ({}, {"use_mmap": True}, {"use_pread": True}):
+            with ELF.from_file(TEST_FILE, **mode) as elf:
+                section, data = asyncio.run(read(elf))
+                self.assertNotIsInstance(section, memoryview)
+                self.assertNotIsInstance(data, memoryview)
+                self.assertEqual(section, bytes(elf.read_section(".text")))
+                self.assertEqual(data, section[:16])
+
+    def test_missing_section(self):
+        with ELF.from_file(TEST_FILE, use_mmap=True) as elf:
+            self.assertIsNone(asyncio.run(elf.read_section_async(".missing")))
+
+
+if __name__ == "__main__":
+    unittest.main()
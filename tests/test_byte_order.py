@@ -0,0 +1,138 @@
+"""
+    Little and big endian, 32-bit and 64-bit files are decoded with the byte order and class of the file.
+    The samples were generated with benchmarks/generate.py, for example
+        python3 benchmarks/generate.py tests/samples/elf32-msb --32 --msb --sections 8 --symbols 6 --name-length 0 \
+            --text-size 64 --seed 1
+    The expected values were read with readelf -W -h -l -S -s and xxd.
+"""
+
+import os
+import sys
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.elf import ELF  # noqa: E402
+
+SAMPLES = os.path.join(REPOSITORY, "tests", "samples")
+
+# sample -> ELF header values: class, byte order, e_machine, e_entry, e_phoff, e_shoff, e_ehsize, e_phentsize,
+# e_shentsize, e_shnum, e_shstrndx
+ELF_HEADERS = {
+    "elf32-lsb": ("32-Bit", "Little Endian", 3, 0x8048060, 52, 400, 52, 32, 40, 8, 7),
+    "elf32-msb": ("32-Bit", "Big Endian", 20, 0x8048060, 52, 400, 52, 32, 40, 8, 7),
+    "elf64-lsb": ("64-Bit", "Little Endian", 62, 0x400080, 64, 488, 64, 56, 64, 8, 7),
+    "elf64-msb": ("64-Bit", "Big Endian", 21, 0x400080, 64, 488, 64, 56, 64, 8, 7),
+}
+
+# Section headers: name, sh_type, sh_flags, sh_addr (relative to the base address of the sample), sh_offset, sh_size,
+# sh_link, sh_info, sh_addralign, sh_entsize (0x10 for 32-bit and 0x18 for 64-bit symbol tables).
+# The layout of the 64-bit samples is shifted by 0x20 bytes (larger headers)
+SECTIONS_32 = [
+    ("", 0, 0, 0, 0, 0, 0, 0, 0, 0),
+    (".text.0", 1, 0x6, 0x60, 0x60, 0x10, 0, 0, 1, 0),
+    (".text.1", 1, 0x6, 0x70, 0x70, 0x10, 0, 0, 1, 0),
+    (".text.2", 1, 0x6, 0x80, 0x80, 0x10, 0, 0, 1, 0),
+    (".text.3", 1, 0x6, 0x90, 0x90, 0x10, 0, 0, 1, 0),
+    (".symtab", 2, 0, 0, 0xa0, 0x70, 6, 1, 8, 0x10),
+    (".strtab", 3, 0, 0, 0x110, 0x43, 0, 0, 1, 0),
+    (".shstrtab", 3, 0, 0, 0x153, 0x3b, 0, 0, 1, 0),
+]
+SECTIONS_64 = [
+    ("", 0, 0, 0, 0, 0, 0, 0, 0, 0),
+    (".text.0", 1, 0x6, 0x80, 0x80, 0x10, 0, 0, 1, 0),
+    (".text.1", 1, 0x6, 0x90, 0x90, 0x10, 0, 0, 1, 0),
+    (".text.2", 1, 0x6, 0xa0, 0xa0, 0x10, 0, 0, 1, 0),
+    (".text.3", 1, 0x6, 0xb0, 0xb0, 0x10, 0, 0, 1, 0),
+    (".symtab", 2, 0, 0, 0xc0, 0xa8, 6, 1, 8, 0x18),
+    (".strtab", 3, 0, 0, 0x168, 0x43, 0, 0, 1, 0),
+    (".shstrtab", 3, 0, 0, 0x1ab, 0x3b, 0, 0, 1, 0),
+]
+
+# Symbols: name, st_value (relative to the base address), st_size, st_shndx
+SYMBOLS_32 = [("function_0", 0x60, 10, 1), ("function_1", 0x6a, 10, 1), ("function_2", 0x75, 10, 2),
+              ("function_3", 0x80, 10, 3), ("function_4", 0x8a, 10, 3), ("function_5", 0x95, 10, 4)]
+SYMBOLS_64 = [(name, value + 0x20, size, shndx) for name, value, size, shndx in SYMBOLS_32]
+
+# The first code bytes (at the entry point) are the same in all samples: f5 b1 65 22 4a 58 b7 91
+READS = {
+    True: (0xf5, 0xb1f5, 0x2265b1f5, 0x91b7584a2265b1f5, "2265b1f5"),
+    False: (0xf5, 0xf5b1, 0xf5b16522, 0xf5b165224a58b791, "f5b16522"),
+}
+
+
+class ByteOrderTest(unittest.TestCase):
+    def open(self, sample: str) -> ELF:
+        return ELF.from_file(os.path.join(SAMPLES, sample))
+
+    def test_elf_header(self):
+        for sample, expected in ELF_HEADERS.items():
+            with self.subTest(sample=sample):
+                header = self.open(sample).elf_header
+                self.assertEqual((header.cls_to_string(), header.data_to_string(), header.e_machine, header.e_entry,
+                                  header.e_phoff, header.e_shoff, header.e_ehsize, header.e_phentsize,
+                                  header.e_shentsize, header.e_shnum, header.e_shstrndx), expected)
+                self.assertEqual(header.e_type, 2)
+                self.assertEqual(header.isThirtyTwo, sample.startswith("elf32"))
+                self.assertEqual(header.isLittleEndian, sample.endswith("lsb"))
+
+    def test_program_headers(self):
+        for sample in ELF_HEADERS:
+            with self.subTest(sample=sample):
+                elf = self.open(sample)
+                thirty_two = elf.elf_header.isThirtyTwo
+                base = 0x8048000 if thirty_two else 0x400000
+                size = 0xa0 if thirty_two else 0xc0
+                self.assertEqual(len(elf.program_headers), 1)
+                ph = elf.program_headers[0]
+                self.assertEqual((ph.p_type, ph.p_offset, ph.p_vaddr, ph.p_paddr, ph.p_filesz, ph.p_memsz, ph.p_flags,
+                                  ph.p_align), (1, 0, base, base, size, size, 5, 0x1000))
+                self.assertEqual(ph.flag_to_string(), "R-E")
+                self.assertEqual(ph.vaddr, "08048000" if thirty_two else "0000000000400000")
+
+    def test_section_headers(self):
+        for sample in ELF_HEADERS:
+            with self.subTest(sample=sample):
+                elf = self.open(sample)
+                thirty_two = elf.elf_header.isThirtyTwo
+                base = 0x8048000 if thirty_two else 0x400000
+                sections = []
+                for sh in elf.section_headers:
+                    sections.append((sh.name, sh.sh_type, sh.sh_flags, sh.sh_addr - base if sh.sh_addr else 0,
+                                     sh.sh_offset, sh.sh_size, sh.sh_link, sh.sh_info, sh.sh_addralign, sh.sh_entsize))
+                self.assertEqual(sections, SECTIONS_32 if thirty_two else SECTIONS_64)
+                text = elf.get_section_by_name(".text.0")
+                self.assertEqual(text.flags_to_string(), "AX")
+                self.assertEqual(text.addr, "08048060" if thirty_two else "0000000000400080")
+
+    def test_symbols(self):
+        for sample in ELF_HEADERS:
+            with self.subTest(sample=sample):
+                elf = self.open(sample)
+                thirty_two = elf.elf_header.isThirtyTwo
+                base = 0x8048000 if thirty_two else 0x400000
+                symbols = [(symbol.name, symbol.st_value - base, symbol.st_size, symbol.st_shndx)
+                           for symbol in elf.get_symbol_table()[1:]]
+                self.assertEqual(symbols, SYMBOLS_32 if thirty_two else SYMBOLS_64)
+                symbol = elf.get_symbol_by_name("function_3")
+                self.assertEqual((symbol.st_value - base, symbol.type_to_string(), symbol.bind_to_string()),
+                                 (SYMBOLS_32[3][1] if thirty_two else SYMBOLS_64[3][1], "FUNC", "GLOBAL"))
+                self.assertEqual(elf.get_symbol_by_address(symbol.st_value + 1).name, "function_3")
+
+    def test_reads(self):
+        for sample in ELF_HEADERS:
+            with self.subTest(sample=sample):
+                elf = self.open(sample)
+                entry = elf.elf_header.e_entry
+                u8, u16, u32, u64, string = READS[elf.elf_header.isLittleEndian]
+                self.assertEqual(bytes(elf.read_bytes_at_address(entry, 4)), b"\xf5\xb1\x65\x22")
+                self.assertEqual(elf.read_u8(entry), u8)
+                self.assertEqual(elf.read_u16(entry), u16)
+                self.assertEqual(elf.read_u32(entry), u32)
+                self.assertEqual(elf.read_u64(entry), u64)
+                self.assertEqual(elf.read_at_address(entry, 4), string)
+
+
+if __name__ == "__main__":
+    unittest.main()
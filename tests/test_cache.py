@@ -0,0 +1,197 @@
+"""
+    ELF_CACHE shares opened ELF objects and releases the files of evicted and invalidated objects,
+    once no caller uses them any more. PARSE_CACHE stores the parsed headers on disk.
+"""
+
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.cache import ELF_CACHE, PARSE_CACHE  # noqa: E402
+
+TEST_FILE = os.path.join(REPOSITORY, "test")
+COMPRESSED_FILE = os.path.join(REPOSITORY, "tests", "samples", "elf64-lsb-zlib")
+COMPRESSED_CONTENT = b"".join(b"line %04d of the compressed test section\n" % i for i in range(1000))
+FILES = 100
+THREADS = 8
+
+
+def open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def mappings(directory: str) -> int:
+    with open("/proc/self/maps") as maps:
+        return sum(1 for line in maps if directory in line)
+
+
+@unittest.skipUnless(os.path.isdir("/proc/self/fd"), "needs /proc/self/fd")
+class ElfCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(FILES):
+            path = os.path.join(self.directory.name, f"test{i}")
+            shutil.copyfile(TEST_FILE, path)
+            self.paths.append(path)
+        # Objects must be released without the garbage collector
+        gc.collect()
+        gc.disable()
+
+    def tearDown(self):
+        gc.enable()
+        self.directory.cleanup()
+
+    def use(self, elf):
+        self.assertEqual(elf.section_headers[1].name, ".interp")
+        self.assertEqual(elf.get_needed(), ["libc.so.6"])
+        self.assertIsNotNone(elf.get_symbol_by_name("main"))
+
+    def test_shared(self):
+        cache = ELF_CACHE()
+        elf = cache.open(self.paths[0], use_pread=True)
+        self.assertIs(cache.open(self.paths[0], use_pread=True), elf)
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+
+    def test_evicted_objects_release_their_fd(self):
+        # Every object exceeds the budget, so only the most recently opened one is kept
+        cache = ELF_CACHE(max_bytes=1)
+        before = open_fds()
+        for path in self.paths:
+            self.use(cache.open(path, use_pread=True))
+            self.assertLessEqual(open_fds(), before + 1)
+        self.assertEqual(cache.stats["evictions"], FILES - 1)
+        cache.clear()
+        self.assertEqual(open_fds(), before)
+
+    def test_evicted_objects_release_their_mapping(self):
+        cache = ELF_CACHE(max_bytes=1)
+        for path in self.paths:
+            self.use(cache.open(path, use_mmap=True))
+            self.assertLessEqual(mappings(self.directory.name), 1)
+        cache.clear()
+        self.assertEqual(mappings(self.directory.name), 0)
+
+    def test_evicted_objects_stay_usable(self):
+        cache = ELF_CACHE(max_bytes=1)
+        before = open_fds()
+        elf = cache.open(self.paths[0], use_pread=True)
+        for path in self.paths[1:]:
+            cache.open(path, use_pread=True)
+        # The first object was evicted, but it is still used here
+        self.use(elf)
+        self.assertEqual(open_fds(), before + 2)
+        del elf
+        self.assertEqual(open_fds(), before + 1)
+
+    def test_invalidated_objects_release_their_fd(self):
+        cache = ELF_CACHE()
+        before = open_fds()
+        path = self.paths[0]
+        for i in range(10):
+            # Changes the modification time, so the cached object is invalidated
+            os.utime(path, ns=(i * 10 ** 9, i * 10 ** 9))
+            self.use(cache.open(path, use_pread=True))
+            self.assertEqual(open_fds(), before + 1)
+        self.assertEqual(cache.stats["invalidations"], 9)
+
+
+class SharedObjectTest(unittest.TestCase):
+    def run_threads(self, target) -> None:
+        errors = []
+
+        def run(seed):
+            try:
+                target(random.Random(seed))
+            except Exception as e:
+                errors.append(e)
+
+        # Switch threads as often as possible, so they interleave inside the cache updates
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=run, args=(seed,)) for seed in range(THREADS)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+
+    def test_shared_reader(self):
+        cache = ELF_CACHE()
+        elf = cache.open(TEST_FILE, use_pread=True)
+        # A tiny block cache, so the threads evict each other's blocks all the time
+        elf.bytes.block_size = 64
+        elf.bytes.cache_blocks = 4
+        elf.bytes.blocks.clear()
+        with open(TEST_FILE, "rb") as file:
+            data = file.read()
+
+        def use(rng):
+            shared = cache.open(TEST_FILE, use_pread=True)
+            for _ in range(1000):
+                offset = rng.randrange(len(data))
+                size = rng.randrange(1, 300)
+                self.assertEqual(shared.read_range(offset, size), data[offset:offset + size])
+            self.assertEqual(shared.get_section_by_name(".text").name, ".text")
+            self.assertEqual(shared.get_needed(), ["libc.so.6"])
+            self.assertIsNotNone(shared.get_symbol_by_name("main"))
+
+        self.run_threads(use)
+        elf.close()
+
+    def test_shared_stream(self):
+        cache = ELF_CACHE()
+        cache.open(COMPRESSED_FILE)
+
+        def use(rng):
+            stream = cache.open(COMPRESSED_FILE).get_section_content(".debug_str", chunk_size=512, cache_chunks=2)
+            for _ in range(100):
+                offset = rng.randrange(len(COMPRESSED_CONTENT))
+                self.assertEqual(stream.read(offset, 1000), COMPRESSED_CONTENT[offset:offset + 1000])
+
+        self.run_threads(use)
+
+
+class EVICTING_PARSE_CACHE(PARSE_CACHE):
+    """
+        Removes every entry right after it was loaded, like a concurrent evict() of another process
+    """
+    def load_entry(self, path: str, key: tuple) -> dict:
+        entry = super().load_entry(path, key)
+        if entry is not None:
+            os.remove(path)
+        return entry
+
+
+class ParseCacheTest(unittest.TestCase):
+    def test_hit(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PARSE_CACHE(directory)
+            names = [sh.name for sh in cache.open(TEST_FILE).section_headers]
+            elf = cache.open(TEST_FILE)
+            self.assertEqual(cache.stats["hits"], 1)
+            self.assertEqual([sh.name for sh in elf.section_headers], names)
+
+    def test_entry_evicted_by_another_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            PARSE_CACHE(directory).open(TEST_FILE)
+            cache = EVICTING_PARSE_CACHE(directory)
+            elf = cache.open(TEST_FILE)
+            self.assertEqual(cache.stats["hits"], 1)
+            self.assertEqual(elf.section_headers[1].name, ".interp")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+    The former API of the headers is still supported: the positional constructors, which decode a single header
+    from its bytes, the parse methods and the writable string (hexadecimal) fields.
+"""
+
+import os
+import sys
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.elf import ELF  # noqa: E402
+from twelfe.elf_header import ELF_HEADER  # noqa: E402
+from twelfe.program_header import PROGRAM_HEADER  # noqa: E402
+from twelfe.section_header import SECTION_HEADER  # noqa: E402
+
+SAMPLES = os.path.join(REPOSITORY, "tests", "samples")
+
+
+class CompatibilityTest(unittest.TestCase):
+    def test_constructors(self):
+        for sample in ("elf32-lsb", "elf32-msb", "elf64-lsb", "elf64-msb"):
+            with self.subTest(sample=sample):
+                elf = ELF.from_file(os.path.join(SAMPLES, sample))
+                header = elf.elf_header
+                for index, sh in enumerate(elf.section_headers):
+                    start = header.e_shoff + index * header.e_shentsize
+                    legacy = SECTION_HEADER(elf.bytes[start:start + header.e_shentsize], index, header.isThirtyTwo,
+                                            header.isLittleEndian)
+                    self.assertEqual(legacy.index, index)
+                    self.assertEqual(legacy.to_dict(), {**sh.to_dict(), "name": None})
+                    self.assertEqual(bytes(legacy.bytes), bytes(sh.bytes))
+
+                ph = elf.program_headers[0]
+                legacy = PROGRAM_HEADER.from_bytes(bytes(ph.bytes), 0, header.isThirtyTwo, header.isLittleEndian)
+                self.assertEqual(legacy.to_dict(), ph.to_dict())
+                values = elf.program_headers.values(0)
+                self.assertEqual(PROGRAM_HEADER(b"", 0, header.isThirtyTwo, values=values).to_dict(), ph.to_dict())
+
+    def test_parse(self):
+        elf = ELF.from_file(os.path.join(SAMPLES, "elf32-lsb"))
+        ph = elf.program_headers[0]
+        expected = ph.to_dict()
+        ph.p_flags = 0
+        ph.parse_thirty_two()
+        self.assertEqual(ph.to_dict(), expected)
+
+        sh = elf.section_headers[1]
+        sh.parse_thirty_two((0,) * 10)
+        self.assertEqual(sh.sh_addr, 0)
+
+    def test_writable_fields(self):
+        elf = ELF.from_file(os.path.join(REPOSITORY, "test"))
+        sh = elf.section_headers[1]
+        sh.addr = "0000000000001000"
+        self.assertEqual(sh.sh_addr, 0x1000)
+        sh.sh_size = 0x20
+        self.assertEqual(sh.size, "0000000000000020")
+        # The field is written into the table
+        self.assertEqual(elf.section_headers[1].sh_addr, 0x1000)
+
+        ph = elf.program_headers[0]
+        ph.vaddr = "0000000000400000"
+        self.assertEqual(ph.p_vaddr, 0x400000)
+
+        header = ELF_HEADER(elf.bytes)
+        header.prog_entry = "0000000000401000"
+        self.assertEqual(header.e_entry, 0x401000)
+        header.parse_sixty_four()
+        self.assertEqual(header.prog_entry, elf.elf_header.prog_entry)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+    The dependency resolver searches the libraries inside a sysroot and skips candidates, which are no valid ELF files.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.dependencies import DEPENDENCY_RESOLVER  # noqa: E402
+
+TEST_FILE = os.path.join(REPOSITORY, "test")
+# Any 64-bit x86-64 ELF file can stand in for a library
+LIBRARY_FILE = os.path.join(REPOSITORY, "tests", "samples", "elf64-lsb")
+
+
+class DependencyResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sysroot = self.directory.name
+        for directory in ("bin", "lib64", "usr/lib64"):
+            os.makedirs(os.path.join(self.sysroot, directory))
+        # test needs libc.so.6
+        shutil.copyfile(TEST_FILE, os.path.join(self.sysroot, "bin", "test"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def resolve(self) -> dict:
+        resolver = DEPENDENCY_RESOLVER(self.sysroot, use_ld_so_conf=False)
+        return dict(resolver.resolve("/bin/test"))
+
+    def test_found(self):
+        shutil.copyfile(LIBRARY_FILE, os.path.join(self.sysroot, "usr", "lib64", "libc.so.6"))
+        self.assertEqual(self.resolve()["libc.so.6"], "/usr/lib64/libc.so.6")
+
+    def test_truncated_candidate_is_skipped(self):
+        # /lib64 is searched before /usr/lib64
+        with open(LIBRARY_FILE, "rb") as library:
+            data = library.read()
+        for size in (20, 100):
+            with self.subTest(size=size):
+                with open(os.path.join(self.sysroot, "lib64", "libc.so.6"), "wb") as truncated:
+                    truncated.write(data[:size])
+                shutil.copyfile(LIBRARY_FILE, os.path.join(self.sysroot, "usr", "lib64", "libc.so.6"))
+                self.assertEqual(self.resolve()["libc.so.6"], "/usr/lib64/libc.so.6")
+
+    def test_missing(self):
+        with open(os.path.join(self.sysroot, "lib64", "libc.so.6"), "wb") as truncated:
+            truncated.write(b"\x7fELF" + bytes(16))
+        self.assertIsNone(self.resolve()["libc.so.6"])
+
+
+if __name__ == "__main__":
+    unittest.main()
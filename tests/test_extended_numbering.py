@@ -0,0 +1,75 @@
+"""
+    Files with 0xff00 or more sections store the amount of sections and the index of the section header
+    string table in the first section header (e_shnum = 0, e_shstrndx = SHN_XINDEX).
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+sys.path.insert(0, os.path.join(REPOSITORY, "benchmarks"))
+
+from generate import generate  # noqa: E402
+from twelfe.batch import summarize  # noqa: E402
+from twelfe.cache import PARSE_CACHE  # noqa: E402
+from twelfe.elf import ELF, SHN_XINDEX  # noqa: E402
+
+SECTIONS = 70000
+
+
+class ExtendedNumberingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.files = {}
+        for thirty_two, little_endian in ((False, True), (True, False)):
+            path = os.path.join(cls.directory.name, f"{thirty_two}-{little_endian}.elf")
+            generate(path, thirty_two, little_endian, sections=SECTIONS, symbols=100, text_size=SECTIONS)
+            cls.files[(thirty_two, little_endian)] = path
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def check(self, elf: ELF):
+        self.assertEqual(elf.elf_header.e_shnum, 0)
+        self.assertEqual(elf.elf_header.e_shstrndx, SHN_XINDEX)
+        self.assertEqual(elf.section_count, SECTIONS)
+        self.assertEqual(elf.section_string_table_index, SECTIONS - 1)
+        self.assertEqual(len(elf.section_headers), SECTIONS)
+        self.assertEqual(elf.section_headers[SECTIONS - 1].name, ".shstrtab")
+        self.assertEqual(elf.section_headers[SECTIONS - 5].name, f".text.{SECTIONS - 6}")
+        self.assertEqual(elf.get_section_by_name(".symtab").index, SECTIONS - 3)
+
+    def test_modes(self):
+        for path in self.files.values():
+            self.check(ELF.from_file(path))
+            with ELF.from_file(path, use_mmap=True, lazy=True) as elf:
+                self.check(elf)
+            with ELF.from_file(path, use_pread=True) as elf:
+                self.check(elf)
+
+    def test_batch_summary(self):
+        for path in self.files.values():
+            with ELF.from_file(path, use_mmap=True, lazy=True) as elf:
+                self.assertEqual(summarize(elf)["section_headers"], SECTIONS)
+
+    def test_parse_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PARSE_CACHE(directory)
+            path = self.files[(False, True)]
+            self.check(ELF.from_file(path, cache=cache))
+            self.check(ELF.from_file(path, cache=cache))
+            self.assertEqual(cache.stats["hits"], 1)
+
+    def test_regular_file(self):
+        elf = ELF.from_file(os.path.join(REPOSITORY, "test"))
+        self.assertEqual(elf.section_count, elf.elf_header.e_shnum)
+        self.assertEqual(elf.section_string_table_index, elf.elf_header.e_shstrndx)
+
+
+if __name__ == "__main__":
+    unittest.main()
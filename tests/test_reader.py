@@ -0,0 +1,62 @@
+"""
+    FILE_READER reads byte ranges on demand and releases its file descriptor, also when it is not closed explicitly.
+"""
+
+import gc
+import os
+import sys
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.elf import ELF  # noqa: E402
+from twelfe.reader import FILE_READER  # noqa: E402
+
+TEST_FILE = os.path.join(REPOSITORY, "test")
+
+
+def open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+@unittest.skipUnless(os.path.isdir("/proc/self/fd"), "needs /proc/self/fd")
+class FileReaderTest(unittest.TestCase):
+    def test_read(self):
+        with open(TEST_FILE, "rb") as file:
+            data = file.read()
+        with FILE_READER(TEST_FILE, block_size=64, cache_blocks=2) as reader:
+            self.assertEqual(len(reader), len(data))
+            self.assertEqual(reader[0:4], b"\x7fELF")
+            self.assertEqual(reader[100:1000], data[100:1000])
+            self.assertEqual(reader[-1], data[-1])
+            self.assertEqual(reader.find(b".text"), data.find(b".text"))
+
+    def test_close(self):
+        before = open_fds()
+        reader = FILE_READER(TEST_FILE)
+        self.assertEqual(open_fds(), before + 1)
+        reader.close()
+        reader.close()
+        self.assertEqual(open_fds(), before)
+
+    def test_dropped_readers_release_their_fd(self):
+        before = open_fds()
+        for _ in range(50):
+            FILE_READER(TEST_FILE)
+        self.assertEqual(open_fds(), before)
+
+    def test_dropped_elf_objects_release_their_fd(self):
+        gc.collect()
+        before = open_fds()
+        for _ in range(50):
+            elf = ELF.from_file(TEST_FILE, use_pread=True)
+            self.assertEqual(elf.section_headers[1].name, ".interp")
+            self.assertEqual(elf.dynamic[0].value, "libc.so.6")
+        del elf
+        # The tables do not reference the ELF object, so it is released without the garbage collector
+        self.assertEqual(open_fds(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
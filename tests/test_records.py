@@ -0,0 +1,48 @@
+"""
+    The structured output formats write one record per header, dynamic entry, relocation, note and dependency.
+"""
+
+import io
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.elf import ELF  # noqa: E402
+from twelfe.output import write_records  # noqa: E402
+
+TEST_FILE = os.path.join(REPOSITORY, "test")
+
+
+class RecordsTest(unittest.TestCase):
+    def test_records(self):
+        elf = ELF.from_file(TEST_FILE)
+        records = list(elf.iter_records(elf=False, program=False, section=False,
+                                        dynamic=True, relocations=True, notes=True))
+        kinds = [record["record"] for record in records]
+        self.assertEqual(kinds.count("dynamic"), len(list(elf.iter_dynamic())))
+        self.assertEqual(kinds.count("relocation"), sum(len(list(elf.iter_relocations(sh)))
+                                                        for sh in elf.get_relocation_sections()))
+        self.assertEqual(kinds.count("note"), len(list(elf.iter_notes())))
+        self.assertIn({"section": ".rela.plt", "symbol": "puts"},
+                      [{"section": record["section"], "symbol": record["symbol"]}
+                       for record in records if record["record"] == "relocation"])
+
+        stream = io.StringIO()
+        write_records(records, stream, "json")
+        self.assertEqual(len(json.loads(stream.getvalue())), len(records))
+
+    def test_command_line(self):
+        output = subprocess.run([sys.executable, os.path.join(REPOSITORY, "read_twelfe.py"), "-f", TEST_FILE,
+                                 "-d", "--relocs", "-n", "-l", "-o", "ndjson"],
+                                check=True, capture_output=True, text=True).stdout
+        kinds = {json.loads(line)["record"] for line in output.splitlines()}
+        self.assertEqual(kinds, {"dynamic", "relocation", "note", "dependency"})
+
+
+if __name__ == "__main__":
+    unittest.main()
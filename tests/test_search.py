@@ -0,0 +1,62 @@
+"""
+    BYTE_SEARCH finds the same matches as searching every pattern on its own, also overlapping matches, matches at the
+    block boundaries of the filter and at the end of the data.
+"""
+
+import os
+import random
+import re
+import sys
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.elf import ELF  # noqa: E402
+from twelfe.search import BLOCK_SIZE, BYTE_SEARCH, pattern_to_regex  # noqa: E402
+
+TEST_FILE = os.path.join(REPOSITORY, "test")
+PATTERNS = ["f3 0f 1e fa", "e8 ?? ?? ?? ?? 48 8b", "4? 89 e5", b"\x0f\x05", "?? ?? 00", "41", "?? ??", "?5 ?? 0?",
+            "aa aa", "00 00 00 00", "ff ?? ff"]
+
+
+def naive(patterns: list, data: bytes, start: int = 0, end: int = None) -> list[tuple[int, int]]:
+    end = len(data) if end is None else end
+    matches = []
+    for index, pattern in enumerate(patterns):
+        regex = re.compile(b"(?=" + pattern_to_regex(pattern) + b")", re.DOTALL)
+        matches.extend((index, match.start()) for match in regex.finditer(data, start) if match.start() < end)
+    return sorted(matches, key=lambda match: (match[1], match[0]))
+
+
+class ByteSearchTest(unittest.TestCase):
+    def test_random(self):
+        rng = random.Random(1)
+        # Few byte values, so that all patterns match often
+        data = bytes(rng.choice(b"\x00\x05\x0f\x41\x45\x89\xaa\xe5\xff") for _ in range(3 * BLOCK_SIZE + 5))
+        patterns = PATTERNS + [bytes(rng.choice(b"\x00\xaa\xff") for _ in range(rng.randrange(1, 6))) for _ in range(40)]
+        engine = BYTE_SEARCH(patterns)
+        self.assertEqual(engine.scan(data), naive(patterns, data))
+        self.assertEqual(engine.scan(memoryview(data)), naive(patterns, data))
+        for start, end in ((1, BLOCK_SIZE + 3), (BLOCK_SIZE - 2, BLOCK_SIZE + 2), (len(data) - 3, len(data))):
+            with self.subTest(start=start, end=end):
+                self.assertEqual(engine.scan(data, 0, start, end), naive(patterns, data, start, end))
+        self.assertEqual(engine.scan(data, 0x1000, 0, 10), [(index, 0x1000 + position)
+                                                          for index, position in naive(patterns, data, 0, 10)])
+
+    def test_overlapping(self):
+        engine = BYTE_SEARCH(["aa aa", "aa ?? aa"])
+        self.assertEqual(engine.scan(b"\xaa" * 4), [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2)])
+
+    def test_code(self):
+        elf = ELF.from_file(TEST_FILE)
+        patterns = PATTERNS + [f"{i * 5 % 256:02x} {(i * 37 + 1) % 256:02x} ?? {(i * 11 + 7) % 256:02x}" for i in range(50)]
+        self.assertEqual(BYTE_SEARCH(patterns).scan(elf.bytes), naive(patterns, elf.bytes))
+        results = elf.search(patterns)
+        for pattern in ("f3 0f 1e fa", b"\x0f\x05"):
+            regex = re.compile(b"(?=" + pattern_to_regex(pattern) + b")", re.DOTALL)
+            self.assertTrue(all(regex.match(elf.read_bytes_at_address(address, 8)) for address in results[pattern]))
+
+
+if __name__ == "__main__":
+    unittest.main()
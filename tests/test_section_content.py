@@ -0,0 +1,49 @@
+"""
+    Compressed sections are decompressed chunk by chunk. Streams are cached per section, chunk size and cache size.
+    The sample is tests/samples/elf64-lsb with a zlib compressed .debug_str section (1000 lines "line %04d of the
+    compressed test section"), added with objcopy --add-section and objcopy --compress-debug-sections=zlib.
+"""
+
+import os
+import sys
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.elf import ELF  # noqa: E402
+
+SAMPLE = os.path.join(REPOSITORY, "tests", "samples", "elf64-lsb-zlib")
+CONTENT = b"".join(b"line %04d of the compressed test section\n" % i for i in range(1000))
+
+
+class SectionContentTest(unittest.TestCase):
+    def test_decompressed(self):
+        elf = ELF.from_file(SAMPLE)
+        self.assertTrue(elf.is_compressed(".debug_str"))
+        stream = elf.get_section_content(".debug_str", chunk_size=4096)
+        self.assertEqual(len(stream), len(CONTENT))
+        self.assertEqual(stream.read(0, len(CONTENT)), CONTENT)
+        self.assertEqual(stream.read(10000, 100), CONTENT[10000:10100])
+        self.assertEqual(b"".join(elf.iter_section_content(".debug_str", chunk_size=1000)), CONTENT)
+
+    def test_stream_parameters(self):
+        elf = ELF.from_file(SAMPLE)
+        stream = elf.get_section_content(".debug_str")
+        self.assertIs(elf.get_section_content(".debug_str"), stream)
+
+        small = elf.get_section_content(".debug_str", chunk_size=4096, cache_chunks=2)
+        self.assertIsNot(small, stream)
+        self.assertEqual((small.chunk_size, small.cache_chunks), (4096, 2))
+        self.assertIs(elf.get_section_content(".debug_str", chunk_size=4096, cache_chunks=2), small)
+
+        uncached = elf.get_section_content(".debug_str", chunk_size=4096, cache_chunks=0)
+        self.assertEqual((uncached.chunk_size, uncached.cache_chunks), (4096, 0))
+        self.assertEqual(uncached.read(0, len(CONTENT)), CONTENT)
+        self.assertEqual(len(uncached.chunks), 0)
+        # The default stream is unchanged
+        self.assertEqual((stream.chunk_size, stream.cache_chunks), (64 * 1024, 16))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+    Lookup indexes over the section header table. Files without a section header string table
+    (e_shstrndx = SHN_UNDEF) have no section names: lookups by name return None without warnings.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY)
+
+from twelfe.elf import ELF  # noqa: E402
+
+TEST_FILE = os.path.join(REPOSITORY, "test")
+# Offset of e_shstrndx in the 64-bit ELF header
+E_SHSTRNDX = 62
+
+
+class SectionIndexTest(unittest.TestCase):
+    def test_by_name(self):
+        elf = ELF.from_file(TEST_FILE, lazy=True)
+        self.assertEqual(elf.get_section_by_name(".text").name, ".text")
+        self.assertIsNone(elf.get_section_by_name(".missing"))
+
+    def test_without_string_table(self):
+        with open(TEST_FILE, "rb") as file:
+            data = bytearray(file.read())
+        data[E_SHSTRNDX:E_SHSTRNDX + 2] = bytes(2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test")
+            with open(path, "wb") as file:
+                file.write(data)
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                elf = ELF.from_file(path, lazy=True)
+                self.assertIsNone(elf.shstrtab)
+                self.assertIsNone(elf.get_section_by_name(".text"))
+                self.assertEqual({sh.name for sh in elf.section_headers}, {""})
+                self.assertEqual(len(elf.get_section_by_flag("X")), 5)
+                elf.close()
+            self.assertEqual(output.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+    Translates virtual addresses into file offsets.
+    The map is built from the LOAD segments of the program header table. Files without LOAD segments
+    (for example relocatable objects) are mapped by their allocated sections instead.
+"""
+
+from bisect import bisect_right
+
+from .table import ENTRY_TABLE
+
+PT_LOAD = 1
+SHF_ALLOC = 0x2
+SHT_NOBITS = 8
+
+
+class ADDRESS_MAP(object):
+    def __init__(self, program_headers: ENTRY_TABLE, section_headers: ENTRY_TABLE = None) -> None:
+        """
+            Builds the sorted interval map.
+
+            Parameters:
+                program_headers: ENTRY_TABLE
+                    The program header table. LOAD segments are used for the map
+                section_headers: ENTRY_TABLE (default=None)
+                    The section header table. Only used if there are no LOAD segments
+        """
+        # (virtual address, size in memory, file offset, size in file)
+        types = program_headers.column("p_type")
+        intervals = [interval for p_type, *interval in zip(
+            types, program_headers.column("p_vaddr"), program_headers.column("p_memsz"),
+            program_headers.column("p_offset"), program_headers.column("p_filesz")) if p_type == PT_LOAD]
+
+        if not intervals and section_headers is not None:
+            intervals = [(sh_addr, sh_size, sh_offset, 0 if sh_type == SHT_NOBITS else sh_size)
+                         for sh_type, sh_flags, sh_addr, sh_offset, sh_size in zip(
+                             section_headers.column("sh_type"), section_headers.column("sh_flags"),
+                             section_headers.column("sh_addr"), section_headers.column("sh_offset"),
+                             section_headers.column("sh_size")) if sh_flags & SHF_ALLOC]
+
+        intervals = sorted(tuple(interval) for interval in intervals if interval[1] > 0)
+        self.starts = [vaddr for vaddr, _, _, _ in intervals]
+        self.ends = [vaddr + memsz for vaddr, memsz, _, _ in intervals]
+        # Addresses between file_ends and ends are not backed by the file (zero-filled, for example .bss)
+        self.file_ends = [vaddr + min(filesz, memsz) for vaddr, memsz, _, filesz in intervals]
+        # file offset = address + delta
+        self.deltas = [offset - vaddr for vaddr, _, offset, _ in intervals]
+
+    def translate(self, address: int) -> int:
+        """
+            Translates a virtual address into a file offset
+
+            Parameters:
+                address: int
+                    The virtual address
+
+            Returns:
+                int
+                    The file offset or None, if the address is not mapped or not backed by the file (zero-filled)
+        """
+        i = bisect_right(self.starts, address) - 1
+        if i >= 0 and address < self.file_ends[i]:
+            return address + self.deltas[i]
+        return None
+
+    def translate_many(self, addresses) -> list[int]:
+        """
+            Translates many virtual addresses into file offsets at once
+
+            Parameters:
+                addresses: Iterable[int]
+                    The virtual addresses
+
+            Returns:
+                list[int]
+                    The file offsets in the order of the addresses (None for addresses which are not backed by the file)
+        """
+        starts, file_ends, deltas = self.starts, self.file_ends, self.deltas
+        offsets = []
+        for address in addresses:
+            i = bisect_right(starts, address) - 1
+            offsets.append(address + deltas[i] if i >= 0 and address < file_ends[i] else None)
+        return offsets
+
+    def is_mapped(self, address: int) -> bool:
+        """
+            Returns True, if the address lies in a segment (including its zero-filled part)
+        """
+        i = bisect_right(self.starts, address) - 1
+        return i >= 0 and address < self.ends[i]
+
+    def read(self, all_bytes: bytearray, address: int, count: int):
+        """
+            Reads count bytes from a virtual address.
+            Zero-filled parts of segments are returned as NULL bytes. Reads can span adjacent segments.
+
+            Parameters:
+                all_bytes: bytearray
+                    The bytes of the ELF file
+                address: int
+                    The virtual address to read from
+                count: int
+                    The amount of bytes to read
+
+            Returns:
+                bytes-like
+                    The read bytes. If the range is backed by one segment in the file, this is a slice of all_bytes
+                    (a view for memoryviews). Shorter than count, if the range leaves the mapped memory
+        """
+        i = bisect_right(self.starts, address) - 1
+        if i >= 0 and address + count <= self.file_ends[i]:
+            offset = address + self.deltas[i]
+            return all_bytes[offset:offset + count]
+
+        result = bytearray()
+        end = address + count
+        while address < end:
+            i = bisect_right(self.starts, address) - 1
+            if i < 0 or address >= self.ends[i]:
+                break
+            segment_end = min(end, self.ends[i])
+            file_end = min(segment_end, self.file_ends[i])
+            if address < file_end:
+                offset = address + self.deltas[i]
+                result += all_bytes[offset:offset + file_end - address]
+                address = file_end
+            if address < segment_end:
+                result += bytes(segment_end - address)
+                address = segment_end
+        return result
@@ -0,0 +1,61 @@
+"""
+    Runs blocking operations (file I/O and parsing) from asyncio code.
+    Calls are offloaded to a bounded thread pool. A semaphore limits the amount of pending calls per event loop,
+    so callers wait (backpressure) instead of queueing unbounded work.
+"""
+
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+
+class ASYNC_EXECUTOR(object):
+    def __init__(self, max_workers: int = 4, max_pending: int = 16) -> None:
+        """
+            Creates the executor
+
+            Parameters:
+                max_workers: int (default=4)
+                    Amount of threads running blocking calls
+                max_pending: int (default=16)
+                    Maximum amount of calls, which are running or queued at a time. Further calls wait for a free slot
+        """
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="twelfe")
+        self.semaphores = weakref.WeakKeyDictionary()
+
+    def semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to an event loop
+        loop = asyncio.get_running_loop()
+        semaphore = self.semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_pending)
+            self.semaphores[loop] = semaphore
+        return semaphore
+
+    async def run(self, function, *args, **kwargs):
+        """
+            Runs a blocking function in the thread pool and returns its result
+        """
+        async with self.semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+def copied(function, *args, **kwargs):
+    """
+        Calls a function and copies its result into bytes, if it is a view (for example of a memory-mapped file).
+        Used for reads in the thread pool: the pages are read from disk there, not when the caller accesses the result
+    """
+    result = function(*args, **kwargs)
+    if isinstance(result, memoryview):
+        return result.tobytes()
+    return result
+
+
+# Executor used, if no executor is passed
+default_executor = ASYNC_EXECUTOR()
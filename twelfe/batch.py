@@ -0,0 +1,253 @@
+"""
+    Batch analysis of many ELF files.
+    Paths are collected from files, directories and glob patterns. Non-ELF files are skipped by checking the
+    4-byte magic. Files are analyzed in worker processes, only paths and results are sent between the processes.
+"""
+
+import asyncio
+import glob
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+from . import instrumentation
+from .asynchronous import ASYNC_EXECUTOR, default_executor
+from .elf import ELF
+
+ELF_MAGIC = b"\x7fELF"
+
+
+def is_elf_file(path: str) -> bool:
+    """
+        Checks if a file is an ELF file by comparing its first 4 bytes to 0x7f E L F (see ELF.is_elf)
+
+        Parameters:
+            path: str
+                Path to the file
+
+        Returns:
+            bool
+                True, if the file starts with the ELF magic, else False (also for unreadable files)
+    """
+    try:
+        with open(path, "rb") as file:
+            return file.read(4) == ELF_MAGIC
+    except OSError:
+        return False
+
+
+def iter_paths(patterns: Iterable[str]) -> Iterator[str]:
+    """
+        Yields all regular files of files, directories (walked recursively) and glob patterns
+
+        Parameters:
+            patterns: Iterable[str]
+                Files, directories or glob patterns (for example "/usr/lib/**/*.so*")
+
+        Returns:
+            Iterator[str]
+                Paths of regular files. Symbolic links are not followed
+    """
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = glob.iglob(pattern, recursive=True)
+        else:
+            matches = [pattern]
+
+        for match in matches:
+            if os.path.islink(match):
+                continue
+            if os.path.isdir(match):
+                for root, _, files in os.walk(match):
+                    for file in files:
+                        path = os.path.join(root, file)
+                        if not os.path.islink(path) and os.path.isfile(path):
+                            yield path
+            elif os.path.isfile(match):
+                yield match
+
+
+def iter_elf_files(patterns: Iterable[str]) -> Iterator[str]:
+    """
+        Yields all ELF files of files, directories and glob patterns (see iter_paths)
+    """
+    return (path for path in iter_paths(patterns) if is_elf_file(path))
+
+
+def summarize(elf: ELF) -> dict[str, Any]:
+    """
+        Default analysis of the batch mode. Only needs the ELF header (and the first section header of files with 0xff00 or more sections)
+
+        Parameters:
+            elf: ELF
+                The (lazy) ELF object
+
+        Returns:
+            dict[str, Any]
+                Class, byte order, type, instruction set, entry point and header counts of the file
+    """
+    elf_header = elf.elf_header
+    return {
+        "class": elf_header.cls_to_string(),
+        "data": elf_header.data_to_string(),
+        "type": elf_header.type_to_string(),
+        "machine": elf_header.instr_set_to_string(),
+        "entry": elf_header.e_entry,
+        "program_headers": elf_header.e_phnum,
+        "section_headers": elf.section_count,
+    }
+
+
+def analyze_file(path: str, analyze: Callable[[ELF], dict[str, Any]] = summarize, stats: bool = False) -> dict[str, Any]:
+    """
+        Analyzes one file. The file is memory-mapped and parsed lazily, so only the accessed parts are read
+
+        Parameters:
+            path: str
+                Path to the ELF file
+            analyze: Callable[[ELF], dict[str, Any]] (default=summarize)
+                Creates the result of an ELF object
+            stats: bool (default=False)
+                Collect the time per stage and the counters of the file (see twelfe.instrumentation)
+
+        Returns:
+            dict[str, Any]
+                The result of analyze including the "path". If the file could not be analyzed, "error" contains the reason.
+                With stats, "stats" contains the collected STATS as dictionary (see STATS.to_dict)
+    """
+    if stats:
+        with instrumentation.collect() as file_stats:
+            with instrumentation.stage("total"):
+                result = analyze_file(path, analyze)
+        result["stats"] = file_stats.to_dict()
+        return result
+
+    try:
+        with ELF.from_file(path, use_mmap=True, lazy=True) as elf:
+            with instrumentation.stage("analyze"):
+                result = analyze(elf)
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}"}
+    return {"path": path, **result}
+
+
+def analyze_chunk(paths: list[str], analyze: Callable[[ELF], dict[str, Any]], stats: bool = False) -> list[dict[str, Any]]:
+    """
+        Analyzes a chunk of files in a worker process
+    """
+    return [analyze_file(path, analyze, stats) for path in paths]
+
+
+def scan(patterns: Iterable[str], analyze: Callable[[ELF], dict[str, Any]] = summarize,
+         workers: int = None, chunk_size: int = 16, stats: bool = False) -> Iterator[dict[str, Any]]:
+    """
+        Analyzes all ELF files of files, directories and glob patterns in parallel.
+        Results are yielded as soon as their chunk is finished, so the order is not deterministic.
+        Paths are collected while the workers run, only a bounded amount of chunks is queued at a time
+
+        Parameters:
+            patterns: Iterable[str]
+                Files, directories or glob patterns
+            analyze: Callable[[ELF], dict[str, Any]] (default=summarize)
+                Creates the result of an ELF object. Has to be a module level function, so it can be sent to the workers
+            workers: int (default=None)
+                Amount of worker processes (default: amount of CPUs). With 1 worker, files are analyzed in this process
+            chunk_size: int (default=16)
+                Amount of files sent to a worker at once
+            stats: bool (default=False)
+                Collect the time per stage and the counters of every file in the worker processes.
+                They are returned with the results and can be aggregated with STATS.merge
+
+        Returns:
+            Iterator[dict[str, Any]]
+                The results (see analyze_file)
+    """
+    paths = iter_elf_files(patterns)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for path in paths:
+            yield analyze_file(path, analyze, stats)
+        return
+
+    yield from run_chunks(analyze_chunk, paths, workers, chunk_size, analyze, stats)
+
+
+def run_chunks(function: Callable[..., list], items: Iterable, workers: int, chunk_size: int, *args) -> Iterator:
+    """
+        Runs a function over chunks of items in worker processes and yields the results as soon as a chunk is finished.
+        Items are collected while the workers run, only a bounded amount of chunks is queued at a time
+
+        Parameters:
+            function: Callable[..., list]
+                Module level function called with a chunk (list of items) and args. Returns a list of results
+            items: Iterable
+                The items, for example paths
+            workers: int
+                Amount of worker processes
+            chunk_size: int
+                Amount of items sent to a worker at once
+            args:
+                Further arguments of function
+
+        Returns:
+            Iterator
+                The results of all chunks
+    """
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunk_size)), [])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(function, chunk, *args))
+            # Keep the workers busy without queueing the whole directory tree
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+async def scan_async(patterns: Iterable[str], analyze: Callable[[ELF], dict[str, Any]] = summarize,
+                     executor: ASYNC_EXECUTOR = None, concurrency: int = 16):
+    """
+        Analyzes all ELF files of files, directories and glob patterns from asyncio code.
+        Walking the directories and analyzing the files run in the thread pool of the executor.
+        At most concurrency files are analyzed at a time, results are yielded as soon as they are finished
+
+        Parameters:
+            patterns: Iterable[str]
+                Files, directories or glob patterns
+            analyze: Callable[[ELF], dict[str, Any]] (default=summarize)
+                Creates the result of an ELF object
+            executor: ASYNC_EXECUTOR (default=None)
+                Executor running the blocking work (default: twelfe.asynchronous.default_executor)
+            concurrency: int (default=16)
+                Maximum amount of files analyzed at a time
+
+        Returns:
+            AsyncIterator[dict[str, Any]]
+                The results (see analyze_file)
+    """
+    executor = executor or default_executor
+    paths = iter_elf_files(patterns)
+    pending = set()
+    while True:
+        path = await executor.run(next, paths, None)
+        if path is None:
+            break
+        pending.add(asyncio.ensure_future(executor.run(analyze_file, path, analyze)))
+        if len(pending) >= concurrency:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            yield task.result()
@@ -0,0 +1,200 @@
+"""
+    Persistent index of the GNU build IDs of all ELF files of directory trees (build ID -> paths),
+    for example to find the debug files of the modules of a core dump.
+    Only the NOTE segments of the files are read (see ELF.get_build_id). Updates are incremental: files whose
+    modification time and size did not change are not read again. Changed files are read in worker processes.
+"""
+
+import marshal
+import os
+from typing import Iterable, Iterator
+
+from .batch import ELF_MAGIC, run_chunks
+from .elf import ELF
+from .reader import FILE_READER
+
+INDEX_MAGIC = b"TWELFE-BUILD-ID\x01"
+
+
+def walk(directory: str) -> Iterator[tuple[str, int, int]]:
+    """
+        Yields all regular files of a directory tree. Symbolic links are not followed
+
+        Returns:
+            Iterator[tuple[str, int, int]]
+                Path, modification time (ns) and size of every file
+    """
+    directories = [directory]
+    while directories:
+        try:
+            entries = os.scandir(directories.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        yield entry.path, stat.st_mtime_ns, stat.st_size
+                except OSError:
+                    continue
+
+
+def read_build_id(path: str) -> str:
+    """
+        Reads the build ID of a file. Only the ELF header, the program headers and the NOTE segments are read
+
+        Returns:
+            str
+                The build ID as hex string or None, if the file is no ELF file or has no build ID
+    """
+    try:
+        reader = FILE_READER(path)
+    except OSError:
+        return None
+    try:
+        if reader[0:4] != ELF_MAGIC:
+            return None
+        return ELF(path, reader, lazy=True).get_build_id()
+    except Exception:
+        return None
+    finally:
+        reader.close()
+
+
+def read_build_ids(files: list[tuple[str, int, int]]) -> list[tuple[str, int, int, str]]:
+    """
+        Reads the build IDs of a chunk of files (path, modification time, size) in a worker process
+    """
+    return [(path, mtime, size, read_build_id(path)) for path, mtime, size in files]
+
+
+class BUILD_ID_INDEX(object):
+    def __init__(self, path: str) -> None:
+        """
+            Loads the index. If the file does not exist (or is invalid), the index starts empty
+
+            Parameters:
+                path: str
+                    Path of the index file
+        """
+        self.path = path
+        # Path -> (modification time, size, build ID). Non-ELF files are kept with build ID None, so they are not read again
+        self.files: dict[str, tuple[int, int, str]] = {}
+        self._build_ids: dict[str, list[str]] = None
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "rb") as index_file:
+                if index_file.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                    print(f"[!] Ignoring invalid build ID index {self.path}")
+                    return
+                self.files = marshal.load(index_file)
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, ValueError, TypeError):
+            print(f"[!] Ignoring invalid build ID index {self.path}")
+            self.files = {}
+        self._build_ids = None
+
+    def save(self) -> None:
+        """
+            Writes the index atomically
+        """
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as index_file:
+                index_file.write(INDEX_MAGIC)
+                marshal.dump(self.files, index_file)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"[!] Could not write build ID index {self.path}: {e}")
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+
+    def update(self, directories: Iterable[str], workers: int = None, chunk_size: int = 256, save: bool = True) -> dict[str, int]:
+        """
+            Adds new and changed files of directory trees and removes deleted ones.
+            Files are compared by modification time and size, only new and changed files are read
+
+            Parameters:
+                directories: Iterable[str]
+                    The directory trees
+                workers: int (default=None)
+                    Amount of worker processes (default: amount of CPUs). With 1 worker, files are read in this process
+                chunk_size: int (default=256)
+                    Amount of files sent to a worker at once
+                save: bool (default=True)
+                    Write the index after the update
+
+            Returns:
+                dict[str, int]
+                    Amount of "files" in the directories, "read" (new or changed), "removed" files and "build_ids" found while reading
+        """
+        roots = [os.path.abspath(directory) for directory in directories]
+        workers = workers or os.cpu_count() or 1
+        seen = set()
+        stats = {"files": 0, "read": 0, "removed": 0, "build_ids": 0}
+
+        def changed():
+            for root in roots:
+                for path, mtime, size in walk(root):
+                    seen.add(path)
+                    stats["files"] += 1
+                    known = self.files.get(path)
+                    if known is None or known[0] != mtime or known[1] != size:
+                        yield path, mtime, size
+
+        if workers == 1:
+            results = read_build_ids(changed())
+        else:
+            results = run_chunks(read_build_ids, changed(), workers, chunk_size)
+        for path, mtime, size, build_id in results:
+            self.files[path] = (mtime, size, build_id)
+            stats["read"] += 1
+            if build_id is not None:
+                stats["build_ids"] += 1
+
+        prefixes = tuple(root.rstrip(os.sep) + os.sep for root in roots)
+        for path in [path for path in self.files if path.startswith(prefixes) and path not in seen]:
+            del self.files[path]
+            stats["removed"] += 1
+
+        self._build_ids = None
+        if save:
+            self.save()
+        return stats
+
+    @property
+    def build_ids(self) -> dict[str, list[str]]:
+        """
+            Build ID -> paths of all files with this build ID (for example a binary and its debug file). Built on first access
+        """
+        if self._build_ids is None:
+            self._build_ids = {}
+            for path, (_, _, build_id) in self.files.items():
+                if build_id is not None:
+                    self._build_ids.setdefault(build_id, []).append(path)
+        return self._build_ids
+
+    def lookup(self, build_id: str) -> list[str]:
+        """
+            Returns the paths of all files with a build ID
+
+            Parameters:
+                build_id: str
+                    The build ID as hex string (see ELF.get_build_id)
+
+            Returns:
+                list[str]
+                    The paths, empty if no file has this build ID
+        """
+        return self.build_ids.get(build_id.lower(), [])
+
+    def __len__(self) -> int:
+        return len(self.build_ids)
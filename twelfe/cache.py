@@ -0,0 +1,377 @@
+"""
+    Caches of parsed ELF files.
+    PARSE_CACHE is a persistent on-disk cache of parsed ELF files.
+    The decoded program and section header tables, the section names and the symbol indexes are stored
+    in a compact binary format (integer columns as raw arrays, serialized with marshal).
+    Entries are keyed by the identity of the file (device, inode, size, mtime) or by a hash of its content.
+    Note: only use cache directories which are not writable by others, entries are trusted when loaded.
+    ELF_CACHE is a thread-safe in-process cache of opened ELF objects, which can be used by several threads at once.
+"""
+
+import hashlib
+import marshal
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from . import instrumentation
+from .elf import ELF
+from .reader import FILE_READER
+
+CACHE_MAGIC = b"TWELFEC1"
+SYMBOL_TABLES = (".symtab", ".dynsym")
+
+
+def columns_to_bytes(columns: dict[str, array]) -> dict[str, bytes]:
+    return {field: column.tobytes() for field, column in columns.items()}
+
+
+def columns_from_bytes(columns: dict[str, bytes]) -> dict[str, array]:
+    result = {}
+    for field, raw in columns.items():
+        column = array("Q")
+        column.frombytes(raw)
+        result[field] = column
+    return result
+
+
+class PARSE_CACHE(object):
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, key: str = "stat") -> None:
+        """
+            Creates the cache
+
+            Parameters:
+                directory: str
+                    Directory of the cache entries. Created, if it does not exist
+                max_bytes: int (default=256 MB)
+                    Maximum size of all entries. The least recently used entries are evicted
+                key: str (default="stat")
+                    "stat" keys entries by (device, inode, size, mtime_ns) of the file,
+                    "content" by the SHA-256 hash of the content (reads the whole file on every open)
+        """
+        if key not in ("stat", "content"):
+            raise ValueError(f"Unknown cache key {key}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.key = key
+        os.makedirs(directory, exist_ok=True)
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "bytes_saved": self.bytes_saved, "evictions": self.evictions}
+
+    def file_key(self, file: str) -> tuple:
+        """
+            Returns the key of a file (see key in __init__)
+        """
+        if self.key == "content":
+            digest = hashlib.sha256()
+            with open(file, "rb") as elf_file:
+                for chunk in iter(lambda: elf_file.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            return ("content", digest.hexdigest())
+        stat = os.stat(file)
+        return ("stat", stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def entry_path(self, key: tuple) -> str:
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + ".twelfe")
+
+    def open(self, file: str, use_mmap: bool = False, use_pread: bool = False) -> ELF:
+        """
+            Opens an ELF file (see ELF.from_file). If there is a valid entry, the headers, section names and
+            symbol indexes are loaded from the cache instead of being parsed. Otherwise the file is parsed and stored
+
+            Parameters:
+                file: str
+                    Path to the ELF file
+                use_mmap: bool (default=False)
+                    Memory-map the file (see ELF.from_file)
+                use_pread: bool (default=False)
+                    Only read the needed byte ranges (see ELF.from_file)
+
+            Returns:
+                ELF
+                    The ELF object
+        """
+        key = self.file_key(file)
+        path = self.entry_path(key)
+        entry = self.load_entry(path, key)
+
+        if entry is not None:
+            elf = ELF.from_file(file, use_mmap=use_mmap, lazy=True, use_pread=use_pread)
+            self.restore(elf, entry)
+            self.hits += 1
+            instrumentation.count("parse_cache_hits")
+            self.bytes_saved += entry["parsed_bytes"]
+            # Mark the entry as recently used. Best effort: another process might have evicted it meanwhile
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return elf
+
+        self.misses += 1
+        instrumentation.count("parse_cache_misses")
+        elf = ELF.from_file(file, use_mmap=use_mmap, use_pread=use_pread)
+        self.store_entry(path, self.dump(elf, key))
+        return elf
+
+    def load_entry(self, path: str, key: tuple) -> dict:
+        """
+            Reads and validates an entry. Returns None, if there is no valid entry
+        """
+        try:
+            with open(path, "rb") as entry_file:
+                if entry_file.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                    return None
+                entry = marshal.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError):
+            print(f"[!] Removing invalid cache entry {path}")
+            self.remove(path)
+            return None
+
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        return entry
+
+    def store_entry(self, path: str, entry: dict) -> None:
+        """
+            Writes an entry atomically and evicts the least recently used entries, if the cache is too large
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as entry_file:
+                entry_file.write(CACHE_MAGIC)
+                marshal.dump(entry, entry_file)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"[!] Could not write cache entry {path}: {e}")
+            self.remove(temporary)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".twelfe"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.remove(os.path.join(self.directory, name))
+            total -= size
+            self.evictions += 1
+
+    def remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """
+            Removes all entries of the cache
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith(".twelfe"):
+                self.remove(os.path.join(self.directory, name))
+
+    def dump(self, elf: ELF, key: tuple) -> dict:
+        """
+            Parses everything which is cached (headers, section names, symbol indexes) and returns the entry
+        """
+        elf_header = elf.elf_header
+        section_headers = elf.section_headers
+        parsed_bytes = elf_header.e_phnum * elf_header.e_phentsize + len(section_headers) * elf_header.e_shentsize
+
+        names = {}
+        shstrtab = elf.shstrtab
+        if shstrtab is not None:
+            names = {sh_name: shstrtab.get(sh_name) for sh_name in section_headers.column("sh_name")}
+            parsed_bytes += shstrtab.size
+
+        symbols = {}
+        for section in SYMBOL_TABLES:
+            sh = elf.get_section_by_name(section)
+            if sh is None:
+                continue
+            symbol_index = elf.get_symbol_index(sh)
+            symbols[sh.index] = {
+                "columns": columns_to_bytes(symbol_index.symbols.columns),
+                "intervals": tuple(array("Q", values).tobytes() for values in (
+                    symbol_index.starts, symbol_index.ends, symbol_index.address_indexes, symbol_index.max_ends)),
+            }
+            parsed_bytes += sh.sh_size
+
+        return {
+            "key": key,
+            "parsed_bytes": parsed_bytes,
+            "program_headers": columns_to_bytes(elf.program_headers.columns),
+            "section_headers": columns_to_bytes(section_headers.columns),
+            "names": names,
+            "symbols": symbols,
+        }
+
+    def restore(self, elf: ELF, entry: dict) -> None:
+        """
+            Sets the cached headers, section names and symbol indexes of an entry on a lazy ELF object
+        """
+        elf._program_headers = elf.read_program_headers(columns_from_bytes(entry["program_headers"]))
+        elf._section_headers = elf.read_section_headers(columns_from_bytes(entry["section_headers"]))
+        if entry["names"]:
+            elf.shstrtab.strings.update(entry["names"])
+
+        for index, symbols in entry["symbols"].items():
+            intervals = []
+            for raw in symbols["intervals"]:
+                values = array("Q")
+                values.frombytes(raw)
+                intervals.append(values)
+            elf._symbol_indexes[index] = elf.create_symbol_index(
+                elf.section_headers[index], columns_from_bytes(symbols["columns"]), tuple(intervals))
+
+
+def estimate_size(elf: ELF) -> int:
+    """
+        Estimates the memory footprint of an ELF object: its buffer (or block cache) and the decoded header tables
+    """
+    if isinstance(elf.bytes, FILE_READER):
+        size = elf.bytes.block_size * elf.bytes.cache_blocks
+    else:
+        size = len(elf.bytes)
+    for table in (elf._program_headers, elf._section_headers):
+        if table is not None:
+            size += sum(column.itemsize * len(column) for column in table.columns.values())
+    return size
+
+
+class ELF_CACHE(object):
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024) -> None:
+        """
+            Creates a thread-safe in-process cache of opened ELF objects.
+            Objects are evicted in least recently used order, once their estimated memory footprint exceeds max_bytes.
+            Entries are invalidated, when the size or modification time of the file changes.
+            Concurrent requests for the same file share one parse.
+            Evicted and invalidated objects are not closed explicitly, callers might still use them. ELF objects do not
+            form reference cycles, so their file (descriptor or mapping) is released as soon as the last caller drops them
+
+            Parameters:
+                max_bytes: int (default=512 MB)
+                    Maximum estimated memory footprint of all cached objects (see estimate_size)
+        """
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        # path -> (file key, ELF, estimated size)
+        self.entries: OrderedDict[str, tuple] = OrderedDict()
+        # (path, file key) -> Future of the ELF object, which is currently parsed
+        self.loading: dict[tuple, Future] = {}
+        self.total_bytes = 0
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "shared": self.shared, "evictions": self.evictions,
+                    "invalidations": self.invalidations, "entries": len(self.entries), "bytes": self.total_bytes}
+
+    def open(self, file: str, use_mmap: bool = False, use_pread: bool = False) -> ELF:
+        """
+            Returns the cached ELF object of a file or opens it (see ELF.from_file).
+            The returned object is shared, it must not be closed by the caller
+
+            Parameters:
+                file: str
+                    Path to the ELF file
+                use_mmap: bool (default=False)
+                    Memory-map the file, if it has to be opened
+                use_pread: bool (default=False)
+                    Only read the needed byte ranges, if the file has to be opened
+
+            Returns:
+                ELF
+                    The ELF object
+        """
+        path = os.path.abspath(file)
+        stat = os.stat(path)
+        key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None:
+                if entry[0] == key:
+                    self.entries.move_to_end(path)
+                    self.hits += 1
+                    instrumentation.count("elf_cache_hits")
+                    return entry[1]
+                # The file changed. The old object releases its file once no caller uses it any more
+                del self.entries[path]
+                self.total_bytes -= entry[2]
+                self.invalidations += 1
+
+            future = self.loading.get((path, key))
+            owner = future is None
+            if owner:
+                future = Future()
+                self.loading[(path, key)] = future
+                self.misses += 1
+                instrumentation.count("elf_cache_misses")
+            else:
+                self.shared += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            elf = ELF.from_file(path, use_mmap=use_mmap, use_pread=use_pread)
+        except BaseException as e:
+            with self.lock:
+                del self.loading[(path, key)]
+            future.set_exception(e)
+            raise
+
+        size = estimate_size(elf)
+        with self.lock:
+            del self.loading[(path, key)]
+            self.entries[path] = (key, elf, size)
+            self.total_bytes += size
+            # Evict the least recently used objects, but keep the new one. They release their file once no caller
+            # uses them any more
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                _, (_, _, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+        future.set_result(elf)
+        return elf
+
+    def clear(self) -> None:
+        """
+            Removes all cached objects. They are not closed, they release their file once no caller uses them any more
+        """
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+
+# Process-wide cache of opened ELF objects
+process_cache = ELF_CACHE()
@@ -0,0 +1,273 @@
+"""
+    Incremental decompression of compressed sections (SHF_COMPRESSED and the GNU .zdebug* sections).
+    The content is decompressed in chunks, so large sections (for example .debug_info) can be processed
+    without inflating them completely. Decompressed chunks are kept in a small LRU cache.
+    Streams can be shared between threads, chunks are decompressed under a lock of the stream.
+    zlib is always available. zstd needs either compression.zstd (Python 3.14) or the zstandard package.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ELFCOMPRESS_ZLIB = 1
+ELFCOMPRESS_ZSTD = 2
+
+# Amount of compressed bytes read from the file at once
+INPUT_SIZE = 64 * 1024
+
+ZLIB_DECOMPRESSOR = type(zlib.decompressobj())
+
+
+def is_supported(ch_type: int) -> bool:
+    """
+        Checks if sections of a compression type (ch_type of the compression header) can be decompressed
+    """
+    if ch_type == ELFCOMPRESS_ZLIB:
+        return True
+    return ch_type == ELFCOMPRESS_ZSTD and (zstd is not None or zstandard is not None)
+
+
+def create_decompressor(ch_type: int):
+    """
+        Creates a streaming decompressor for a compression type (ch_type of the compression header)
+
+        Returns:
+            zlib.Decompress | zstd.ZstdDecompressor | zstandard.ZstdDecompressionObj
+                The decompressor or None, if the type is unknown or no zstd implementation is installed
+    """
+    if ch_type == ELFCOMPRESS_ZLIB:
+        return zlib.decompressobj()
+    if ch_type == ELFCOMPRESS_ZSTD:
+        if zstd is not None:
+            return zstd.ZstdDecompressor()
+        if zstandard is not None:
+            return zstandard.ZstdDecompressor().decompressobj()
+        print("[!] Section is zstd compressed, but neither compression.zstd nor zstandard is available")
+        return None
+    print(f"[!] Unknown compression type {ch_type}")
+    return None
+
+
+class DECOMPRESSOR_STATE(object):
+    __slots__ = ("decompressor", "position", "tail", "pending", "finished")
+
+    def __init__(self, decompressor, position: int, tail: bytes = b"", pending: bytes = b"", finished: bool = False) -> None:
+        """
+            The position of a decompression: the decompressor, the offset of the next compressed bytes in the file,
+            compressed bytes which were read but not consumed yet and decompressed bytes which were not returned yet
+        """
+        self.decompressor = decompressor
+        self.position = position
+        self.tail = tail
+        self.pending = pending
+        self.finished = finished
+
+    def copy(self):
+        """
+            Returns an independent copy of the state or None, if the decompressor can not be copied (only zlib can)
+        """
+        if not isinstance(self.decompressor, ZLIB_DECOMPRESSOR):
+            return None
+        return DECOMPRESSOR_STATE(self.decompressor.copy(), self.position, self.tail, self.pending, self.finished)
+
+
+class DECOMPRESSED_STREAM(object):
+    def __init__(self, bytes: bytearray, offset: int, size: int, ch_type: int, uncompressed_size: int,
+                 chunk_size: int = 64 * 1024, cache_chunks: int = 16, checkpoint_interval: int = 64) -> None:
+        """
+            Creates the stream. Nothing is decompressed until a chunk is accessed.
+
+            Parameters:
+                bytes: bytearray
+                    The bytes of the ELF file (bytearray, memoryview or FILE_READER)
+                offset: int
+                    Offset of the compressed data in the file (after the compression header)
+                size: int
+                    Size of the compressed data
+                ch_type: int
+                    The compression type (ELFCOMPRESS_ZLIB or ELFCOMPRESS_ZSTD)
+                uncompressed_size: int
+                    Size of the decompressed content (ch_size)
+                chunk_size: int (default=64 KB)
+                    Size of the decompressed chunks
+                cache_chunks: int (default=16)
+                    Amount of decompressed chunks kept in the cache
+                checkpoint_interval: int (default=64)
+                    Every checkpoint_interval chunks the decompressor state is saved (zlib only),
+                    so reading backwards does not have to start at the beginning of the stream
+        """
+        self.bytes = bytes
+        self.offset = offset
+        self.size = size
+        self.ch_type = ch_type
+        self.uncompressed_size = uncompressed_size
+        self.chunk_size = chunk_size
+        self.cache_chunks = cache_chunks
+        self.checkpoint_interval = checkpoint_interval
+        self.chunks: OrderedDict[int, bytes] = OrderedDict()
+        self.checkpoints: dict[int, DECOMPRESSOR_STATE] = {}
+        # The chunk which is decompressed next and the state to decompress it
+        self.cursor = 0
+        self.state = None
+        self.decompressed_chunks = 0
+        # Guards the chunk cache, the checkpoints, the cursor and the decompressor state
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.uncompressed_size
+
+    @property
+    def chunk_count(self) -> int:
+        return (self.uncompressed_size + self.chunk_size - 1) // self.chunk_size
+
+    def seek(self, index: int) -> bool:
+        """
+            Moves the cursor to the latest checkpoint (or the beginning) before a chunk, if the chunk lies before the cursor
+        """
+        if self.state is not None and index >= self.cursor:
+            return True
+
+        checkpoint = max((i for i in self.checkpoints if i <= index), default=None)
+        if checkpoint is not None:
+            self.cursor = checkpoint
+            self.state = self.checkpoints[checkpoint].copy()
+            return True
+
+        decompressor = create_decompressor(self.ch_type)
+        if decompressor is None:
+            return False
+        self.cursor = 0
+        self.state = DECOMPRESSOR_STATE(decompressor, self.offset)
+        return True
+
+    def read_input(self, state: DECOMPRESSOR_STATE) -> bytes:
+        end = self.offset + self.size
+        if state.position >= end:
+            return b""
+        data = bytes(self.bytes[state.position:min(state.position + INPUT_SIZE, end)])
+        state.position += len(data)
+        return data
+
+    def decompress_chunk(self) -> bytes:
+        """
+            Decompresses the chunk at the cursor and moves the cursor to the next chunk
+        """
+        state = self.state
+        decompressor = state.decompressor
+        pending = bytearray(state.pending)
+        while len(pending) < self.chunk_size and not state.finished:
+            if isinstance(decompressor, ZLIB_DECOMPRESSOR):
+                # zlib: output is limited to the chunk, the rest of the input is kept in unconsumed_tail
+                data = state.tail or self.read_input(state)
+                if not data:
+                    pending += decompressor.flush()
+                    state.finished = True
+                    break
+                pending += decompressor.decompress(data, self.chunk_size - len(pending))
+                state.tail = decompressor.unconsumed_tail
+            elif zstd is not None and isinstance(decompressor, zstd.ZstdDecompressor):
+                # compression.zstd: the rest of the input is buffered by the decompressor
+                data = b""
+                if decompressor.needs_input:
+                    data = self.read_input(state)
+                    if not data:
+                        state.finished = True
+                        break
+                pending += decompressor.decompress(data, self.chunk_size - len(pending))
+            else:
+                # zstandard: output is not limited, surplus is kept in pending
+                data = self.read_input(state)
+                if not data:
+                    state.finished = True
+                    break
+                pending += decompressor.decompress(data)
+            if getattr(decompressor, "eof", False):
+                state.finished = True
+
+        chunk = bytes(pending[:self.chunk_size])
+        state.pending = bytes(pending[self.chunk_size:])
+        self.cursor += 1
+        self.decompressed_chunks += 1
+        if self.cursor % self.checkpoint_interval == 0 and self.cursor not in self.checkpoints:
+            checkpoint = state.copy()
+            if checkpoint is not None:
+                self.checkpoints[self.cursor] = checkpoint
+        return chunk
+
+    def chunk(self, index: int) -> bytes:
+        """
+            Returns a decompressed chunk. Chunks are decompressed sequentially from the cursor (or the latest checkpoint)
+
+            Parameters:
+                index: int
+                    Index of the chunk (the chunk starts at index * chunk_size of the decompressed content)
+
+            Returns:
+                bytes
+                    The chunk (shorter for the last chunk) or None, if the content can not be decompressed
+        """
+        with self.lock:
+            chunk = self.chunks.get(index)
+            if chunk is not None:
+                self.chunks.move_to_end(index)
+                return chunk
+
+            if index < 0 or index >= self.chunk_count or not self.seek(index):
+                return None
+
+            while self.cursor <= index:
+                chunk = self.decompress_chunk()
+                self.chunks[self.cursor - 1] = chunk
+                if len(self.chunks) > self.cache_chunks:
+                    self.chunks.popitem(last=False)
+            return chunk
+
+    def iter_chunks(self, start: int = 0):
+        """
+            Yields the decompressed chunks one by one, starting at the chunk containing the decompressed offset start
+        """
+        for index in range(start // self.chunk_size, self.chunk_count):
+            chunk = self.chunk(index)
+            if chunk is None:
+                return
+            if index == start // self.chunk_size:
+                chunk = chunk[start % self.chunk_size:]
+            yield chunk
+
+    def read(self, offset: int, size: int) -> bytes:
+        """
+            Reads size bytes at an offset of the decompressed content
+
+            Returns:
+                bytes
+                    The bytes, shorter if the range exceeds the content
+        """
+        size = max(0, min(size, self.uncompressed_size - offset))
+        read = bytearray()
+        for chunk in self.iter_chunks(offset):
+            read += chunk[:size - len(read)]
+            if len(read) >= size:
+                break
+        return bytes(read)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.uncompressed_size)
+            read = self.read(start, max(0, stop - start))
+            return read if step == 1 else read[::step]
+        if index < 0:
+            index += self.uncompressed_size
+        if index < 0 or index >= self.uncompressed_size:
+            raise IndexError("Index out of range")
+        return self.chunk(index // self.chunk_size)[index % self.chunk_size]
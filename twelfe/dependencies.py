@@ -0,0 +1,331 @@
+"""
+    Resolves the shared library dependencies of ELF files, like ldd, without running the dynamic linker.
+    Libraries are searched inside a sysroot (for example the root file system of an image) with the search
+    order of the GNU dynamic linker: DT_RPATH (of the object and its loaders, only without DT_RUNPATH),
+    LD_LIBRARY_PATH, DT_RUNPATH, the directories of ld.so.conf and the default directories.
+    Every library is parsed only once. Libraries and lookups are memoized, so resolving many binaries
+    (for example all executables of a root file system) reuses the already resolved libraries.
+"""
+
+import glob
+import os
+import struct
+from collections import deque
+
+from .elf import ELF
+
+# Default directories, indexed by isThirtyTwo
+DEFAULT_DIRECTORIES = {
+    True: ("/lib", "/usr/lib"),
+    False: ("/lib64", "/usr/lib64", "/lib", "/usr/lib"),
+}
+
+MAX_SYMLINKS = 40
+
+# Errors of truncated or corrupt files. Such candidates are skipped, like the dynamic linker does
+PARSE_ERRORS = (OSError, ValueError, struct.error, IndexError)
+
+
+class LIBRARY(object):
+    __slots__ = ("path", "soname", "needed", "rpath", "runpath", "interpreter", "isThirtyTwo", "e_machine")
+
+    def __init__(self, path: str, elf: ELF) -> None:
+        """
+            Reads the dependency information of an ELF file.
+            $ORIGIN and $LIB in the search paths are expanded.
+            Raises a ValueError, if the file has an unknown class or its program header table exceeds the file
+            (the dynamic linker rejects such files as well)
+
+            Parameters:
+                path: str
+                    Canonical path of the file inside the sysroot
+                elf: ELF
+                    The parsed file
+        """
+        elf_header = elf.elf_header
+        if elf_header.ei_class not in (1, 2) or \
+                elf_header.e_phoff + elf_header.e_phnum * elf_header.e_phentsize > len(elf.bytes):
+            raise ValueError(f"Invalid or truncated ELF file {path}")
+        self.path = path
+        self.isThirtyTwo = elf.elf_header.isThirtyTwo
+        self.e_machine = elf.elf_header.e_machine
+        self.soname = elf.get_soname()
+        self.needed = tuple(elf.get_needed())
+        self.rpath = tuple(self.expand(directory) for directory in elf.get_rpath())
+        self.runpath = tuple(self.expand(directory) for directory in elf.get_runpath())
+        self.interpreter = elf.get_interpreter()
+
+    def expand(self, directory: str) -> str:
+        origin = os.path.dirname(self.path)
+        lib = "lib" if self.isThirtyTwo else "lib64"
+        for token, value in (("${ORIGIN}", origin), ("$ORIGIN", origin), ("${LIB}", lib), ("$LIB", lib)):
+            directory = directory.replace(token, value)
+        return directory
+
+    def is_compatible(self, other) -> bool:
+        """
+            Checks if the library can be loaded by another object (same class and machine)
+        """
+        return self.isThirtyTwo == other.isThirtyTwo and self.e_machine == other.e_machine
+
+    def __str__(self):
+        return self.path
+
+
+class DEPENDENCY_RESOLVER(object):
+    def __init__(self, sysroot: str = "/", library_path: list[str] = None, use_ld_so_conf: bool = True) -> None:
+        """
+            Creates the resolver. Use one resolver for many binaries of the same sysroot, to reuse the parsed libraries
+
+            Parameters:
+                sysroot: str (default="/")
+                    The root directory. All paths (search paths, symbolic links, results) are relative to it
+                library_path: list[str] (default=None)
+                    Directories searched like LD_LIBRARY_PATH
+                use_ld_so_conf: bool (default=True)
+                    Search the directories of /etc/ld.so.conf (and its included files) of the sysroot
+        """
+        self.sysroot = os.path.abspath(sysroot).rstrip("/")
+        self.library_path = tuple(library_path or ())
+        self.configured_directories = tuple(self.read_ld_so_conf("/etc/ld.so.conf")) if use_ld_so_conf else ()
+
+        # Canonical path -> LIBRARY (None for missing and non-ELF files)
+        self.libraries: dict[str, LIBRARY] = {}
+        # Path -> canonical path
+        self.canonical_paths: dict[str, str] = {}
+        # (name, search directories, class, machine) -> LIBRARY
+        self.lookups: dict[tuple, LIBRARY] = {}
+
+    def host_path(self, path: str) -> str:
+        """
+            Returns the path of a sysroot path on the host
+        """
+        return self.sysroot + path
+
+    def canonical_path(self, path: str) -> str:
+        """
+            Resolves the symbolic links of a path inside the sysroot (absolute link targets are relative to the sysroot)
+
+            Parameters:
+                path: str
+                    Absolute path inside the sysroot
+
+            Returns:
+                str
+                    The canonical path inside the sysroot or None, if there are too many symbolic links
+        """
+        canonical_path = self.canonical_paths.get(path)
+        if canonical_path is not None:
+            return canonical_path
+
+        parts = deque(path.split("/"))
+        current = ""
+        links = 0
+        while parts:
+            part = parts.popleft()
+            if part in ("", "."):
+                continue
+            if part == "..":
+                current = current.rsplit("/", 1)[0]
+                continue
+
+            candidate = f"{current}/{part}"
+            host_path = self.host_path(candidate)
+            if not os.path.islink(host_path):
+                current = candidate
+                continue
+
+            links += 1
+            if links > MAX_SYMLINKS:
+                print(f"[!] Too many symbolic links: {path}")
+                return None
+            target = os.readlink(host_path)
+            if target.startswith("/"):
+                current = ""
+            parts.extendleft(reversed(target.split("/")))
+
+        canonical_path = current or "/"
+        self.canonical_paths[path] = canonical_path
+        return canonical_path
+
+    def read_ld_so_conf(self, path: str, depth: int = 0) -> list[str]:
+        """
+            Reads the library directories of an ld.so.conf file of the sysroot, including the files of include directives
+
+            Returns:
+                list[str]
+                    The directories in the order of the files
+        """
+        directories = []
+        try:
+            with open(self.host_path(path), "r", errors="replace") as conf:
+                lines = conf.readlines()
+        except OSError:
+            return directories
+
+        for line in lines:
+            line = line.split("#", 1)[0].strip()
+            if not line or line.startswith("hwcap"):
+                continue
+            if line.startswith("include") and depth < MAX_SYMLINKS:
+                for pattern in line.split()[1:]:
+                    if not pattern.startswith("/"):
+                        pattern = os.path.join(os.path.dirname(path), pattern)
+                    for match in sorted(glob.glob(self.host_path(pattern))):
+                        directories.extend(self.read_ld_so_conf(match[len(self.sysroot):], depth + 1))
+                continue
+            directories.extend(directory for directory in line.replace(":", " ").replace(",", " ").split() if directory)
+        return directories
+
+    def load(self, path: str) -> LIBRARY:
+        """
+            Parses an ELF file once and returns its dependency information
+
+            Parameters:
+                path: str
+                    Absolute path inside the sysroot
+
+            Returns:
+                LIBRARY
+                    The library or None, if the file does not exist, is not an ELF file or is truncated or corrupt
+        """
+        path = self.canonical_path(path)
+        if path is None:
+            return None
+        if path in self.libraries:
+            return self.libraries[path]
+
+        library = None
+        host_path = self.host_path(path)
+        if os.path.isfile(host_path):
+            try:
+                elf = ELF.from_file(host_path, lazy=True, use_pread=True)
+            except PARSE_ERRORS:
+                elf = None
+            if elf is not None:
+                try:
+                    library = LIBRARY(path, elf)
+                except PARSE_ERRORS:
+                    library = None
+                finally:
+                    elf.close()
+        self.libraries[path] = library
+        return library
+
+    def search_directories(self, library: LIBRARY, loaders: tuple) -> tuple:
+        """
+            Returns the directories searched for the needed libraries of a library, in the order of the dynamic linker
+
+            Parameters:
+                library: LIBRARY
+                    The library, whose needed libraries are searched
+                loaders: tuple[LIBRARY, ...]
+                    The chain of libraries which loaded the library (the binary first)
+        """
+        directories = []
+        if not library.runpath:
+            for loader in (library, *reversed(loaders)):
+                directories.extend(loader.rpath)
+        directories.extend(self.library_path)
+        directories.extend(library.runpath)
+        directories.extend(self.configured_directories)
+        directories.extend(DEFAULT_DIRECTORIES[library.isThirtyTwo])
+        return tuple(dict.fromkeys(directories))
+
+    def find(self, name: str, library: LIBRARY, loaders: tuple = ()) -> LIBRARY:
+        """
+            Finds a needed library (DT_NEEDED) of a library. Results are memoized
+
+            Parameters:
+                name: str
+                    The needed name, for example "libc.so.6". Names containing a slash are used as path
+                library: LIBRARY
+                    The library which needs the library
+                loaders: tuple[LIBRARY, ...] (default=())
+                    The chain of libraries which loaded the library (the binary first)
+
+            Returns:
+                LIBRARY
+                    The found library or None, if there is no compatible library with this name
+        """
+        if "/" in name:
+            if not name.startswith("/"):
+                name = os.path.join(os.path.dirname(loaders[0].path if loaders else library.path), name)
+            dependency = self.load(name)
+            return dependency if dependency is not None and dependency.is_compatible(library) else None
+
+        directories = self.search_directories(library, loaders)
+        key = (name, directories, library.isThirtyTwo, library.e_machine)
+        if key in self.lookups:
+            return self.lookups[key]
+
+        found = None
+        for directory in directories:
+            dependency = self.load(f"{directory.rstrip('/')}/{name}")
+            if dependency is not None and dependency.is_compatible(library):
+                found = dependency
+                break
+        self.lookups[key] = found
+        return found
+
+    def resolve(self, path: str) -> list[tuple[str, str]]:
+        """
+            Resolves the transitive dependencies of a binary in load order (breadth first, like the dynamic linker).
+            Every needed name is resolved once per binary, like an already loaded library is reused by the dynamic linker
+
+            Parameters:
+                path: str
+                    Absolute path of the binary inside the sysroot
+
+            Returns:
+                list[tuple[str, str]]
+                    The needed names and the canonical paths (inside the sysroot) of the found libraries, None for missing libraries.
+                    The program interpreter is listed last. None, if the binary is no ELF file
+        """
+        binary = self.load(path)
+        if binary is None:
+            print(f"[!] Not an ELF file: {path}")
+            return None
+
+        # The program interpreter is loaded first, libraries needing its name (for example libc) use it
+        interpreter = self.load(binary.interpreter) if binary.interpreter else None
+        dependencies = []
+        loaded = {library.soname for library in (binary, interpreter) if library is not None and library.soname}
+        queue = deque([(binary, ())])
+        while queue:
+            library, loaders = queue.popleft()
+            for name in library.needed:
+                if name in loaded:
+                    continue
+                loaded.add(name)
+                dependency = self.find(name, library, loaders)
+                dependencies.append((name, dependency.path if dependency is not None else None))
+                if dependency is not None:
+                    if dependency.soname:
+                        loaded.add(dependency.soname)
+                    queue.append((dependency, (*loaders, library)))
+
+        if binary.interpreter:
+            dependencies.append((binary.interpreter, interpreter.path if interpreter is not None else None))
+        return dependencies
+
+    def resolve_many(self, paths):
+        """
+            Resolves the dependencies of many binaries (see resolve), sharing the parsed libraries and lookups
+
+            Parameters:
+                paths: Iterable[str]
+                    Absolute paths of the binaries inside the sysroot
+
+            Returns:
+                Iterator[tuple[str, list[tuple[str, str]]]]
+                    The path and the dependencies of every binary
+        """
+        for path in paths:
+            yield path, self.resolve(path)
+
+    def missing(self, path: str) -> list[str]:
+        """
+            Returns the needed names of a binary, which could not be found (see resolve)
+        """
+        return [name for name, found in self.resolve(path) or () if found is None]
@@ -0,0 +1,112 @@
+"""
+    Represent an entry of the dynamic section (.dynamic).
+    Note: fields are integers (named like in the ELF specification, for example d_tag).
+    For tags whose value is a string (for example DT_NEEDED), the string is resolved through the dynamic string table, when it is accessed.
+"""
+
+from .string_table import STRING_TABLE
+
+DT_NULL = 0
+DT_NEEDED = 1
+DT_STRTAB = 5
+DT_SYMTAB = 6
+DT_STRSZ = 10
+DT_SONAME = 14
+DT_RPATH = 15
+DT_RUNPATH = 29
+
+# Tags whose value is an offset into the dynamic string table
+STRING_TAGS = (DT_NEEDED, DT_SONAME, DT_RPATH, DT_RUNPATH)
+
+DYNAMIC_TAGS = {
+    0: "NULL",
+    1: "NEEDED",
+    2: "PLTRELSZ",
+    3: "PLTGOT",
+    4: "HASH",
+    5: "STRTAB",
+    6: "SYMTAB",
+    7: "RELA",
+    8: "RELASZ",
+    9: "RELAENT",
+    10: "STRSZ",
+    11: "SYMENT",
+    12: "INIT",
+    13: "FINI",
+    14: "SONAME",
+    15: "RPATH",
+    16: "SYMBOLIC",
+    17: "REL",
+    18: "RELSZ",
+    19: "RELENT",
+    20: "PLTREL",
+    21: "DEBUG",
+    22: "TEXTREL",
+    23: "JMPREL",
+    24: "BIND_NOW",
+    25: "INIT_ARRAY",
+    26: "FINI_ARRAY",
+    27: "INIT_ARRAYSZ",
+    28: "FINI_ARRAYSZ",
+    29: "RUNPATH",
+    30: "FLAGS",
+    32: "PREINIT_ARRAY",
+    33: "PREINIT_ARRAYSZ",
+    34: "SYMTAB_SHNDX",
+    35: "RELRSZ",
+    36: "RELR",
+    37: "RELRENT",
+    0x6ffffef5: "GNU_HASH",
+    0x6ffffff0: "VERSYM",
+    0x6ffffff9: "RELACOUNT",
+    0x6ffffffa: "RELCOUNT",
+    0x6ffffffb: "FLAGS_1",
+    0x6ffffffc: "VERDEF",
+    0x6ffffffd: "VERDEFNUM",
+    0x6ffffffe: "VERNEED",
+    0x6fffffff: "VERNEEDNUM",
+}
+
+
+class DYNAMIC_ENTRY(object):
+    __slots__ = ("index", "d_tag", "d_val", "string_table")
+
+    def __init__(self, index: int, values: tuple, string_table: STRING_TABLE) -> None:
+        """
+            Creates the entry from its decoded values (d_tag, d_val, see DYNAMIC_LAYOUTS)
+        """
+        self.index = index
+        self.d_tag, self.d_val = values
+        self.string_table = string_table
+
+    @property
+    def value(self):
+        """
+            The string of string tags (for example the library name of DT_NEEDED), else d_val
+        """
+        if self.d_tag in STRING_TAGS and self.string_table is not None:
+            return self.string_table.get(self.d_val)
+        return self.d_val
+
+    def tag_to_string(self) -> str:
+        return DYNAMIC_TAGS.get(self.d_tag, f"Unknown tag (read {self.d_tag:x})")
+
+    def to_dict(self) -> dict:
+        """
+            Returns the entry as dictionary of the integer fields and their string representations
+        """
+        return {
+            "index": self.index,
+            "tag": self.tag_to_string(),
+            "value": self.value,
+            "d_tag": self.d_tag,
+            "d_val": self.d_val,
+        }
+
+    def __str__(self):
+        value = self.value
+        if isinstance(value, int):
+            value = f"0x{value:x}"
+        return f"{self.index:<5}"\
+            f"{self.tag_to_string():<20}"\
+            f"{value}"
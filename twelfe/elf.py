@@ -2,29 +2,114 @@
     Represent an ELF file. Consists of ELF, program and section headers
 """
 
+import mmap
+import os
+import struct
+import threading
+import time
+
+from . import instrumentation
+from .address_map import ADDRESS_MAP
+from .asynchronous import ASYNC_EXECUTOR, copied, default_executor
+from .compression import DECOMPRESSED_STREAM, ELFCOMPRESS_ZLIB, is_supported
+from .dynamic import DYNAMIC_ENTRY, DT_NULL, DT_NEEDED, DT_SONAME, DT_RPATH, DT_RUNPATH, DT_STRTAB, DT_STRSZ
 from .program_header import PROGRAM_HEADER
+from .reader import FILE_READER
 from .elf_header import ELF_HEADER
+from .hash_table import GNU_HASH_TABLE, HASH_TABLE
+from .note import NOTE, NT_GNU_BUILD_ID, iter_notes
 from .section_header import SECTION_HEADER
-from .util import read_bytes, read_until_nullbyte
+from .search import BYTE_SEARCH, search_file_parallel
+from .section_index import SECTION_INDEX
+from .layouts import PROGRAM_HEADER_LAYOUTS, PROGRAM_HEADER_FIELDS, SECTION_HEADER_LAYOUTS, SECTION_HEADER_FIELDS, \
+    SYMBOL_LAYOUTS, SYMBOL_FIELDS, COMPRESSION_HEADER_LAYOUTS, COMPRESSION_HEADER_FIELDS, NOTE_HEADER_LAYOUTS, DYNAMIC_LAYOUTS, DYNAMIC_FIELDS, REL_LAYOUTS, REL_FIELDS, RELA_LAYOUTS, RELA_FIELDS
+from .relocation import RELOCATION, symbol_indexes
+from .string_table import STRING_TABLE
+from .symbol import SYMBOL
+from .symbol_index import SYMBOL_INDEX, SHN_UNDEF
+from .table import ENTRY_TABLE
+
+
+PT_LOAD = 1
+PT_DYNAMIC = 2
+PT_INTERP = 3
+PT_NOTE = 4
+
+SHT_RELA = 4
+SHT_HASH = 5
+SHT_DYNAMIC = 6
+SHT_NOTE = 7
+SHT_NOBITS = 8
+SHT_REL = 9
+SHT_GNU_HASH = 0x6ffffff6
+
+SHF_COMPRESSED = 0x800
+
+# e_shstrndx of files whose section header string table index does not fit into the ELF header
+SHN_XINDEX = 0xffff
 
 
 class ELF(object):
     prog_header_flags = "R = Read, W = Write, E = Executable"
     section_header_flags = "W = Write, A = Alloc, X = Executabe, M = Merge, S = Strings, I = Info, O = Link Order, N = OS Nonconforming, G = Group, T = TLS"
 
-    def __init__(self, name: str, bytes: bytearray) -> None:
+    def __init__(self, name: str, bytes: bytearray, lazy: bool = False) -> None:
         """
             Initializes the ELF object.
+            bytes can either be a bytearray, a memoryview (for example of a memory-mapped file)
+            or a FILE_READER (reads byte ranges on demand).
+            Headers only keep slices of bytes, so for a memoryview no data is copied.
+            If lazy is True, only the ELF header is parsed. The program and section header tables
+            are read on their first access and cached.
             Raises an ValueError, if the file is not an ELF file
         """
         self.name = name
         self.bytes = bytes
+        # Guards the lazily built tables, indexes and streams, so ELF objects can be shared between threads
+        # (for example through ELF_CACHE). Reentrant, because the builders use each other
+        self._lock = threading.RLock()
         if not self.is_elf():
             print("[!]: File is not an ELF file")
             raise ValueError("Specified file is not an ELF File")
-        self.elf_header = ELF_HEADER(bytes)
-        self.program_headers = self.read_program_headers()
-        self.section_headers = self.read_section_headers()
+        with instrumentation.stage("elf_header"):
+            self.elf_header = ELF_HEADER(bytes)
+        self._program_headers = None
+        self._section_headers = None
+        self._section_index = None
+        self._address_map = None
+        self._string_tables: dict[int, STRING_TABLE] = {}
+        self._symbol_indexes: dict[int, SYMBOL_INDEX] = {}
+        self._symbol_tables: dict[int, ENTRY_TABLE] = {}
+        self._dynamic = None
+        self._dynamic_read = False
+        self._dynamic_string_table = None
+        # (section index, chunk size, cached chunks) -> stream
+        self._section_contents: dict[tuple, DECOMPRESSED_STREAM] = {}
+        if not lazy:
+            self._program_headers = self.read_program_headers()
+            self._section_headers = self.read_section_headers()
+
+    @property
+    def program_headers(self) -> ENTRY_TABLE:
+        """
+            The program header table. Read on first access
+        """
+        if self._program_headers is None:
+            with self._lock:
+                if self._program_headers is None:
+                    self._program_headers = self.read_program_headers()
+        return self._program_headers
+
+    @property
+    def section_headers(self) -> ENTRY_TABLE:
+        """
+            The section header table. Read on first access, section names are resolved when a section is accessed
+        """
+        if self._section_headers is None:
+            with self._lock:
+                if self._section_headers is None:
+                    self._section_headers = self.read_section_headers()
+        return self._section_headers
 
     def is_elf(self) -> bool:
         """
@@ -36,90 +121,1043 @@ class ELF(object):
         """
         return self.bytes[0:4] == b"\x7fELF"
 
-    def read_program_headers(self) -> list[PROGRAM_HEADER]:
+    def read_program_headers(self, columns: dict = None) -> ENTRY_TABLE:
         """
-            Reads all program headers. Offset is taken from the elf header
+            Reads all program headers. Offset is taken from the elf header.
+            The table is decoded at once, PROGRAM_HEADER objects are created when they are accessed
 
+            Parameters:
+                columns: dict (default=None)
+                    Already decoded columns (for example from a cache, see ENTRY_TABLE)
 
             Returns:
-                list[PROGRAM_HEADER]
-                a list of all found program headers. Size can be found beforehand (elf header 'prog_header_table_num_entries')
+                ENTRY_TABLE
+                a table of all found program headers. Size can be found beforehand (elf header 'e_phnum')
+        """
+        elf_header = self.elf_header
+        with instrumentation.stage("program_headers"):
+            table = ENTRY_TABLE(self.bytes, elf_header.e_phoff, elf_header.e_phnum, elf_header.e_phentsize,
+                                PROGRAM_HEADER_LAYOUTS[(elf_header.isThirtyTwo, elf_header.isLittleEndian)],
+                                PROGRAM_HEADER_FIELDS[elf_header.isThirtyTwo],
+                                self.create_program_header, columns, elf_header.isThirtyTwo, elf_header.isLittleEndian)
+        if columns is None:
+            instrumentation.count("program_headers_decoded", len(table))
+        return table
+
+    def read_section_headers(self, columns: dict = None) -> ENTRY_TABLE:
         """
-        program_headers = []
-        expected_header_count = int(
-            self.elf_header.prog_header_table_num_entries, 16)
-        prog_header_size = int(
-            self.elf_header.prog_header_table_entry_size, 16)
-        prog_header_start = int(self.elf_header.prog_header_table_pos, 16)
+        Reads all section headers. Offset is taken from the elf header.
+        The table is decoded at once, SECTION_HEADER objects (including their names) are created when they are accessed
 
-        for i in range(0, expected_header_count):
-            start = prog_header_start + i * prog_header_size
-            end = start + prog_header_size
+        Parameters:
+            columns: dict (default=None)
+                Already decoded columns (for example from a cache, see ENTRY_TABLE)
+
+        Returns:
+            ENTRY_TABLE
+                a table of all found section headers. Size can be found beforehand (see section_count)
+        """
+        elf_header = self.elf_header
+        with instrumentation.stage("section_headers"):
+            table = ENTRY_TABLE(self.bytes, elf_header.e_shoff, self.section_count, elf_header.e_shentsize,
+                                SECTION_HEADER_LAYOUTS[(elf_header.isThirtyTwo, elf_header.isLittleEndian)],
+                                SECTION_HEADER_FIELDS[elf_header.isThirtyTwo],
+                                self.create_section_header, columns, elf_header.isThirtyTwo, elf_header.isLittleEndian)
+        if columns is None:
+            instrumentation.count("section_headers_decoded", len(table))
 
-            program_headers.append(
-                PROGRAM_HEADER(self.bytes[start:end], i, self.elf_header.cls == "01"))
+        # The names are stored in the section header string table (index: 'e_shstrndx' in the elf header, see
+        # section_string_table_index). The table keeps it, so the headers can resolve their names without the ELF object
+        # Files without section names (stripped of .shstrtab) set it to SHN_UNDEF
+        index = self.section_string_table_index
+        if SHN_UNDEF < index < len(table):
+            table.string_table = self.get_string_table(index, table)
+        return table
 
-        return program_headers
+    @property
+    def section_count(self) -> int:
+        """
+            Amount of section headers. Files with 0xff00 or more sections set e_shnum to 0
+            and store the amount in sh_size of the first section header
+        """
+        elf_header = self.elf_header
+        if elf_header.e_shnum == 0 and elf_header.e_shoff != 0:
+            return self.read_first_section_header().sh_size
+        return elf_header.e_shnum
 
-    def read_section_headers(self) -> list[SECTION_HEADER]:
+    @property
+    def section_string_table_index(self) -> int:
+        """
+            Index of the section header string table. If it does not fit into e_shstrndx (SHN_XINDEX),
+            it is stored in sh_link of the first section header
         """
-        Reads all section headers. Offset is taken from the elf header
+        elf_header = self.elf_header
+        if elf_header.e_shstrndx == SHN_XINDEX:
+            return self.read_first_section_header().sh_link
+        return elf_header.e_shstrndx
 
+    def read_first_section_header(self) -> SECTION_HEADER:
+        """
+            Decodes the first section header (index 0) without reading the section header table
+        """
+        elf_header = self.elf_header
+        layout = SECTION_HEADER_LAYOUTS[(elf_header.isThirtyTwo, elf_header.isLittleEndian)]
+        table = ENTRY_TABLE(self.bytes, elf_header.e_shoff, 1, layout.size, layout, SECTION_HEADER_FIELDS[elf_header.isThirtyTwo],
+                            self.create_section_header, None, elf_header.isThirtyTwo, elf_header.isLittleEndian)
+        return table[0]
 
-        Returns:
-            list[SECTION_HEADER]
-                a list of all found program headers. Size can be found beforehand (elf header 'section_header_table_num_entries')
+    # The row factories are static methods: the tables must not reference the ELF object (see ENTRY_TABLE)
+    @staticmethod
+    def create_program_header(table: ENTRY_TABLE, index: int) -> PROGRAM_HEADER:
         """
-        section_headers: list[SECTION_HEADER] = []
-        expected_header_count = int(
-            self.elf_header.section_header_table_num_entries, 16)
-        section_header_size = int(
-            self.elf_header.section_header_table_entry_size, 16)
-        section_header_start = int(
-            self.elf_header.section_header_table_pos, 16)
+            Creates the PROGRAM_HEADER of an entry of the program header table
+        """
+        return PROGRAM_HEADER(table, index)
+
+    @staticmethod
+    def create_section_header(table: ENTRY_TABLE, index: int) -> SECTION_HEADER:
+        """
+            Creates the SECTION_HEADER of an entry of the section header table and adds its name
+            (empty, if the table has no string table)
+        """
+        sh = SECTION_HEADER(table, index)
+        string_table = table.string_table
+        if string_table is None:
+            sh.name = ""
+            return sh
+
+        stats = instrumentation.active
+        if stats is None:
+            sh.name = string_table.get(sh.sh_name)
+            return sh
 
-        for i in range(0, expected_header_count):
-            start = section_header_start + i * section_header_size
-            end = start + section_header_size
-            section_headers.append(
-                SECTION_HEADER(self.bytes[start:end], i, self.elf_header.cls == "01"))
+        start = time.perf_counter()
+        sh.name = string_table.get(sh.sh_name)
+        stats.add_time("section_names", time.perf_counter() - start)
+        return sh
 
+    def get_string_table(self, index: int, section_headers: ENTRY_TABLE = None) -> STRING_TABLE:
         """
-            Add the names to the sections
-            First find the string table section (index: 'section_header_string_table_index' in the elf header)
-            Calculated address by using the shstrab offset and the individuel section offset
-            Read name until NULL Byte
-            Turn bytes into utf-8 string
+            Returns the string table of a section. String tables are created once and cached
+
+            Parameters:
+                index: int
+                    Index of the string table section (for example sh_link of a symbol table)
+                section_headers: ENTRY_TABLE (default=None)
+                    The section header table (used while it is read, see read_section_headers)
 
+            Returns:
+                STRING_TABLE
+                    The string table or None, if the index is invalid
         """
-        shstrab = section_headers[int(
-            self.elf_header.section_header_string_table_index, 16)]
-        for sh in section_headers:
-            string_table_offset = int(sh.name_offset, 16)
-            start = int(shstrab.offset, 16) + string_table_offset
-            name = read_until_nullbyte(self.bytes, start)
-            sh.name = bytes.fromhex(name).decode('utf-8')[::-1]
+        string_table = self._string_tables.get(index)
+        if string_table is not None:
+            return string_table
+
+        with self._lock:
+            string_table = self._string_tables.get(index)
+            if string_table is None:
+                if section_headers is None:
+                    section_headers = self.section_headers
+                if index < 0 or index >= len(section_headers):
+                    print(f"[!] Invalid string table index {index}")
+                    return None
+                string_table = STRING_TABLE(self.bytes, section_headers.column("sh_offset")[index],
+                                            section_headers.column("sh_size")[index])
+                self._string_tables[index] = string_table
+                instrumentation.count("string_tables")
+            return string_table
 
-        return section_headers
+    @property
+    def shstrtab(self) -> STRING_TABLE:
+        """
+            The section header string table, containing the section names. None, if the file has none (SHN_UNDEF)
+        """
+        index = self.section_string_table_index
+        if index == SHN_UNDEF:
+            return None
+        return self.get_string_table(index)
 
     """ Getter utilities """
 
+    @property
+    def section_index(self) -> SECTION_INDEX:
+        """
+            Lookup indexes over the section headers. Built on first access
+        """
+        if self._section_index is None:
+            with self._lock:
+                if self._section_index is None:
+                    self._section_index = SECTION_INDEX(self.section_headers, self.shstrtab)
+        return self._section_index
+
     def get_section_by_flag(self, flag: str) -> list[SECTION_HEADER]:
-        sections = [
-            sh for sh in self.section_headers if flag in sh.flags_to_string()]
         #"W = Write, A = Alloc, X = Executabe, M = Merge, S = Strings, I = Info, O = Link Order, N = OS Nonconforming, G = Group, T = TLS"
-        return sections
+        return self.section_index.by_flag(flag)
 
     def get_section_by_index(self, index: int) -> SECTION_HEADER:
-        match = [sh for sh in self.section_headers if sh.index == index]
-        if len(match) > 0:
-            return match[0]
+        return self.section_index.by_index(index)
+
+    def get_section_by_name(self, name: str) -> SECTION_HEADER:
+        return self.section_index.by_name(name)
+
+    def get_section_by_type(self, section_type) -> list[SECTION_HEADER]:
+        """
+            Returns all sections of a type
+
+            Parameters:
+                section_type: int | str
+                    The type either as integer (sh_type) or as string (see SECTION_HEADER.type_to_string, for example "DYNSYM")
+
+            Returns:
+                list[SECTION_HEADER]
+                    All sections of the type, ordered by index
+        """
+        if isinstance(section_type, str):
+            return [sh for sh_type in self.section_index.types
+                    for sh in self.section_index.by_type(sh_type) if sh.type_to_string() == section_type]
+        return self.section_index.by_type(section_type)
+
+    def get_section_by_address(self, address: int) -> SECTION_HEADER:
+        """
+            Returns the section containing a virtual address
+
+            Parameters:
+                address: int
+                    The virtual address
+
+            Returns:
+                SECTION_HEADER
+                    The section which contains the address or None, if no allocated section contains it
+        """
+        return self.section_index.by_address(address)
+
+    @property
+    def address_map(self) -> ADDRESS_MAP:
+        """
+            Virtual address to file offset translation, built from the LOAD segments on first access
+        """
+        if self._address_map is None:
+            with self._lock:
+                if self._address_map is None:
+                    self._address_map = ADDRESS_MAP(self.program_headers, self.section_headers)
+        return self._address_map
+
+    def address_to_offset(self, address: int) -> int:
+        """
+            Translates a virtual address into a file offset
+
+            Parameters:
+                address: int
+                    The virtual address
+
+            Returns:
+                int
+                    The file offset or None, if the address is not mapped or lies in a zero-filled part (for example .bss)
+        """
+        return self.address_map.translate(address)
+
+    def addresses_to_offsets(self, addresses) -> list[int]:
+        """
+            Translates many virtual addresses into file offsets at once (see address_to_offset)
+
+            Parameters:
+                addresses: Iterable[int]
+                    The virtual addresses
+
+            Returns:
+                list[int]
+                    The file offsets in the order of the addresses
+        """
+        return self.address_map.translate_many(addresses)
+
+    """ Symbol utilities """
+
+    def get_symbol_section(self, section) -> SECTION_HEADER:
+        """
+            Returns the section of a symbol table
+
+            Parameters:
+                section: str | SECTION_HEADER
+                    Name of the symbol table section (for example ".symtab" or ".dynsym") or the section itself
+
+            Returns:
+                SECTION_HEADER
+                    The section or None, if there is no such section
+        """
+        if isinstance(section, SECTION_HEADER):
+            return section
+        sh = self.get_section_by_name(section)
+        if sh is None:
+            print(f"[!] No symbol table {section}")
+        return sh
+
+    def iter_symbols(self, section=".symtab", chunk_size: int = 4096):
+        """
+            Yields the symbols of a symbol table one by one.
+            The table is decoded in chunks of chunk_size entries, so memory stays constant for large tables.
+            Names are resolved through the linked string table, when they are accessed
+
+            Parameters:
+                section: str | SECTION_HEADER (default=".symtab")
+                    Name of the symbol table section (for example ".symtab" or ".dynsym") or the section itself
+                chunk_size: int (default=4096)
+                    Amount of symbols decoded at once
+
+            Returns:
+                Iterator[SYMBOL]
+                    The symbols in the order of the table
+        """
+        sh = self.get_symbol_section(section)
+        if sh is None:
+            return
+
+        isThirtyTwo = self.elf_header.isThirtyTwo
+        layout = SYMBOL_LAYOUTS[(isThirtyTwo, self.elf_header.isLittleEndian)]
+        string_table = self.get_string_table(sh.sh_link)
+        for index, values in self.iter_entries(sh.sh_offset, sh.sh_size, sh.sh_entsize or layout.size, layout, chunk_size):
+            yield SYMBOL(index, values, isThirtyTwo, string_table)
+
+    def iter_entries(self, offset: int, size: int, entry_size: int, layout: struct.Struct, chunk_size: int = 4096):
+        """
+            Yields the decoded values of a table of fixed size entries one by one, decoding chunk_size entries at once
+
+            Parameters:
+                offset: int
+                    Offset of the table in the file
+                size: int
+                    Size of the table in bytes
+                entry_size: int
+                    Size of one entry in bytes. Can be larger than the layout, the rest of the entry is skipped
+                layout: struct.Struct
+                    Layout of one entry
+                chunk_size: int (default=4096)
+                    Amount of entries decoded at once
+
+            Returns:
+                Iterator[tuple[int, tuple]]
+                    The index and the values (in the order of the layout) of every entry
+        """
+        if entry_size > layout.size:
+            layout = struct.Struct(f"{layout.format}{entry_size - layout.size}x")
+        elif entry_size < layout.size:
+            print(f"[!] Entry size {entry_size} is smaller than the expected size {layout.size}")
+            return
+
+        count = max(0, min(size, len(self.bytes) - offset)) // entry_size
+        index = 0
+        while index < count:
+            start = offset + index * entry_size
+            chunk_count = min(chunk_size, count - index)
+            for values in layout.iter_unpack(self.bytes[start:start + chunk_count * entry_size]):
+                yield index, values
+                index += 1
+
+    def read_symbol_table(self, section=".symtab", columns: dict = None) -> ENTRY_TABLE:
+        """
+            Reads a whole symbol table at once into integer columns (for example column("st_value")).
+            SYMBOL objects are created when they are accessed
+
+            Parameters:
+                section: str | SECTION_HEADER (default=".symtab")
+                    Name of the symbol table section (for example ".symtab" or ".dynsym") or the section itself
+                columns: dict (default=None)
+                    Already decoded columns (for example from a cache). If passed, the table is not decoded
+
+            Returns:
+                ENTRY_TABLE
+                    The symbol table or None, if there is no such section
+        """
+        sh = self.get_symbol_section(section)
+        if sh is None:
+            return None
+
+        isThirtyTwo = self.elf_header.isThirtyTwo
+        layout = SYMBOL_LAYOUTS[(isThirtyTwo, self.elf_header.isLittleEndian)]
+        entry_size = sh.sh_entsize or layout.size
+        string_table = self.get_string_table(sh.sh_link)
+        return ENTRY_TABLE(self.bytes, sh.sh_offset, sh.sh_size // entry_size, entry_size, layout, SYMBOL_FIELDS[isThirtyTwo],
+                           lambda table, index: SYMBOL(index, table.values(index), isThirtyTwo, string_table), columns)
+
+    def get_symbol_index(self, section=".symtab") -> SYMBOL_INDEX:
+        """
+            Returns the lookup index of a symbol table. Indexes are built once and cached.
+            Name lookups use the hash table (.gnu.hash or .hash) of the symbol table, if there is one
+
+            Parameters:
+                section: str | SECTION_HEADER (default=".symtab")
+                    Name of the symbol table section (for example ".symtab" or ".dynsym") or the section itself
+
+            Returns:
+                SYMBOL_INDEX
+                    The index or None, if there is no such section
+        """
+        sh = self.get_symbol_section(section)
+        if sh is None:
+            return None
+
+        symbol_index = self._symbol_indexes.get(sh.index)
+        if symbol_index is None:
+            with self._lock:
+                symbol_index = self._symbol_indexes.get(sh.index)
+                if symbol_index is None:
+                    symbol_index = self.create_symbol_index(sh)
+                    self._symbol_indexes[sh.index] = symbol_index
+        return symbol_index
+
+    def get_symbol_table(self, section=".symtab") -> ENTRY_TABLE:
+        """
+            Returns a symbol table (see read_symbol_table). Tables are read once and cached
+
+            Parameters:
+                section: str | SECTION_HEADER (default=".symtab")
+                    Name of the symbol table section (for example ".symtab" or ".dynsym") or the section itself
+
+            Returns:
+                ENTRY_TABLE
+                    The symbol table or None, if there is no such section
+        """
+        sh = self.get_symbol_section(section)
+        if sh is None:
+            return None
+
+        symbol_index = self._symbol_indexes.get(sh.index)
+        if symbol_index is not None:
+            return symbol_index.symbols
+        symbols = self._symbol_tables.get(sh.index)
+        if symbols is None:
+            with self._lock:
+                symbols = self._symbol_tables.get(sh.index)
+                if symbols is None:
+                    symbols = self.read_symbol_table(sh)
+                    self._symbol_tables[sh.index] = symbols
+        return symbols
+
+    def create_symbol_index(self, sh: SECTION_HEADER, columns: dict = None, intervals: tuple = None) -> SYMBOL_INDEX:
+        """
+            Creates the lookup index of a symbol table (see get_symbol_index).
+            Already decoded columns and address intervals (for example from a cache) can be passed to skip decoding
+        """
+        hash_table = None
+        # Prefer .gnu.hash over .hash
+        for hash_type in (SHT_GNU_HASH, SHT_HASH):
+            hash_sections = [hs for hs in self.get_section_by_type(hash_type) if hs.sh_link == sh.index]
+            if hash_sections:
+                hash_bytes = self.bytes[hash_sections[0].sh_offset:hash_sections[0].sh_offset + hash_sections[0].sh_size]
+                if hash_type == SHT_GNU_HASH:
+                    hash_table = GNU_HASH_TABLE(hash_bytes, self.elf_header.isThirtyTwo, self.elf_header.isLittleEndian)
+                else:
+                    hash_table = HASH_TABLE(hash_bytes, self.elf_header.isLittleEndian)
+                break
+        with instrumentation.stage("symbol_index"):
+            symbols = self.read_symbol_table(sh, columns) if columns is not None else self.get_symbol_table(sh)
+            symbol_index = SYMBOL_INDEX(symbols, self.get_string_table(sh.sh_link), hash_table, intervals)
+        instrumentation.count("symbols_indexed", len(symbols))
+        return symbol_index
+
+    def get_symbol_by_name(self, name: str) -> SYMBOL:
+        """
+            Looks up a symbol by name. The dynamic symbol table (.dynsym) is searched first using its hash table,
+            then the full symbol table (.symtab)
+
+            Parameters:
+                name: str
+                    The symbol name
+
+            Returns:
+                SYMBOL
+                    The symbol or None, if there is no such symbol
+        """
+        for section in (".dynsym", ".symtab"):
+            if self.get_section_by_name(section) is None:
+                continue
+            symbol = self.get_symbol_index(section).by_name(name)
+            if symbol is not None and symbol.st_shndx != SHN_UNDEF:
+                return symbol
+        return None
+
+    def get_symbol_by_address(self, address: int) -> SYMBOL:
+        """
+            Returns the symbol containing a virtual address (for example the function of a stack frame).
+            The full symbol table (.symtab) is searched first, then the dynamic symbol table (.dynsym)
+
+            Parameters:
+                address: int
+                    The virtual address
+
+            Returns:
+                SYMBOL
+                    The symbol or None, if no symbol contains the address
+        """
+        for section in (".symtab", ".dynsym"):
+            if self.get_section_by_name(section) is None:
+                continue
+            symbol = self.get_symbol_index(section).by_address(address)
+            if symbol is not None:
+                return symbol
+        return None
+
+    """ Dynamic utilities """
+
+    def get_dynamic_section(self) -> SECTION_HEADER:
+        """
+            Returns the dynamic section (.dynamic)
+
+            Returns:
+                SECTION_HEADER
+                    The section or None, if there is no section of type DYNAMIC
+        """
+        sections = self.get_section_by_type(SHT_DYNAMIC)
+        return sections[0] if sections else None
+
+    def read_dynamic_table(self, columns: dict = None) -> ENTRY_TABLE:
+        """
+            Reads the dynamic table at once into integer columns (column("d_tag") and column("d_val")).
+            The table is taken from the dynamic section or, if the section headers are stripped, from the DYNAMIC segment.
+            DYNAMIC_ENTRY objects are created when they are accessed
+
+            Parameters:
+                columns: dict (default=None)
+                    Already decoded columns (for example from a cache). If passed, the table is not decoded
+
+            Returns:
+                ENTRY_TABLE
+                    The dynamic table (including the terminating NULL entries) or None, if the file has no dynamic table
+        """
+        isThirtyTwo = self.elf_header.isThirtyTwo
+        layout = DYNAMIC_LAYOUTS[(isThirtyTwo, self.elf_header.isLittleEndian)]
+        sh = self.get_dynamic_section()
+        if sh is not None:
+            offset, size, entry_size = sh.sh_offset, sh.sh_size, sh.sh_entsize or layout.size
         else:
+            segments = [ph for ph in self.program_headers if ph.p_type == PT_DYNAMIC]
+            if not segments:
+                return None
+            offset, size, entry_size = segments[0].p_offset, segments[0].p_filesz, layout.size
+        return ENTRY_TABLE(self.bytes, offset, size // entry_size, entry_size, layout, DYNAMIC_FIELDS[isThirtyTwo],
+                           lambda table, index: DYNAMIC_ENTRY(index, table.values(index), table.string_table), columns)
+
+    @property
+    def dynamic(self) -> ENTRY_TABLE:
+        """
+            The dynamic table (see read_dynamic_table). Read on first access, None if the file has no dynamic table
+        """
+        if not self._dynamic_read:
+            with self._lock:
+                if self._dynamic is None:
+                    self._dynamic = self.read_dynamic_table()
+                    # The entries resolve their strings through the table (the string table can depend on the dynamic table).
+                    # Other threads wait for the lock until it is attached
+                    if self._dynamic is not None:
+                        self._dynamic.string_table = self.dynamic_string_table
+                    self._dynamic_read = True
+        return self._dynamic
+
+    @property
+    def dynamic_string_table(self) -> STRING_TABLE:
+        """
+            The string table of the dynamic table (.dynstr), found through the dynamic section or DT_STRTAB
+        """
+        if self._dynamic_string_table is None:
+            with self._lock:
+                if self._dynamic_string_table is None:
+                    sh = self.get_dynamic_section()
+                    if sh is not None:
+                        self._dynamic_string_table = self.get_string_table(sh.sh_link)
+                    else:
+                        addresses = self.get_dynamic_values(DT_STRTAB)
+                        sizes = self.get_dynamic_values(DT_STRSZ)
+                        offset = self.address_to_offset(addresses[0]) if addresses and sizes else None
+                        if offset is None:
+                            print("[!] No dynamic string table")
+                            return None
+                        self._dynamic_string_table = STRING_TABLE(self.bytes, offset, sizes[0])
+        return self._dynamic_string_table
+
+    def iter_dynamic(self, chunk_size: int = 4096):
+        """
+            Yields the entries of the dynamic table one by one, up to the terminating NULL entry (see iter_symbols)
+
+            Returns:
+                Iterator[DYNAMIC_ENTRY]
+                    The entries in the order of the table
+        """
+        table = self.dynamic
+        if table is None:
+            return
+
+        layout = DYNAMIC_LAYOUTS[(self.elf_header.isThirtyTwo, self.elf_header.isLittleEndian)]
+        for index, values in self.iter_entries(table.start, table.count * table.entry_size, table.entry_size, layout, chunk_size):
+            if values[0] == DT_NULL:
+                return
+            yield DYNAMIC_ENTRY(index, values, self.dynamic_string_table)
+
+    def get_dynamic_values(self, tag: int) -> list[int]:
+        """
+            Returns the values (d_val) of all entries of a tag, in the order of the dynamic table
+
+            Parameters:
+                tag: int
+                    The tag (d_tag), for example DT_NEEDED
+
+            Returns:
+                list[int]
+                    The values, empty if there is no such entry or no dynamic table
+        """
+        table = self.dynamic
+        if table is None:
+            return []
+
+        values = []
+        d_vals = table.column("d_val")
+        for index, d_tag in enumerate(table.column("d_tag")):
+            if d_tag == DT_NULL:
+                break
+            if d_tag == tag:
+                values.append(d_vals[index])
+        return values
+
+    def get_dynamic_strings(self, tag: int) -> list[str]:
+        """
+            Returns the strings of all entries of a string tag (for example DT_NEEDED), see get_dynamic_values
+        """
+        values = self.get_dynamic_values(tag)
+        string_table = self.dynamic_string_table if values else None
+        if string_table is None:
+            return []
+        return [string_table.get(value) for value in values]
+
+    def get_interpreter(self) -> str:
+        """
+            Returns the path of the program interpreter (the dynamic linker, taken from the INTERP segment)
+            or None, if the file has no INTERP segment
+        """
+        for ph in self.program_headers:
+            if ph.p_type == PT_INTERP:
+                return bytes(self.read_range(ph.p_offset, ph.p_filesz)).split(b"\x00", 1)[0].decode(errors="replace")
+        return None
+
+    def get_needed(self) -> list[str]:
+        """
+            Returns the names of the needed libraries (DT_NEEDED), in the order of the dynamic table
+        """
+        return self.get_dynamic_strings(DT_NEEDED)
+
+    def get_soname(self) -> str:
+        """
+            Returns the shared object name (DT_SONAME) or None, if there is none
+        """
+        sonames = self.get_dynamic_strings(DT_SONAME)
+        return sonames[0] if sonames else None
+
+    def get_rpath(self) -> list[str]:
+        """
+            Returns the directories of the library search path DT_RPATH
+        """
+        return [path for rpath in self.get_dynamic_strings(DT_RPATH) for path in rpath.split(":") if path]
+
+    def get_runpath(self) -> list[str]:
+        """
+            Returns the directories of the library search path DT_RUNPATH
+        """
+        return [path for runpath in self.get_dynamic_strings(DT_RUNPATH) for path in runpath.split(":") if path]
+
+    """ Note utilities """
+
+    def iter_notes(self):
+        """
+            Yields the notes of the NOTE segments. Only the segments are read, not the whole file.
+            Files without NOTE segments (for example relocatable objects) are read from their NOTE sections
+
+            Returns:
+                Iterator[NOTE]
+                    The notes in the order of the segments (or sections)
+        """
+        layout = NOTE_HEADER_LAYOUTS[(self.elf_header.isThirtyTwo, self.elf_header.isLittleEndian)]
+        segments = [(ph.p_offset, ph.p_filesz, ph.p_align) for ph in self.program_headers if ph.p_type == PT_NOTE]
+        if not segments:
+            segments = [(sh.sh_offset, sh.sh_size, sh.sh_addralign) for sh in self.get_section_by_type(SHT_NOTE)]
+        for offset, size, align in segments:
+            yield from iter_notes(self.read_range(offset, size), layout, align)
+
+    def get_notes(self, name: str = None, note_type: int = None) -> list[NOTE]:
+        """
+            Returns all notes of an owner name and/or a type (see iter_notes)
+
+            Parameters:
+                name: str (default=None)
+                    The owner, for example "GNU"
+                note_type: int (default=None)
+                    The type (n_type), for example NT_GNU_BUILD_ID
+        """
+        return [note for note in self.iter_notes()
+                if (name is None or note.name == name) and (note_type is None or note.n_type == note_type)]
+
+    def get_build_id(self) -> str:
+        """
+            Returns the GNU build ID of the file as hex string (as used in /usr/lib/debug/.build-id) or None, if there is none
+        """
+        for note in self.iter_notes():
+            if note.n_type == NT_GNU_BUILD_ID and note.name == "GNU":
+                return note.desc.hex()
+        return None
+
+    """ Relocation utilities """
+
+    def get_relocation_sections(self) -> list[SECTION_HEADER]:
+        """
+            Returns all relocation sections (REL and RELA), ordered by index
+        """
+        return sorted(self.get_section_by_type(SHT_REL) + self.get_section_by_type(SHT_RELA), key=lambda sh: sh.index)
+
+    def get_relocation_section(self, section) -> SECTION_HEADER:
+        """
+            Returns a relocation section
+
+            Parameters:
+                section: str | SECTION_HEADER
+                    Name of the relocation section (for example ".rela.dyn") or the section itself
+
+            Returns:
+                SECTION_HEADER
+                    The section or None, if there is no such section or it is no REL or RELA section
+        """
+        sh = section if isinstance(section, SECTION_HEADER) else self.get_section_by_name(section)
+        if sh is None or sh.sh_type not in (SHT_REL, SHT_RELA):
+            print(f"[!] No relocation section {section}")
+            return None
+        return sh
+
+    def get_relocation_symbols(self, sh: SECTION_HEADER) -> ENTRY_TABLE:
+        """
+            Returns the symbol table linked to a relocation section (usually .dynsym) or None, if there is none
+        """
+        if sh.sh_link == 0 or sh.sh_link >= len(self.section_headers):
+            return None
+        return self.get_symbol_table(self.section_headers[sh.sh_link])
+
+    def read_relocation_table(self, section, columns: dict = None) -> ENTRY_TABLE:
+        """
+            Reads a whole relocation table at once into integer columns (for example column("r_offset")).
+            RELOCATION objects are created when they are accessed, their symbols are resolved through the linked symbol table
+
+            Parameters:
+                section: str | SECTION_HEADER
+                    Name of the relocation section (for example ".rela.dyn") or the section itself
+                columns: dict (default=None)
+                    Already decoded columns (for example from a cache). If passed, the table is not decoded
+
+            Returns:
+                ENTRY_TABLE
+                    The relocation table or None, if there is no such section
+        """
+        sh = self.get_relocation_section(section)
+        if sh is None:
+            return None
+
+        isThirtyTwo = self.elf_header.isThirtyTwo
+        layouts, fields = (RELA_LAYOUTS, RELA_FIELDS) if sh.sh_type == SHT_RELA else (REL_LAYOUTS, REL_FIELDS)
+        layout = layouts[(isThirtyTwo, self.elf_header.isLittleEndian)]
+        entry_size = sh.sh_entsize or layout.size
+        symbols = self.get_relocation_symbols(sh)
+        return ENTRY_TABLE(self.bytes, sh.sh_offset, sh.sh_size // entry_size, entry_size, layout, fields[isThirtyTwo],
+                           lambda table, index: RELOCATION(index, table.values(index), isThirtyTwo, symbols), columns)
+
+    def iter_relocations(self, section, chunk_size: int = 4096):
+        """
+            Yields the relocations of a relocation section one by one (see iter_symbols)
+
+            Parameters:
+                section: str | SECTION_HEADER
+                    Name of the relocation section (for example ".rela.dyn") or the section itself
+                chunk_size: int (default=4096)
+                    Amount of relocations decoded at once
+
+            Returns:
+                Iterator[RELOCATION]
+                    The relocations in the order of the table
+        """
+        sh = self.get_relocation_section(section)
+        if sh is None:
+            return
+
+        isThirtyTwo = self.elf_header.isThirtyTwo
+        layouts = RELA_LAYOUTS if sh.sh_type == SHT_RELA else REL_LAYOUTS
+        layout = layouts[(isThirtyTwo, self.elf_header.isLittleEndian)]
+        symbols = self.get_relocation_symbols(sh)
+        for index, values in self.iter_entries(sh.sh_offset, sh.sh_size, sh.sh_entsize or layout.size, layout, chunk_size):
+            yield RELOCATION(index, values, isThirtyTwo, symbols)
+
+    def get_relocation_symbol_names(self, section) -> list[str]:
+        """
+            Resolves the symbol names of all relocations of a section at once.
+            Every referenced symbol is only looked up once, no RELOCATION objects are created
+
+            Parameters:
+                section: str | SECTION_HEADER
+                    Name of the relocation section (for example ".rela.dyn") or the section itself
+
+            Returns:
+                list[str]
+                    The symbol name of every relocation (None for relocations without symbol), indexed by relocation index
+        """
+        table = self.read_relocation_table(section)
+        if table is None:
+            return []
+
+        sh = self.get_relocation_section(section)
+        symbols = self.get_relocation_symbols(sh)
+        indexes = symbol_indexes(table.column("r_info"), self.elf_header.isThirtyTwo)
+        if symbols is None:
+            return [None] * len(indexes)
+
+        string_table = self.get_string_table(self.section_headers[sh.sh_link].sh_link)
+        st_names = symbols.column("st_name")
+        names = {0: None}
+        for index in set(indexes):
+            if index not in names:
+                names[index] = string_table.get(st_names[index]) if index < len(st_names) else None
+        return [names[index] for index in indexes]
+
+    """ Content utilities """
+
+    def read_range(self, offset: int, size: int):
+        """
+            Reads size bytes at a file offset
+
+            Returns:
+                bytes-like
+                    The bytes (a view of the mapping for memory-mapped files)
+        """
+        return self.bytes[offset:offset + size]
+
+    def read_section(self, section):
+        """
+            Reads the raw content of a section from the file
+
+            Parameters:
+                section: str | SECTION_HEADER
+                    Name of the section or the section itself
+
+            Returns:
+                bytes-like
+                    The content (a view of the mapping for memory-mapped files), empty for sections without
+                    content in the file (NOBITS). None, if there is no such section
+        """
+        sh = section if isinstance(section, SECTION_HEADER) else self.get_section_by_name(section)
+        if sh is None:
+            print(f"[!] No section {section}")
+            return None
+        if sh.sh_type == SHT_NOBITS:
+            return b""
+        return self.read_range(sh.sh_offset, sh.sh_size)
+
+    def get_compression_header(self, section) -> dict:
+        """
+            Reads the compression header of a compressed section (SHF_COMPRESSED or a GNU .zdebug* section)
+
+            Parameters:
+                section: str | SECTION_HEADER
+                    Name of the section or the section itself
+
+            Returns:
+                dict
+                    The fields of the header (ch_type, ch_size, ch_addralign) and offset and size of the compressed data.
+                    None, if the section is not compressed
+        """
+        sh = section if isinstance(section, SECTION_HEADER) else self.get_section_by_name(section)
+        if sh is None or sh.sh_type == SHT_NOBITS:
+            return None
+
+        isThirtyTwo = self.elf_header.isThirtyTwo
+        if sh.sh_flags & SHF_COMPRESSED:
+            layout = COMPRESSION_HEADER_LAYOUTS[(isThirtyTwo, self.elf_header.isLittleEndian)]
+            if sh.sh_size < layout.size:
+                print(f"[!] Compressed section {sh.name} is smaller than its compression header")
+                return None
+            header = dict(zip(COMPRESSION_HEADER_FIELDS[isThirtyTwo], layout.unpack(self.read_range(sh.sh_offset, layout.size))))
+            header["offset"] = sh.sh_offset + layout.size
+            header["size"] = sh.sh_size - layout.size
+            return header
+
+        # GNU format: "ZLIB" followed by the uncompressed size (8 bytes, big endian)
+        if sh.name is not None and sh.name.startswith(".zdebug") and self.read_range(sh.sh_offset, 4) == b"ZLIB":
+            return {
+                "ch_type": ELFCOMPRESS_ZLIB,
+                "ch_size": int.from_bytes(self.read_range(sh.sh_offset + 4, 8), "big"),
+                "ch_addralign": sh.sh_addralign,
+                "offset": sh.sh_offset + 12,
+                "size": sh.sh_size - 12,
+            }
+        return None
+
+    def is_compressed(self, section) -> bool:
+        return self.get_compression_header(section) is not None
+
+    def get_section_content(self, section, chunk_size: int = 64 * 1024, cache_chunks: int = 16):
+        """
+            Returns the content of a section without copying or inflating it.
+            Compressed sections (SHF_COMPRESSED or .zdebug*, zlib or zstd) are returned as DECOMPRESSED_STREAM, which
+            decompresses chunk by chunk on access and caches the last chunks. Streams are created once per section,
+            chunk_size and cache_chunks (a later call with other parameters returns another stream)
+
+            Parameters:
+                section: str | SECTION_HEADER
+                    Name of the section or the section itself
+                chunk_size: int (default=64 KB)
+                    Size of the decompressed chunks of a compressed section
+                cache_chunks: int (default=16)
+                    Amount of decompressed chunks kept in the cache of a compressed section
+
+            Returns:
+                memoryview | bytes | DECOMPRESSED_STREAM
+                    A view of the content (bytes, if the file is read with pread) or the decompressed stream.
+                    Empty for sections without content in the file (NOBITS). None, if there is no such section
+        """
+        sh = section if isinstance(section, SECTION_HEADER) else self.get_section_by_name(section)
+        if sh is None:
+            print(f"[!] No section {section}")
+            return None
+
+        header = self.get_compression_header(sh)
+        if header is None:
+            if sh.sh_type == SHT_NOBITS:
+                return b""
+            if isinstance(self.bytes, FILE_READER):
+                return self.read_range(sh.sh_offset, sh.sh_size)
+            return memoryview(self.bytes)[sh.sh_offset:sh.sh_offset + sh.sh_size]
+        if not is_supported(header["ch_type"]):
+            print(f"[!] Compression type {header['ch_type']} of section {sh.name} is not supported (zstd needs compression.zstd or zstandard)")
+            return None
+
+        key = (sh.index, chunk_size, cache_chunks)
+        with self._lock:
+            stream = self._section_contents.get(key)
+            if stream is None:
+                stream = DECOMPRESSED_STREAM(self.bytes, header["offset"], header["size"], header["ch_type"], header["ch_size"],
+                                             chunk_size, cache_chunks)
+                self._section_contents[key] = stream
+        return stream
+
+    def iter_section_content(self, section, chunk_size: int = 64 * 1024):
+        """
+            Yields the (decompressed) content of a section in chunks of chunk_size bytes, see get_section_content.
+            Memory stays constant, also for large compressed sections
+
+            Returns:
+                Iterator[bytes-like]
+                    The chunks in the order of the content
+        """
+        sh = section if isinstance(section, SECTION_HEADER) else self.get_section_by_name(section)
+        if sh is None:
+            print(f"[!] No section {section}")
+            return
+
+        header = self.get_compression_header(sh)
+        if header is not None:
+            if not is_supported(header["ch_type"]):
+                print(f"[!] Compression type {header['ch_type']} of section {sh.name} is not supported (zstd needs compression.zstd or zstandard)")
+                return
+            # Any stream of the section with the same chunk size can be reused, the cache size does not matter here
+            with self._lock:
+                stream = next((stream for (index, size, _), stream in self._section_contents.items()
+                               if index == sh.index and size == chunk_size), None)
+            if stream is None:
+                stream = DECOMPRESSED_STREAM(self.bytes, header["offset"], header["size"], header["ch_type"], header["ch_size"],
+                                             chunk_size)
+            yield from stream.iter_chunks()
+            return
+
+        content = self.get_section_content(sh)
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    async def read_range_async(self, offset: int, size: int, executor: ASYNC_EXECUTOR = None):
+        """
+            Reads size bytes at a file offset without blocking the event loop (see read_range).
+            For memory-mapped files the bytes are copied in the executor, so the pages are not read in the event loop
+
+            Returns:
+                bytes-like
+                    The bytes (a copy, also for memory-mapped files)
+        """
+        return await (executor or default_executor).run(copied, self.read_range, offset, size)
+
+    async def read_section_async(self, section, executor: ASYNC_EXECUTOR = None):
+        """
+            Reads the raw content of a section without blocking the event loop (see read_section).
+            For memory-mapped files the content is copied in the executor, so the pages are not read in the event loop
+
+            Parameters:
+                section: str | SECTION_HEADER
+                    Name of the section or the section itself
+                executor: ASYNC_EXECUTOR (default=None)
+                    Executor running the read (default: twelfe.asynchronous.default_executor)
+
+            Returns:
+                bytes-like
+                    The content (a copy, also for memory-mapped files) or None, if there is no such section
+        """
+        return await (executor or default_executor).run(copied, self.read_section, section)
+
+    def read_bytes_at_address(self, address: int, read_count: int):
+        """
+            Reads read_count bytes from a specified virtual address without converting them.
+            The address is translated using the LOAD segments, zero-filled memory (for example .bss) is read as NULL bytes
+
+            Parameters:
+                address: int
+                    The address to read from
+                read_count : int
+                    The amount of bytes to read
+
+
+            Returns:
+                bytes-like
+                    The bytes in memory order. For memory-mapped files this is a view of the mapping,
+                    otherwise a copy of just the read range. Shorter than read_count, if the range is not mapped completely
+        """
+        return self.address_map.read(self.bytes, address, read_count)
+
+    def read_int(self, address: int, size: int, signed: bool = False) -> int:
+        """
+            Reads an integer from a specified virtual address, using the byte order of the ELF file
+
+            Parameters:
+                address: int
+                    The address to read from
+                size : int
+                    Size of the integer in bytes
+                signed : bool (default=False)
+                    Read a two's complement integer
+
+            Returns:
+                int
+                    The read integer or None, if the address range is not mapped completely
+        """
+        read = self.address_map.read(self.bytes, address, size)
+        if len(read) < size:
+            print(f"[!] Address range {hex(address)} - {hex(address + size)} is not mapped completely")
             return None
+        return int.from_bytes(read, "little" if self.elf_header.isLittleEndian else "big", signed=signed)
+
+    def read_u8(self, address: int) -> int:
+        return self.read_int(address, 1)
+
+    def read_u16(self, address: int) -> int:
+        return self.read_int(address, 2)
+
+    def read_u32(self, address: int) -> int:
+        return self.read_int(address, 4)
+
+    def read_u64(self, address: int) -> int:
+        return self.read_int(address, 8)
 
     def read_at_address(self, address: int, read_count: int) -> str:
         """
-            Reads read_count bytes from a specified virtual address
+            Reads read_count bytes from a specified virtual address.
+            The address is translated using the LOAD segments, zero-filled memory (for example .bss) is read as NULL bytes.
+            Use read_bytes_at_address to get the bytes without the conversion into a string
 
             Parameters:
                 address: int
@@ -130,18 +1168,20 @@ class ELF(object):
 
             Returns:
                 str
-                    String of hex bytes. bytes[address] is the last one in the returned string
+                    String of hex bytes of the value in the byte order of the file.
+                    For little endian files bytes[address] is the last one in the returned string, for big endian files the first one
         """
-        # use the first segment as a base address for virutal address calculation
-        first_section = self.get_section_by_index(
-            1)
-        base_calc_addr = int(first_section.addr, 16)
-        diff = address - base_calc_addr
-        return read_bytes(self.bytes, int(first_section.offset, 16) + diff, count=read_count)
+        read = self.read_bytes_at_address(address, read_count)
+        if len(read) < read_count:
+            print(f"[!] Address range {hex(address)} - {hex(address + read_count)} is not mapped completely")
+        if self.elf_header.isLittleEndian:
+            return bytes(read)[::-1].hex()
+        return bytes(read).hex()
 
     def read_opcodes(self, address: int, size) -> list[str]:
         """
-            Reads opcodes from a specified virtual address
+            Reads opcodes from a specified virtual address.
+            Use read_bytes_at_address to get the opcodes as bytes
 
             Parameters:
                 address: int
@@ -154,9 +1194,99 @@ class ELF(object):
                 list[str]
                     String of hex bytes opcodes
         """
-        bytes = self.read_at_address(address, size)
-        codes = [bytes[i:i+2] for i in range(0, len(bytes), 2)]
-        return codes[::-1]
+        read = self.read_bytes_at_address(address, size)
+        if len(read) < size:
+            print(f"[!] Address range {hex(address)} - {hex(address + size)} is not mapped completely")
+        return [f"{b:02x}" for b in read]
+
+    """ Search utilities """
+
+    def get_executable_regions(self, use_sections: bool = False) -> list[tuple[int, int, int]]:
+        """
+            Returns the executable parts of the file: LOAD segments with the E flag or, if use_sections is True
+            (or the file has no such segments, for example relocatable objects), sections with the X flag
+
+            Returns:
+                list[tuple[int, int, int]]
+                    File offset, size in the file and virtual address of every region
+        """
+        regions = []
+        if not use_sections:
+            regions = [(ph.p_offset, ph.p_filesz, ph.p_vaddr) for ph in self.program_headers
+                       if ph.p_type == PT_LOAD and ph.p_flags & 1 and ph.p_filesz > 0]
+        if not regions:
+            regions = [(sh.sh_offset, sh.sh_size, sh.sh_addr) for sh in self.get_section_by_flag("X")
+                       if sh.sh_type != SHT_NOBITS and sh.sh_size > 0]
+        return regions
+
+    def search(self, patterns: list, use_sections: bool = False, workers: int = 1) -> dict:
+        """
+            Searches many byte patterns at once in the executable segments (or sections) of the file.
+            All patterns are matched in one pass over each region (see twelfe.search.BYTE_SEARCH), the bytes are copied
+            block by block only. On 100 MB of code, 5 patterns take about 0.4 s and 50 about 0.7 s
+            (benchmarks/run.py --files search-64-lsb, one core). Use workers to split the regions across processes
+
+            Parameters:
+                patterns: list[bytes | str]
+                    Literal bytes or hex strings with wildcards, for example "48 8b ?? ?? e8" or "4? 89 c7"
+                use_sections: bool (default=False)
+                    Search the sections with the X flag instead of the LOAD segments with the E flag
+                workers: int (default=1)
+                    Amount of worker processes. With more than 1 worker, the regions are split into chunks, which are searched
+                    in parallel (the workers memory-map the file)
+
+            Returns:
+                dict[bytes | str, list[int]]
+                    The virtual addresses of all matches of every pattern, in ascending order
+        """
+        patterns = [bytes(pattern) if isinstance(pattern, bytearray) else pattern for pattern in patterns]
+        regions = self.get_executable_regions(use_sections)
+        if workers > 1 and os.path.isfile(self.name):
+            matches = search_file_parallel(self.name, regions, patterns, workers)
+        else:
+            engine = BYTE_SEARCH(patterns)
+            matches = []
+            for offset, size, address in regions:
+                if isinstance(self.bytes, FILE_READER):
+                    matches.extend(engine.scan(self.read_range(offset, size), address))
+                    continue
+                with memoryview(self.bytes)[offset:offset + size] as view:
+                    matches.extend(engine.scan(view, address))
+
+        results = {pattern: [] for pattern in patterns}
+        for index, address in sorted(matches, key=lambda match: match[1]):
+            results[patterns[index]].append(address)
+        return results
+
+    """ Resource handling """
+
+    def close(self) -> None:
+        """
+            Releases the memory mapping, if the ELF object was created with use_mmap=True,
+            or closes the file, if it was created with use_pread=True.
+            The ELF object and its headers must not be used afterwards.
+            Does nothing for ELF objects backed by a bytearray.
+        """
+        if isinstance(self.bytes, FILE_READER):
+            self.bytes.close()
+            return
+
+        if not isinstance(self.bytes, memoryview) or not isinstance(self.bytes.obj, mmap.mmap):
+            return
+
+        mapping = self.bytes.obj
+        # Headers only reference self.bytes, it is the only view which has to be released
+        self.bytes.release()
+        try:
+            mapping.close()
+        except BufferError:
+            print("[!] Mapping is still referenced. It is closed once all views are released")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     """Printing utilities """
 
@@ -164,18 +1294,98 @@ class ELF(object):
         print(f"{self.elf_header}")
 
     def print_program_headers(self):
-        program_headers = [f"{str(ph)}\n" for ph in self.program_headers]
+        # Print header by header instead of building the whole table in memory
         print("Program Headers:\n"
-              f"Type{'':<15}Address(virt){'':<10}Address(phy){'':<10}Offset{'':<8}Size(file){'':<7}Size(mem){'':<5}Flags{'':<5}Align\n"
-              f"{''.join(program_headers)}\n"
-              f"{self.prog_header_flags}\n\n\n")
+              f"Type{'':<15}Address(virt){'':<10}Address(phy){'':<10}Offset{'':<8}Size(file){'':<7}Size(mem){'':<5}Flags{'':<5}Align")
+        for ph in self.program_headers:
+            print(ph)
+        print(f"\n{self.prog_header_flags}\n\n\n")
+
+    def print_dynamic(self):
+        print("Dynamic Section:\n"
+              f"ID{'':<3}Tag{'':<17}Value")
+        for entry in self.iter_dynamic():
+            print(entry)
+        print("\n\n")
+
+    def print_notes(self):
+        print("Notes:\n"
+              f"Owner{'':<5}Type{'':<21}Size{'':<6}Description")
+        for note in self.iter_notes():
+            print(note)
+        print("\n\n")
+
+    def print_relocations(self):
+        for sh in self.get_relocation_sections():
+            print(f"Relocation Section {sh.name}:\n"
+                  f"ID{'':<3}Offset{'':<16}Type{'':<6}Symbol{'':<34}Addend")
+            for relocation in self.iter_relocations(sh):
+                print(relocation)
+            print("\n")
 
     def print_section_headers(self):
-        section_headers = [f"{str(sh)}\n" for sh in self.section_headers]
         print("Section Headers: \n"
-              f"ID{'':<5}Name{'':<15}Type{'':<15}Address{'':<10}Offset{'':<5}Size{'':<5}Flags{'':<8}Info{'':<8}Link{'':<7}Align{'':<5}Entr. Size{'':<5}\n"
-              f"{''.join(section_headers)}\n"
-              f"{self.section_header_flags}\n\n\n")
+              f"ID{'':<5}Name{'':<15}Type{'':<15}Address{'':<10}Offset{'':<5}Size{'':<5}Flags{'':<8}Info{'':<8}Link{'':<7}Align{'':<5}Entr. Size{'':<5}")
+        for sh in self.section_headers:
+            print(sh)
+        print(f"\n{self.section_header_flags}\n\n\n")
+
+    """ Record utilities """
+
+    def iter_records(self, elf: bool = True, program: bool = True, section: bool = True, dynamic: bool = False,
+                     relocations: bool = False, notes: bool = False):
+        """
+            Yields the headers one by one as flat dictionaries (records), for example to write them as JSON or CSV.
+            Every record contains the "file" and the kind of "record" ("elf_header", "program_header", "section_header",
+            "dynamic", "relocation" or "note")
+
+            Parameters:
+                elf: bool (default=True)
+                    Yield the ELF header
+                program: bool (default=True)
+                    Yield the program headers
+                section: bool (default=True)
+                    Yield the section headers
+                dynamic: bool (default=False)
+                    Yield the entries of the dynamic table
+                relocations: bool (default=False)
+                    Yield the relocations of all relocation sections (with the name of their "section")
+                notes: bool (default=False)
+                    Yield the notes
+
+            Returns:
+                Iterator[dict]
+                    The records
+        """
+        if elf:
+            yield {"file": self.name, "record": "elf_header", **self.elf_header.to_dict()}
+        if program:
+            for ph in self.program_headers:
+                yield {"file": self.name, "record": "program_header", **ph.to_dict()}
+        if section:
+            for sh in self.section_headers:
+                yield {"file": self.name, "record": "section_header", **sh.to_dict()}
+        if dynamic:
+            for entry in self.iter_dynamic():
+                yield {"file": self.name, "record": "dynamic", **entry.to_dict()}
+        if relocations:
+            for sh in self.get_relocation_sections():
+                for relocation in self.iter_relocations(sh):
+                    yield {"file": self.name, "record": "relocation", "section": sh.name, **relocation.to_dict()}
+        if notes:
+            for note in self.iter_notes():
+                yield {"file": self.name, "record": "note", **note.to_dict()}
+
+    def to_dict(self) -> dict:
+        """
+            Returns the ELF file as nested dictionary of all headers
+        """
+        return {
+            "file": self.name,
+            "elf_header": self.elf_header.to_dict(),
+            "program_headers": [ph.to_dict() for ph in self.program_headers],
+            "section_headers": [sh.to_dict() for sh in self.section_headers],
+        }
 
     def __str__(self):
         program_headers = [f"{str(ph)}\n" for ph in self.program_headers]
@@ -191,15 +1401,79 @@ class ELF(object):
             f"{self.section_header_flags}\n\n\n"
 
     """ static """
-    def from_file(file: str):
+    def from_file(file: str, use_mmap: bool = False, lazy: bool = False, use_pread: bool = False, cache=None):
         """
             Creates an ELF object from an ELF file
 
+            Parameters:
+                file: str
+                    Path to the ELF file
+                use_mmap: bool (default=False)
+                    Memory-map the file instead of reading it into a bytearray.
+                    The ELF object and all headers then work on views of the same mapping (no copies),
+                    so only the pages which are actually accessed are read from disk.
+                    Call close() (or use the ELF object as context manager) to release the mapping.
+                lazy: bool (default=False)
+                    Only parse the ELF header. Program and section headers are read on first access.
+                    Combined with use_mmap or use_pread, only the pages of the accessed headers are read.
+                use_pread: bool (default=False)
+                    Do not read the file up front. Byte ranges (ELF header, header tables, string tables, ...)
+                    are read on demand with os.pread and cached in small blocks (see FILE_READER).
+                    Useful for large files on network file systems. Call close() to close the file.
+                cache: PARSE_CACHE | ELF_CACHE (default=None)
+                    Load the parsed headers, section names and symbol indexes from a persistent cache
+                    (see twelfe.cache.PARSE_CACHE) or return a shared ELF object of an in-process cache
+                    (see twelfe.cache.ELF_CACHE). lazy is ignored when a cache is used.
+
             Returns:
                 ELF
                 an ELF object containing the bytes in the file
         """
-        with open(file, "rb") as elf_file:
-            bytes = bytearray(elf_file.read())
+        if cache is not None:
+            return cache.open(file, use_mmap=use_mmap, use_pread=use_pread)
 
-        return ELF(file, bytes)
+        if use_pread:
+            # Reads are counted by the reader
+            with instrumentation.stage("read"):
+                reader = FILE_READER(file)
+            try:
+                return ELF(file, reader, lazy)
+            except Exception:
+                reader.close()
+                raise
+
+        if use_mmap:
+            with instrumentation.stage("read"):
+                with open(file, "rb") as elf_file:
+                    # The mapping stays valid after the file is closed
+                    mapping = mmap.mmap(elf_file.fileno(), 0, access=mmap.ACCESS_READ)
+            instrumentation.count("bytes_mapped", len(mapping))
+            return ELF(file, memoryview(mapping), lazy)
+
+        with instrumentation.stage("read"):
+            with open(file, "rb") as elf_file:
+                bytes = bytearray(elf_file.read())
+        instrumentation.count("bytes_read", len(bytes))
+
+        return ELF(file, bytes, lazy)
+
+    async def open_async(file: str, use_mmap: bool = False, lazy: bool = False, use_pread: bool = False, cache=None,
+                         executor: ASYNC_EXECUTOR = None):
+        """
+            Creates an ELF object from an ELF file without blocking the event loop.
+            Reading and parsing (see from_file) run in a bounded thread pool
+
+            Parameters:
+                file: str
+                    Path to the ELF file
+                use_mmap, lazy, use_pread, cache
+                    See from_file
+                executor: ASYNC_EXECUTOR (default=None)
+                    Executor running the blocking work (default: twelfe.asynchronous.default_executor)
+
+            Returns:
+                ELF
+                an ELF object containing the bytes in the file
+        """
+        return await (executor or default_executor).run(
+            ELF.from_file, file, use_mmap=use_mmap, lazy=lazy, use_pread=use_pread, cache=cache)
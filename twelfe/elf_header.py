@@ -1,70 +1,75 @@
 """
     Represent an ELF header.
-    Note: all fields are strings. They are reversed (little endian) already.
+    Note: fields are decoded into integers (named like in the ELF specification, for example e_entry).
+    The former string fields (for example prog_entry) are still available as properties.
+    They show the value, independent of the byte order of the file.
 """
 
 
-from .util import read_bytes
+from .layouts import ELF_HEADER_LAYOUTS
+from .util import hex_field
 
 
 class ELF_HEADER(object):
+    # String representations of the integer fields
+    magic = property(lambda self: bytes(self.bytes[0:4])[::-1].hex())
+    cls = hex_field("ei_class", 1)
+    data = hex_field("ei_data", 1)
+    header_version = hex_field("ei_version", 1)
+    os_abi = hex_field("ei_osabi", 1)
+    padding = property(lambda self: bytes(self.bytes[8:15])[::-1].hex())
+    type = hex_field("e_type", 2)
+    instr_set = hex_field("e_machine", 2)
+    elf_version = hex_field("e_version", 4)
+    prog_entry = hex_field("e_entry")
+    prog_header_table_pos = hex_field("e_phoff")
+    section_header_table_pos = hex_field("e_shoff")
+    flags = hex_field("e_flags", 4)
+    header_size = hex_field("e_ehsize", 2)
+    prog_header_table_entry_size = hex_field("e_phentsize", 2)
+    prog_header_table_num_entries = hex_field("e_phnum", 2)
+    section_header_table_entry_size = hex_field("e_shentsize", 2)
+    section_header_table_num_entries = hex_field("e_shnum", 2)
+    section_header_string_table_index = hex_field("e_shstrndx", 2)
+
     def __init__(self, bytes: bytearray):
         self.bytes = bytes
-        self.magic = read_bytes(self.bytes, 0, end=4)
-        self.cls = read_bytes(self.bytes, 4)
-        self.data = read_bytes(self.bytes, 5)
-        self.header_version = read_bytes(self.bytes, 6)
-        self.os_abi = read_bytes(self.bytes, 7)
-        self.padding = read_bytes(self.bytes, 8, end=15)
-        self.type = read_bytes(self.bytes, 16, count=2)
-        self.instr_set = read_bytes(self.bytes, 18, count=2)
-        self.elf_version = read_bytes(self.bytes, 20, count=3)
-        self.prog_entry = None
-        self.prog_header_table_pos = None
-        self.section_header_table_pos = None
-        self.flags = None
-        self.header_size = None
-        self.prog_header_table_entry_size = None
-        self.prog_header_table_num_entries = None
-        self.section_header_table_entry_size = None
-        self.section_header_table_num_entries = None
-        self.section_header_string_table_index = None
+        self.ei_class = self.bytes[4]
+        self.ei_data = self.bytes[5]
+        self.ei_version = self.bytes[6]
+        self.ei_osabi = self.bytes[7]
+        self.isThirtyTwo = self.ei_class == 1
+        self.isLittleEndian = self.ei_data != 2
+        self.e_type = None
+        self.e_machine = None
+        self.e_version = None
+        self.e_entry = None
+        self.e_phoff = None
+        self.e_shoff = None
+        self.e_flags = None
+        self.e_ehsize = None
+        self.e_phentsize = None
+        self.e_phnum = None
+        self.e_shentsize = None
+        self.e_shnum = None
+        self.e_shstrndx = None
 
         # Starting with the program entry point, 32-bit and 64-bit headers are different
-        if self.cls == "01":
+        if self.ei_class == 1:
             self.parse_thirty_two()
-        elif self.cls == "02":
+        elif self.ei_class == 2:
             self.parse_sixty_four()
 
     def parse_thirty_two(self):
-        self.prog_entry = read_bytes(self.bytes, 24, end=27)
-        self.prog_header_table_pos = read_bytes(self.bytes, 28, end=31)
-        self.section_header_table_pos = read_bytes(self.bytes, 32, end=35)
-        self.flags = read_bytes(self.bytes, 36, end=39)
-        self.header_size = read_bytes(self.bytes, 40, end=41)
-        self.prog_header_table_entry_size = read_bytes(self.bytes, 42, end=43)
-        self.prog_header_table_num_entries = read_bytes(self.bytes, 44, end=45)
-        self.section_header_table_entry_size = read_bytes(
-            self.bytes, 46, end=47)
-        self.section_header_table_num_entries = read_bytes(
-            self.bytes, 48, end=49)
-        self.section_header_string_table_index = read_bytes(
-            self.bytes, 50, end=51)
+        self.unpack(ELF_HEADER_LAYOUTS[(True, self.isLittleEndian)])
 
     def parse_sixty_four(self):
-        self.prog_entry = read_bytes(self.bytes, 24, end=31)
-        self.prog_header_table_pos = read_bytes(self.bytes, 32, end=39)
-        self.section_header_table_pos = read_bytes(self.bytes, 40, end=47)
-        self.flags = read_bytes(self.bytes, 48, end=51)
-        self.header_size = read_bytes(self.bytes, 52, end=53)
-        self.prog_header_table_entry_size = read_bytes(self.bytes, 54, end=55)
-        self.prog_header_table_num_entries = read_bytes(self.bytes, 56, end=57)
-        self.section_header_table_entry_size = read_bytes(
-            self.bytes, 58, end=59)
-        self.section_header_table_num_entries = read_bytes(
-            self.bytes, 60, end=61)
-        self.section_header_string_table_index = read_bytes(
-            self.bytes, 62, end=63)
+        self.unpack(ELF_HEADER_LAYOUTS[(False, self.isLittleEndian)])
+
+    def unpack(self, layout):
+        (self.e_type, self.e_machine, self.e_version, self.e_entry, self.e_phoff, self.e_shoff,
+         self.e_flags, self.e_ehsize, self.e_phentsize, self.e_phnum, self.e_shentsize,
+         self.e_shnum, self.e_shstrndx) = layout.unpack(self.bytes[0:layout.size])
 
     def cls_to_string(self) -> str:
         if self.cls == "01":
@@ -77,7 +82,7 @@ class ELF_HEADER(object):
     def data_to_string(self) -> str:
         if self.data == "01":
             return "Little Endian"
-        elif self.cls == "02":
+        elif self.data == "02":
             return "Big Endian"
         else:
             return f"Invalid Data entry. Could not determine endianess (read value: {self.data})"
@@ -133,13 +138,13 @@ class ELF_HEADER(object):
             return "DYN (shared object)"
         elif self.type == "0004":
             return "CORE (core dump)"
-        elif self.type == "FE00":
+        elif self.type == "fe00":
             return "LOOS"
-        elif self.type == "FEFF":
+        elif self.type == "feff":
             return "HIOS"
-        elif self.type == "FF00":
+        elif self.type == "ff00":
             return "LOPROC"
-        elif self.type == "FFFF":
+        elif self.type == "ffff":
             return "HIPROC"
         else:
             return f"Unknown type (read value: {self.type})"
@@ -156,19 +161,48 @@ class ELF_HEADER(object):
             return "PowerPC"
         elif self.instr_set == "0028":
             return "ARM"
-        elif self.instr_set == "002A":
+        elif self.instr_set == "002a":
             return "SuperH"
         elif self.instr_set == "0032":
             return "IA-64"
         elif self.instr_set == "003e":
             return "x86_64"
-        elif self.instr_set == "00B7":
+        elif self.instr_set == "00b7":
             return "AArch64"
-        elif self.instr_set == "00F3":
+        elif self.instr_set == "00f3":
             return "RISC-V"
         else:
             return f"Unknown instruction set type (read value: {self.instr_set}"
 
+    def to_dict(self) -> dict:
+        """
+            Returns the ELF header as dictionary of the integer fields and their string representations
+        """
+        return {
+            "class": self.cls_to_string(),
+            "data": self.data_to_string(),
+            "os_abi": self.os_abi_to_string(),
+            "type": self.type_to_string(),
+            "machine": self.instr_set_to_string(),
+            "ei_class": self.ei_class,
+            "ei_data": self.ei_data,
+            "ei_version": self.ei_version,
+            "ei_osabi": self.ei_osabi,
+            "e_type": self.e_type,
+            "e_machine": self.e_machine,
+            "e_version": self.e_version,
+            "e_entry": self.e_entry,
+            "e_phoff": self.e_phoff,
+            "e_shoff": self.e_shoff,
+            "e_flags": self.e_flags,
+            "e_ehsize": self.e_ehsize,
+            "e_phentsize": self.e_phentsize,
+            "e_phnum": self.e_phnum,
+            "e_shentsize": self.e_shentsize,
+            "e_shnum": self.e_shnum,
+            "e_shstrndx": self.e_shstrndx,
+        }
+
     def __str__(self):
 
         return "ELF Header:\n"\
@@ -0,0 +1,118 @@
+"""
+    Represent the symbol hash tables of an ELF file (.gnu.hash and .hash).
+    They are used to look up symbols of the linked symbol table (usually .dynsym) by name
+    without building a dictionary of all symbol names.
+"""
+
+import struct
+from typing import Callable
+
+
+def gnu_hash(name: bytes) -> int:
+    h = 5381
+    for c in name:
+        h = (h * 33 + c) & 0xffffffff
+    return h
+
+
+def elf_hash(name: bytes) -> int:
+    h = 0
+    for c in name:
+        h = (h << 4) + c
+        g = h & 0xf0000000
+        if g:
+            h ^= g >> 24
+        h &= ~g
+    return h
+
+
+class GNU_HASH_TABLE(object):
+    def __init__(self, bytes: bytearray, isThirtyTwo: bool, isLittleEndian: bool) -> None:
+        """
+            Decodes a .gnu.hash section
+
+            Parameters:
+                bytes: bytearray
+                    The bytes of the section
+                isThirtyTwo: bool
+                    True for 32-bit files (the bloom filter consists of 32-bit words)
+                isLittleEndian: bool
+                    Byte order of the file
+        """
+        order = "<" if isLittleEndian else ">"
+        self.nbuckets, self.symoffset, bloom_size, self.bloom_shift = struct.unpack_from(f"{order}IIII", bytes)
+        self.bloom_bits = 32 if isThirtyTwo else 64
+        word = "I" if isThirtyTwo else "Q"
+        position = 16
+        self.bloom = struct.unpack_from(f"{order}{bloom_size}{word}", bytes, position)
+        position += bloom_size * self.bloom_bits // 8
+        self.buckets = struct.unpack_from(f"{order}{self.nbuckets}I", bytes, position)
+        position += self.nbuckets * 4
+        self.chain = struct.unpack_from(f"{order}{(len(bytes) - position) // 4}I", bytes, position)
+
+    def lookup(self, name: str, symbol_name: Callable[[int], str]) -> int:
+        """
+            Looks up a symbol by name
+
+            Parameters:
+                name: str
+                    The symbol name
+                symbol_name: Callable[[int], str]
+                    Returns the name of a symbol by its index in the symbol table
+
+            Returns:
+                int
+                    Index of the symbol in the symbol table or None, if there is no such symbol
+        """
+        if self.nbuckets == 0 or not self.bloom:
+            return None
+        h = gnu_hash(name.encode("utf-8"))
+
+        bits = self.bloom_bits
+        word = self.bloom[(h // bits) % len(self.bloom)]
+        mask = (1 << (h % bits)) | (1 << ((h >> self.bloom_shift) % bits))
+        if word & mask != mask:
+            return None
+
+        index = self.buckets[h % self.nbuckets]
+        if index < self.symoffset:
+            return None
+        while index - self.symoffset < len(self.chain):
+            chain_hash = self.chain[index - self.symoffset]
+            if (h | 1) == (chain_hash | 1) and symbol_name(index) == name:
+                return index
+            if chain_hash & 1:
+                break
+            index += 1
+        return None
+
+
+class HASH_TABLE(object):
+    def __init__(self, bytes: bytearray, isLittleEndian: bool) -> None:
+        """
+            Decodes a .hash (System V) section
+
+            Parameters:
+                bytes: bytearray
+                    The bytes of the section
+                isLittleEndian: bool
+                    Byte order of the file
+        """
+        order = "<" if isLittleEndian else ">"
+        nbucket, nchain = struct.unpack_from(f"{order}II", bytes)
+        self.buckets = struct.unpack_from(f"{order}{nbucket}I", bytes, 8)
+        self.chain = struct.unpack_from(f"{order}{nchain}I", bytes, 8 + nbucket * 4)
+
+    def lookup(self, name: str, symbol_name: Callable[[int], str]) -> int:
+        """
+            Looks up a symbol by name (see GNU_HASH_TABLE.lookup)
+        """
+        if not self.buckets:
+            return None
+        index = self.buckets[elf_hash(name.encode("utf-8")) % len(self.buckets)]
+        # Index 0 (STN_UNDEF) ends the chain
+        while index != 0 and index < len(self.chain):
+            if symbol_name(index) == name:
+                return index
+            index = self.chain[index]
+        return None
@@ -0,0 +1,186 @@
+"""
+    Opt-in instrumentation of the parsing: the time spent per stage (reading the file, ELF header, header tables,
+    name resolution, ...), counters (bytes read, decoded headers, string lookups, cache hits) and hooks, which are
+    called for every event.
+    Nothing is collected unless a STATS object is active (see collect). Until then, the instrumented code only checks
+    the module attribute active, so the instrumentation costs next to nothing when it is disabled.
+    One STATS object collects the events of all threads of a process. Worker processes collect their own STATS,
+    which are merged in the main process (see twelfe.batch.scan).
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# The STATS object collecting the events of this process (None: the instrumentation is disabled)
+active = None
+
+
+class STATS(object):
+    def __init__(self, hooks: list[Callable[[str, str, float], None]] = None) -> None:
+        """
+            Collects the time per stage and counters
+
+            Parameters:
+                hooks: list[Callable[[str, str, float], None]] (default=None)
+                    Called for every event with the kind of the event ("stage" or "count"), its name and its value
+                    (the seconds of a stage or the amount of a counter)
+        """
+        self.timings: dict[str, float] = {}
+        self.calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {}
+        self.hooks = list(hooks or [])
+
+    def add_hook(self, hook: Callable[[str, str, float], None]) -> None:
+        self.hooks.append(hook)
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """
+            Adds the time of one run of a stage
+        """
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+        for hook in self.hooks:
+            hook("stage", stage, seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+        for hook in self.hooks:
+            hook("count", name, amount)
+
+    def merge(self, other) -> None:
+        """
+            Adds the timings and counters of other STATS (or of their to_dict, for example from a worker process).
+            Hooks are not called
+        """
+        if isinstance(other, STATS):
+            other = other.to_dict()
+        for stage, seconds in other["timings"].items():
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+        for stage, calls in other["calls"].items():
+            self.calls[stage] = self.calls.get(stage, 0) + calls
+        for name, amount in other["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def to_dict(self) -> dict:
+        """
+            Returns the timings (seconds per stage), the calls per stage and the counters
+        """
+        return {"timings": dict(self.timings), "calls": dict(self.calls), "counters": dict(self.counters)}
+
+    def format_line(self) -> str:
+        """
+            Returns all timings and counters in one line
+        """
+        timings = ", ".join(f"{stage} {seconds * 1000:.2f} ms" for stage, seconds in self.timings.items())
+        counters = ", ".join(f"{name}={amount}" for name, amount in self.counters.items())
+        return " | ".join(part for part in (timings, counters) if part)
+
+    def __str__(self):
+        lines = [f"{'Stage':<25}{'Calls':>10}{'Time (ms)':>14}"]
+        for stage, seconds in self.timings.items():
+            lines.append(f"{stage:<25}{self.calls[stage]:>10}{seconds * 1000:>14.3f}")
+        lines.append("")
+        lines.append(f"{'Counter':<25}{'Value':>10}")
+        for name, amount in self.counters.items():
+            lines.append(f"{name:<25}{amount:>10}")
+        return "\n".join(lines)
+
+
+class STAGE(object):
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats: STATS, name: str) -> None:
+        """
+            Times a stage (context manager). Stages can be nested, the time of inner stages is part of the outer stage
+        """
+        self.stats = stats
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats.add_time(self.name, time.perf_counter() - self.start)
+
+
+class NO_STAGE(object):
+    """
+        Stage used while the instrumentation is disabled, does nothing
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+DISABLED_STAGE = NO_STAGE()
+
+
+def stage(name: str):
+    """
+        Returns a context manager timing a stage, if the instrumentation is enabled
+
+        Parameters:
+            name: str
+                Name of the stage, for example "section_headers"
+    """
+    if active is None:
+        return DISABLED_STAGE
+    return STAGE(active, name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+        Increments a counter, if the instrumentation is enabled.
+        In frequently called code, check active before calling count
+    """
+    if active is not None:
+        active.count(name, amount)
+
+
+def enable(stats: STATS = None) -> STATS:
+    """
+        Starts collecting into stats (default: new STATS) and returns them
+    """
+    global active
+    active = stats if stats is not None else STATS()
+    return active
+
+
+def disable() -> STATS:
+    """
+        Stops collecting and returns the STATS collected until now (None, if the instrumentation was disabled)
+    """
+    global active
+    stats, active = active, None
+    return stats
+
+
+@contextmanager
+def collect(stats: STATS = None, hooks: list[Callable[[str, str, float], None]] = None):
+    """
+        Collects the events of the with block. The previously active STATS are restored afterwards
+
+        Parameters:
+            stats: STATS (default=None)
+                The STATS to collect into (default: new STATS with hooks)
+            hooks: list[Callable[[str, str, float], None]] (default=None)
+                Hooks of the new STATS (see STATS)
+
+        Returns:
+            STATS
+                The collected STATS (as target of the with statement)
+    """
+    global active
+    previous = active
+    active = stats if stats is not None else STATS(hooks)
+    try:
+        yield active
+    finally:
+        active = previous
@@ -0,0 +1,98 @@
+"""
+    Contains the precompiled struct layouts of the ELF structures.
+    Every layout dictionary is indexed by (isThirtyTwo, isLittleEndian).
+"""
+
+import struct
+
+
+def create_layouts(thirty_two: str, sixty_four: str) -> dict[tuple[bool, bool], struct.Struct]:
+    """
+        Compiles the struct formats of a structure for both classes and both byte orders
+
+        Parameters:
+            thirty_two: str
+                struct format (without byte order) of the 32-bit structure
+            sixty_four: str
+                struct format (without byte order) of the 64-bit structure
+
+        Returns:
+            dict[tuple[bool, bool], struct.Struct]
+                The compiled layouts, indexed by (isThirtyTwo, isLittleEndian)
+    """
+    return {
+        (True, True): struct.Struct("<" + thirty_two),
+        (True, False): struct.Struct(">" + thirty_two),
+        (False, True): struct.Struct("<" + sixty_four),
+        (False, False): struct.Struct(">" + sixty_four),
+    }
+
+
+# The 16 identification bytes are skipped, they do not depend on class or byte order
+# e_type, e_machine, e_version, e_entry, e_phoff, e_shoff, e_flags, e_ehsize,
+# e_phentsize, e_phnum, e_shentsize, e_shnum, e_shstrndx
+ELF_HEADER_LAYOUTS = create_layouts("16xHHIIIIIHHHHHH", "16xHHIQQQIHHHHHH")
+
+# 32-bit: p_type, p_offset, p_vaddr, p_paddr, p_filesz, p_memsz, p_flags, p_align
+# 64-bit: p_type, p_flags, p_offset, p_vaddr, p_paddr, p_filesz, p_memsz, p_align
+PROGRAM_HEADER_LAYOUTS = create_layouts("IIIIIIII", "IIQQQQQQ")
+
+# sh_name, sh_type, sh_flags, sh_addr, sh_offset, sh_size, sh_link, sh_info, sh_addralign, sh_entsize
+SECTION_HEADER_LAYOUTS = create_layouts("IIIIIIIIII", "IIQQQQIIQQ")
+
+# Field names of the layouts above, in the order of the struct formats. Indexed by isThirtyTwo
+PROGRAM_HEADER_FIELDS = {
+    True: ("p_type", "p_offset", "p_vaddr", "p_paddr", "p_filesz", "p_memsz", "p_flags", "p_align"),
+    False: ("p_type", "p_flags", "p_offset", "p_vaddr", "p_paddr", "p_filesz", "p_memsz", "p_align"),
+}
+
+SECTION_HEADER_FIELDS = {
+    True: ("sh_name", "sh_type", "sh_flags", "sh_addr", "sh_offset", "sh_size",
+           "sh_link", "sh_info", "sh_addralign", "sh_entsize"),
+    False: ("sh_name", "sh_type", "sh_flags", "sh_addr", "sh_offset", "sh_size",
+            "sh_link", "sh_info", "sh_addralign", "sh_entsize"),
+}
+
+# 32-bit: st_name, st_value, st_size, st_info, st_other, st_shndx
+# 64-bit: st_name, st_info, st_other, st_shndx, st_value, st_size
+SYMBOL_LAYOUTS = create_layouts("IIIBBH", "IBBHQQ")
+
+SYMBOL_FIELDS = {
+    True: ("st_name", "st_value", "st_size", "st_info", "st_other", "st_shndx"),
+    False: ("st_name", "st_info", "st_other", "st_shndx", "st_value", "st_size"),
+}
+
+# d_tag, d_val (d_tag is signed in the specification, all defined tags are positive)
+DYNAMIC_LAYOUTS = create_layouts("II", "QQ")
+
+DYNAMIC_FIELDS = {
+    True: ("d_tag", "d_val"),
+    False: ("d_tag", "d_val"),
+}
+
+# r_offset, r_info (REL) and r_offset, r_info, r_addend (RELA)
+# r_addend is signed, it is decoded unsigned to fit the integer columns and converted by RELOCATION
+REL_LAYOUTS = create_layouts("II", "QQ")
+RELA_LAYOUTS = create_layouts("III", "QQQ")
+
+REL_FIELDS = {
+    True: ("r_offset", "r_info"),
+    False: ("r_offset", "r_info"),
+}
+
+RELA_FIELDS = {
+    True: ("r_offset", "r_info", "r_addend"),
+    False: ("r_offset", "r_info", "r_addend"),
+}
+
+# 32-bit: ch_type, ch_size, ch_addralign
+# 64-bit: ch_type, ch_reserved, ch_size, ch_addralign
+COMPRESSION_HEADER_LAYOUTS = create_layouts("III", "IIQQ")
+
+COMPRESSION_HEADER_FIELDS = {
+    True: ("ch_type", "ch_size", "ch_addralign"),
+    False: ("ch_type", "ch_reserved", "ch_size", "ch_addralign"),
+}
+
+# n_namesz, n_descsz, n_type (the same for both classes)
+NOTE_HEADER_LAYOUTS = create_layouts("III", "III")
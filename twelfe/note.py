@@ -0,0 +1,92 @@
+"""
+    Represent a note of a NOTE segment or section (for example the GNU build ID).
+    Note: fields are integers (named like in the ELF specification, for example n_type). name is a string, desc are the raw bytes.
+"""
+
+import struct
+
+NT_GNU_ABI_TAG = 1
+NT_GNU_HWCAP = 2
+NT_GNU_BUILD_ID = 3
+NT_GNU_GOLD_VERSION = 4
+NT_GNU_PROPERTY_TYPE_0 = 5
+
+
+class NOTE(object):
+    __slots__ = ("index", "n_namesz", "n_descsz", "n_type", "name", "desc")
+
+    def __init__(self, index: int, n_namesz: int, n_descsz: int, n_type: int, name: str, desc: bytes) -> None:
+        self.index = index
+        self.n_namesz = n_namesz
+        self.n_descsz = n_descsz
+        self.n_type = n_type
+        self.name = name
+        self.desc = desc
+
+    def type_to_string(self) -> str:
+        if self.name == "GNU":
+            if self.n_type == NT_GNU_ABI_TAG:
+                return "GNU_ABI_TAG"
+            elif self.n_type == NT_GNU_HWCAP:
+                return "GNU_HWCAP"
+            elif self.n_type == NT_GNU_BUILD_ID:
+                return "GNU_BUILD_ID"
+            elif self.n_type == NT_GNU_GOLD_VERSION:
+                return "GNU_GOLD_VERSION"
+            elif self.n_type == NT_GNU_PROPERTY_TYPE_0:
+                return "GNU_PROPERTY_TYPE_0"
+        return f"Unknown type (read {self.n_type:x})"
+
+    def to_dict(self) -> dict:
+        """
+            Returns the note as dictionary of the integer fields, the name and the description as hex string
+        """
+        return {
+            "index": self.index,
+            "name": self.name,
+            "type": self.type_to_string(),
+            "n_type": self.n_type,
+            "n_namesz": self.n_namesz,
+            "n_descsz": self.n_descsz,
+            "desc": self.desc.hex(),
+        }
+
+    def __str__(self):
+        return f"{self.name:<10}"\
+            f"{self.type_to_string():<25}"\
+            f"0x{self.n_descsz:<8x}"\
+            f"{self.desc.hex()}"
+
+
+def iter_notes(content: bytes, layout: struct.Struct, align: int = 4):
+    """
+        Yields the notes of the content of a NOTE segment or section
+
+        Parameters:
+            content: bytes
+                The content of the segment or section
+            layout: struct.Struct
+                Layout of the note header in the byte order of the file (see NOTE_HEADER_LAYOUTS)
+            align: int (default=4)
+                Alignment of name and description (8 for segments or sections aligned to 8 bytes, else 4)
+
+        Returns:
+            Iterator[NOTE]
+                The notes in the order of the content
+    """
+    align = 8 if align == 8 else 4
+    mask = align - 1
+    position = 0
+    index = 0
+    while position + layout.size <= len(content):
+        n_namesz, n_descsz, n_type = layout.unpack_from(content, position)
+        name_start = position + layout.size
+        desc_start = (name_start + n_namesz + mask) & ~mask
+        desc_end = desc_start + n_descsz
+        if desc_end > len(content):
+            print(f"[!] Note {index} exceeds its segment")
+            return
+        name = bytes(content[name_start:name_start + n_namesz]).rstrip(b"\x00").decode(errors="replace")
+        yield NOTE(index, n_namesz, n_descsz, n_type, name, bytes(content[desc_start:desc_end]))
+        position = (desc_end + mask) & ~mask
+        index += 1
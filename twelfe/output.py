@@ -0,0 +1,71 @@
+"""
+    Writes records (dictionaries, see ELF.iter_records) as JSON, NDJSON or CSV.
+    Records are written one by one, the output is never built in memory as a whole.
+"""
+
+import csv
+import json
+from typing import Iterable, TextIO
+
+FORMATS = ("json", "ndjson", "csv")
+
+
+def write_json(records: Iterable[dict], stream: TextIO) -> None:
+    """
+        Writes the records as one JSON array, one record per line
+    """
+    stream.write("[")
+    separator = "\n"
+    for record in records:
+        stream.write(separator)
+        stream.write(json.dumps(record))
+        separator = ",\n"
+    stream.write("\n]\n")
+
+
+def write_ndjson(records: Iterable[dict], stream: TextIO) -> None:
+    """
+        Writes the records as newline delimited JSON (one JSON object per line)
+    """
+    for record in records:
+        stream.write(json.dumps(record))
+        stream.write("\n")
+
+
+def write_csv(records: Iterable[dict], stream: TextIO) -> None:
+    """
+        Writes the records as CSV. Whenever the fields change (for example from program headers to section headers),
+        an empty line and a new header row are written
+    """
+    writer = None
+    fields = None
+    for record in records:
+        if fields is None or record.keys() != fields:
+            if fields is not None:
+                stream.write("\n")
+            fields = record.keys()
+            writer = csv.DictWriter(stream, fieldnames=list(fields), lineterminator="\n")
+            writer.writeheader()
+        writer.writerow(record)
+
+
+def write_records(records: Iterable[dict], stream: TextIO, format: str = "ndjson") -> None:
+    """
+        Writes records in a format
+
+        Parameters:
+            records: Iterable[dict]
+                The records
+            stream: TextIO
+                The stream to write to (for example sys.stdout)
+            format: str (default="ndjson")
+                One of "json", "ndjson" or "csv"
+    """
+    if format == "json":
+        write_json(records, stream)
+    elif format == "ndjson":
+        write_ndjson(records, stream)
+    elif format == "csv":
+        write_csv(records, stream)
+    else:
+        raise ValueError(f"Unknown output format {format}")
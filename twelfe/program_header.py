@@ -1,48 +1,118 @@
 """
     Represent a program header.
-    Note: all fields are strings. They are reversed (little endian) already.
+    Note: fields are decoded into integers (named like in the ELF specification, for example p_vaddr).
+    The former string fields (for example vaddr) are still available as properties.
+    They show the value, independent of the byte order of the file. Setting a field writes it into the table.
 """
 
 
-from .util import read_bytes
+from .layouts import PROGRAM_HEADER_LAYOUTS, PROGRAM_HEADER_FIELDS
+from .table import ENTRY_TABLE
+from .util import column_field, hex_field
 
 
 class PROGRAM_HEADER(object):
-    def __init__(self, bytes: bytearray, index, isThirtyTwo):
-        self.bytes = bytes
+    # No __dict__ and no copy of the fields: the header only references its table (see ENTRY_TABLE) and its index.
+    # Fields are read from the columns of the table
+    __slots__ = ("table", "index")
+
+    p_type = column_field("p_type")
+    p_flags = column_field("p_flags")
+    p_offset = column_field("p_offset")
+    p_vaddr = column_field("p_vaddr")
+    p_paddr = column_field("p_paddr")
+    p_filesz = column_field("p_filesz")
+    p_memsz = column_field("p_memsz")
+    p_align = column_field("p_align")
+
+    # String representations of the integer fields
+    type = hex_field("p_type", 4)
+    flags = hex_field("p_flags", 4)
+    offset = hex_field("p_offset")
+    vaddr = hex_field("p_vaddr")
+    paddr = hex_field("p_paddr")
+    size_file = hex_field("p_filesz")
+    size_mem = hex_field("p_memsz")
+    align = hex_field("p_align")
+
+    def __init__(self, table: ENTRY_TABLE, index: int, isThirtyTwo: bool = None, isLittleEndian: bool = True,
+                 values: tuple = None) -> None:
+        """
+            Creates the program header of an entry of a program header table.
+            The former signature PROGRAM_HEADER(bytes, index, isThirtyTwo, isLittleEndian=True, values=None) is still
+            supported, see from_bytes
+        """
+        if isThirtyTwo is not None:
+            table = ENTRY_TABLE.from_entry(table, index, PROGRAM_HEADER_LAYOUTS[(isThirtyTwo, isLittleEndian)],
+                                           PROGRAM_HEADER_FIELDS[isThirtyTwo], PROGRAM_HEADER, values,
+                                           isThirtyTwo, isLittleEndian)
+        self.table = table
         self.index = index
-        self.isThirtyTwo = isThirtyTwo
-        self.type = read_bytes(self.bytes, 0, count=4)
-        self.flags = None
-        self.offset = None
-        self.vaddr = None
-        self.paddr = None
-        self.size_file = None
-        self.size_mem = None
-        self.align = None
-
-        if self.isThirtyTwo:
-            self.parse_thirty_two()
-        else:
-            self.parse_sixty_four()
-
-    def parse_thirty_two(self):
-        self.flags = read_bytes(self.bytes, 24, end=28)
-        self.offset = read_bytes(self.bytes, 4, end=8)
-        self.vaddr = read_bytes(self.bytes, 8, end=12)
-        self.paddr = read_bytes(self.bytes, 12, end=16)
-        self.size_file = read_bytes(self.bytes, 16, end=20)
-        self.size_mem = read_bytes(self.bytes, 20, end=24)
-        self.align = read_bytes(self.bytes, 28, end=32)
-
-    def parse_sixty_four(self):
-        self.flags = read_bytes(self.bytes, 4, end=8)
-        self.offset = read_bytes(self.bytes, 8, end=16)
-        self.vaddr = read_bytes(self.bytes, 16, end=24)
-        self.paddr = read_bytes(self.bytes, 24, end=32)
-        self.size_file = read_bytes(self.bytes, 32, end=40)
-        self.size_mem = read_bytes(self.bytes, 40, end=48)
-        self.align = read_bytes(self.bytes, 48, end=56)
+
+    @classmethod
+    def from_bytes(cls, bytes: bytearray, index: int, isThirtyTwo: bool, isLittleEndian: bool = True,
+                   values: tuple = None) -> "PROGRAM_HEADER":
+        """
+            Decodes a single program header from its bytes (or the already decoded values) into a table of its own
+
+            Parameters:
+                bytes: bytearray
+                    The bytes of the header
+                index: int
+                    Index of the header in the program header table
+                isThirtyTwo: bool
+                    Class of the file
+                isLittleEndian: bool (default=True)
+                    Byte order of the file
+                values: tuple (default=None)
+                    Already decoded fields in the order of the layout. If passed, bytes are not decoded
+        """
+        return cls(bytes, index, isThirtyTwo, isLittleEndian, values)
+
+    @property
+    def isThirtyTwo(self) -> bool:
+        return self.table.isThirtyTwo
+
+    @property
+    def isLittleEndian(self) -> bool:
+        return self.table.isLittleEndian
+
+    @property
+    def layout(self):
+        return self.table.layout
+
+    @property
+    def position(self) -> int:
+        """
+            Offset of the header in the file
+        """
+        return self.table.position(self.index)
+
+    @property
+    def bytes(self):
+        """
+            The raw bytes of the header (a slice of the buffer it was decoded from)
+        """
+        position = self.position
+        return self.table.source[position:position + self.layout.size]
+
+    # The classes differ in the field order (p_flags), see layouts
+    def parse_thirty_two(self, values: tuple = None) -> None:
+        """
+            Decodes the header as 32-bit header from its bytes (or sets the passed values) and writes the fields into the table
+        """
+        self.assign(True, values)
+
+    def parse_sixty_four(self, values: tuple = None) -> None:
+        """
+            Decodes the header as 64-bit header from its bytes (or sets the passed values) and writes the fields into the table
+        """
+        self.assign(False, values)
+
+    def assign(self, isThirtyTwo: bool, values: tuple = None) -> None:
+        if values is None:
+            values = PROGRAM_HEADER_LAYOUTS[(isThirtyTwo, self.isLittleEndian)].unpack_from(self.bytes)
+        self.table.assign(self.index, values, PROGRAM_HEADER_FIELDS[isThirtyTwo])
 
     def type_to_string(self) -> str:
         if self.type == "00000000":
@@ -63,11 +133,11 @@ class PROGRAM_HEADER(object):
             return "TLS"
         elif self.type == "60000000":
             return "LOOS"
-        elif self.type == "6FFFFFFF":
+        elif self.type == "6fffffff":
             return "HIOS"
         elif self.type == "70000000":
             return "LOPROC"
-        elif self.type == "7FFFFFFF":
+        elif self.type == "7fffffff":
             return "HIPROC"
         elif self.type == "6474e550":
             return "GNU_EH_FRAME"
@@ -79,13 +149,28 @@ class PROGRAM_HEADER(object):
             return f"Unknown Type (read {self.type})"
 
     def flag_to_string(self) -> str:
-        # TODO: there is probably a smarter/more pythonic way to do this
         # R W E (4 = read, 2 = write, 1 = exe)
-        flag = ["R", "W", "E"]
-        binary_flags = [int(f) for f in bin(int(self.flags.lstrip("0")))[2:]]
-        string_flags = [flag[i] if b == 1 else "-" for i,
-                        b in enumerate(binary_flags)]
-        return "".join(string_flags)
+        return ("R" if self.p_flags & 4 else "-") +\
+            ("W" if self.p_flags & 2 else "-") +\
+            ("E" if self.p_flags & 1 else "-")
+
+    def to_dict(self) -> dict:
+        """
+            Returns the program header as dictionary of the integer fields and their string representations
+        """
+        return {
+            "index": self.index,
+            "type": self.type_to_string(),
+            "flags": self.flag_to_string(),
+            "p_type": self.p_type,
+            "p_flags": self.p_flags,
+            "p_offset": self.p_offset,
+            "p_vaddr": self.p_vaddr,
+            "p_paddr": self.p_paddr,
+            "p_filesz": self.p_filesz,
+            "p_memsz": self.p_memsz,
+            "p_align": self.p_align,
+        }
 
     def __str__(self):
         return f"{self.type_to_string():<15}\t"\
@@ -0,0 +1,153 @@
+"""
+    Reads byte ranges of a file on demand with os.pread.
+    FILE_READER can be used like the bytearray of an ELF object (indexing, slicing, len and find),
+    but only fetches the accessed blocks. Small reads are served from an LRU cache of blocks.
+    Readers can be shared between threads: the block cache is guarded by a lock, the file is read with os.pread.
+"""
+
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+from . import instrumentation
+
+# Reads of more than DIRECT_READ_BLOCKS blocks bypass the block cache
+DIRECT_READ_BLOCKS = 4
+
+
+class FILE_READER(object):
+    def __init__(self, path: str, block_size: int = 4096, cache_blocks: int = 64) -> None:
+        """
+            Opens the file. Nothing is read yet
+
+            Parameters:
+                path: str
+                    Path to the file
+                block_size: int (default=4096)
+                    Size of the cached blocks
+                cache_blocks: int (default=64)
+                    Maximum amount of cached blocks
+        """
+        self.path = path
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.blocks: OrderedDict[int, bytes] = OrderedDict()
+        # Guards the block cache and the statistics. Not held while reading, os.pread does not move a shared position
+        self.lock = threading.Lock()
+        self.fd = os.open(path, os.O_RDONLY)
+        # Closes the file when the reader is garbage collected without being closed
+        # (for example an ELF object opened with use_pread, which is just dropped)
+        self._finalizer = weakref.finalize(self, os.close, self.fd)
+        self.size = os.fstat(self.fd).st_size
+        # I/O statistics
+        self.reads = 0
+        self.bytes_read = 0
+
+    def pread(self, offset: int, size: int) -> bytes:
+        """
+            Reads size bytes at offset from the file (without cache)
+        """
+        chunks = []
+        while size > 0:
+            chunk = os.pread(self.fd, size, offset)
+            if not chunk:
+                break
+            with self.lock:
+                self.reads += 1
+                self.bytes_read += len(chunk)
+            if instrumentation.active is not None:
+                instrumentation.active.count("reads")
+                instrumentation.active.count("bytes_read", len(chunk))
+            chunks.append(chunk)
+            offset += len(chunk)
+            size -= len(chunk)
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+    def get_block(self, index: int) -> bytes:
+        with self.lock:
+            block = self.blocks.get(index)
+            if block is not None:
+                self.blocks.move_to_end(index)
+                return block
+
+        # Concurrent misses of the same block read it twice, the last one is kept
+        block = self.pread(index * self.block_size, self.block_size)
+        with self.lock:
+            self.blocks[index] = block
+            self.blocks.move_to_end(index)
+            if len(self.blocks) > self.cache_blocks:
+                self.blocks.popitem(last=False)
+        return block
+
+    def read(self, offset: int, size: int) -> bytes:
+        """
+            Reads a byte range. Ranges are clipped to the size of the file
+
+            Parameters:
+                offset: int
+                    Offset in the file
+                size: int
+                    Amount of bytes to read
+
+            Returns:
+                bytes
+                    The read bytes
+        """
+        if offset >= self.size or size <= 0:
+            return b""
+        size = min(size, self.size - offset)
+        if size > self.block_size * DIRECT_READ_BLOCKS:
+            return self.pread(offset, size)
+
+        first = offset // self.block_size
+        last = (offset + size - 1) // self.block_size
+        start = offset - first * self.block_size
+        if first == last:
+            return self.get_block(first)[start:start + size]
+        return b"".join(self.get_block(i) for i in range(first, last + 1))[start:start + size]
+
+    def find(self, sub: bytes, start: int = 0, end: int = None) -> int:
+        """
+            Returns the lowest offset in [start, end) where sub is found (like bytes.find), or -1.
+            The file is searched block by block
+        """
+        end = self.size if end is None else min(end, self.size)
+        position = start
+        while position < end:
+            step = self.block_size - position % self.block_size
+            chunk = self.read(position, min(end - position, step + len(sub) - 1))
+            found = chunk.find(sub)
+            if found != -1:
+                return position + found
+            position += step
+        return -1
+
+    def close(self) -> None:
+        if self.fd is not None:
+            self._finalizer()
+            self.fd = None
+            with self.lock:
+                self.blocks.clear()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.size)
+            if step == 1:
+                return self.read(start, stop - start)
+            return bytes(self[i] for i in range(start, stop, step))
+
+        if index < 0:
+            index += self.size
+        if index < 0 or index >= self.size:
+            raise IndexError("File index out of range")
+        return self.read(index, 1)[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,100 @@
+"""
+    Represent a relocation of a relocation section (.rel.* or .rela.*).
+    Note: fields are integers (named like in the ELF specification, for example r_offset).
+    The symbol is resolved through the linked symbol table (usually .dynsym), when it is accessed.
+"""
+
+from array import array
+
+from .symbol import SYMBOL
+from .table import ENTRY_TABLE
+
+
+def symbol_indexes(r_info: array, isThirtyTwo: bool) -> array:
+    """
+        Extracts the symbol indexes of a whole r_info column at once
+
+        Parameters:
+            r_info: array
+                The r_info column of a relocation table
+            isThirtyTwo: bool
+                The class of the file (32-bit: index is r_info >> 8, 64-bit: r_info >> 32)
+
+        Returns:
+            array
+                The symbol indexes, indexed by relocation index
+    """
+    shift = 8 if isThirtyTwo else 32
+    return array("Q", [info >> shift for info in r_info])
+
+
+def relocation_types(r_info: array, isThirtyTwo: bool) -> array:
+    """
+        Extracts the (processor specific) relocation types of a whole r_info column at once (see symbol_indexes)
+    """
+    mask = 0xff if isThirtyTwo else 0xffffffff
+    return array("Q", [info & mask for info in r_info])
+
+
+class RELOCATION(object):
+    __slots__ = ("index", "r_offset", "r_info", "r_addend", "isThirtyTwo", "symbols")
+
+    def __init__(self, index: int, values: tuple, isThirtyTwo: bool, symbols: ENTRY_TABLE = None) -> None:
+        """
+            Creates the relocation from its decoded values (see REL_LAYOUTS and RELA_LAYOUTS).
+            r_addend is None for REL entries (the addend is stored at the relocated location)
+        """
+        self.index = index
+        self.isThirtyTwo = isThirtyTwo
+        self.symbols = symbols
+        self.r_offset = values[0]
+        self.r_info = values[1]
+        self.r_addend = None
+        if len(values) > 2:
+            # The addend is decoded unsigned, convert it to a signed integer
+            bits = 32 if isThirtyTwo else 64
+            self.r_addend = values[2] - (1 << bits) if values[2] >> (bits - 1) else values[2]
+
+    @property
+    def sym(self) -> int:
+        return self.r_info >> 8 if self.isThirtyTwo else self.r_info >> 32
+
+    @property
+    def type(self) -> int:
+        return self.r_info & 0xff if self.isThirtyTwo else self.r_info & 0xffffffff
+
+    @property
+    def symbol(self) -> SYMBOL:
+        """
+            The referenced symbol or None, if the relocation references no symbol
+        """
+        if self.symbols is None or self.sym == 0 or self.sym >= len(self.symbols):
+            return None
+        return self.symbols[self.sym]
+
+    @property
+    def symbol_name(self) -> str:
+        symbol = self.symbol
+        return symbol.name if symbol is not None else None
+
+    def to_dict(self) -> dict:
+        """
+            Returns the relocation as dictionary of the integer fields and the symbol name
+        """
+        return {
+            "index": self.index,
+            "symbol": self.symbol_name,
+            "r_offset": self.r_offset,
+            "r_info": self.r_info,
+            "r_addend": self.r_addend,
+            "sym": self.sym,
+            "type": self.type,
+        }
+
+    def __str__(self):
+        addend = "" if self.r_addend is None else f"{self.r_addend:+#x}"
+        return f"{self.index:<5}"\
+            f"0x{self.r_offset:<20x}"\
+            f"{self.type:<10}"\
+            f"{self.symbol_name or '':<40}"\
+            f"{addend}"
@@ -0,0 +1,267 @@
+"""
+    Searches many byte patterns at once, for example in the executable segments of an ELF file (see ELF.search).
+    Patterns are bytes or hex strings with wildcards ("48 8b ?? ?? e8", "4? 89"). The bytes are scanned once for all
+    patterns: a bit-parallel filter checks up to four literal bytes of every pattern at every position, only the few
+    positions, which pass the filter, are checked with regular expressions. So all matches are found, also overlapping
+    ones, and the time hardly grows with the amount of patterns (see BYTE_SEARCH).
+"""
+
+import mmap
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Bytes filtered at once (see BYTE_SEARCH.scan). Small blocks stay in the CPU cache
+BLOCK_SIZE = 16 * 1024
+# Literal bytes per pattern checked by the filter: the anchor and the most common offsets after it
+PROBES = 4
+
+
+def pattern_to_tokens(pattern) -> list[tuple[bytes, int]]:
+    """
+        Splits a pattern into single byte tokens
+
+        Parameters:
+            pattern: bytes | str
+                Literal bytes or a hex string. In hex strings "??" matches any byte, "4?" and "?4" match one nibble.
+                Whitespace is ignored
+
+        Returns:
+            list[tuple[bytes, int]]
+                The regular expression of every byte and the byte itself (None, if the token contains a wildcard)
+    """
+    if isinstance(pattern, (bytes, bytearray)):
+        if not pattern:
+            raise ValueError("Empty pattern")
+        return [(re.escape(bytes([byte])), byte) for byte in pattern]
+
+    digits = "".join(pattern.split()).lower()
+    if len(digits) % 2 != 0:
+        raise ValueError(f"Pattern {pattern} has an odd amount of hex digits")
+    if not digits:
+        raise ValueError("Empty pattern")
+
+    tokens = []
+    for i in range(0, len(digits), 2):
+        high, low = digits[i], digits[i + 1]
+        if high == "?" and low == "?":
+            tokens.append((b".", None))
+        elif high == "?":
+            tokens.append((b"[" + b"".join(re.escape(bytes([(h << 4) | int(low, 16)])) for h in range(16)) + b"]", None))
+        elif low == "?":
+            first = int(high, 16) << 4
+            tokens.append((b"[" + re.escape(bytes([first])) + b"-" + re.escape(bytes([first | 0xf])) + b"]", None))
+        else:
+            byte = int(high + low, 16)
+            tokens.append((re.escape(bytes([byte])), byte))
+    return tokens
+
+
+def pattern_to_regex(pattern) -> bytes:
+    """
+        Converts a pattern into a regular expression over bytes (see pattern_to_tokens)
+    """
+    return b"".join(regex for regex, _ in pattern_to_tokens(pattern))
+
+
+def pattern_length(pattern) -> int:
+    if isinstance(pattern, (bytes, bytearray)):
+        return len(pattern)
+    return len("".join(pattern.split())) // 2
+
+
+class BYTE_SEARCH(object):
+    def __init__(self, patterns: list) -> None:
+        """
+            Compiles the patterns. Every pattern is anchored at its first literal byte, the filter checks the anchor and
+            up to PROBES - 1 offsets after it (the offsets, where most patterns have literal bytes).
+            The patterns are distributed over buckets, every byte of the data gets one bit per bucket and probe
+            (8 bits: 8 buckets for 1 probe, 4 for 2, 2 for 3 or 4). A translation table per byte value sets the bits of the
+            buckets, in which some pattern allows that value at that probe. scan translates a block of bytes, converts it
+            into one integer and combines all probes of all positions with a few shifts and ANDs in C.
+            The remaining positions are checked with the regular expression of the bucket and then of its patterns,
+            so the cost is one pass over the bytes, no matter how many patterns are searched.
+            Patterns without literal bytes are searched with their own regular expression
+
+            Parameters:
+                patterns: list[bytes | str]
+                    The patterns (see pattern_to_tokens)
+        """
+        self.patterns = list(patterns)
+        self.max_length = max((pattern_length(pattern) for pattern in self.patterns), default=0)
+        self.singles = []
+        # (pattern index, position of the anchor in the pattern, tokens from the anchor on)
+        anchored = []
+        # (pattern index, compiled lookahead), the lookahead does not consume the match, so overlapping matches are found
+        self.unanchored = []
+        for index, pattern in enumerate(self.patterns):
+            tokens = pattern_to_tokens(pattern)
+            regex = b"".join(regex for regex, _ in tokens)
+            self.singles.append(re.compile(regex, re.DOTALL))
+            anchor = next((position for position, (_, byte) in enumerate(tokens) if byte is not None), None)
+            if anchor is None:
+                self.unanchored.append((index, re.compile(b"(?=" + regex + b")", re.DOTALL)))
+            else:
+                anchored.append((index, anchor, tokens[anchor:]))
+
+        # Offsets of the probes after the anchor
+        counts = Counter(offset for _, _, rest in anchored for offset, (_, byte) in enumerate(rest[1:], 1) if byte is not None)
+        self.probes = [0] + sorted(offset for offset, _ in counts.most_common(PROBES - 1))
+        buckets = bits = 8 // len(self.probes)
+        self.lane_mask = (1 << buckets) - 1
+
+        # Patterns with the same anchor share a bucket, so the bucket allows less bytes at the anchor
+        anchored.sort(key=lambda member: member[2][0][1])
+        table = [0] * 256
+        # (compiled alternation of the patterns from their anchor on, [(pattern index, position of the anchor)])
+        self.buckets = []
+        for bucket in range(buckets):
+            members = anchored[bucket * len(anchored) // buckets:(bucket + 1) * len(anchored) // buckets]
+            for probe, offset in enumerate(self.probes):
+                bit = 1 << (bucket + probe * bits)
+                for _, _, rest in members:
+                    if offset < len(rest) and rest[offset][1] is not None:
+                        table[rest[offset][1]] |= bit
+                    else:
+                        # A wildcard or the end of the pattern allows any byte
+                        for byte in range(256):
+                            table[byte] |= bit
+            regex = b"|".join(b"".join(regex for regex, _ in rest) for _, _, rest in members)
+            self.buckets.append((re.compile(regex, re.DOTALL) if members else None,
+                                 [(index, anchor) for index, anchor, _ in members]))
+        self.table = bytes(table)
+        # The probe of the bucket bits of a position p is at byte p + offset and bit probe * bits
+        self.shifts = [8 * offset + probe * bits for probe, offset in enumerate(self.probes)]
+        # Candidates per lane value: the buckets of its set bits
+        self.lanes = [(bytes([value]), [self.buckets[bucket] for bucket in range(buckets)
+                                        if value >> bucket & 1 and self.buckets[bucket][0] is not None])
+                      for value in range(1, self.lane_mask + 1)]
+        self.anchored = len(anchored)
+        self.min_anchor = min((anchor for _, anchor, _ in anchored), default=0)
+        self.max_anchor = max((anchor for _, anchor, _ in anchored), default=0)
+
+    def scan(self, data, address: int = 0, start: int = 0, end: int = None) -> list[tuple[int, int]]:
+        """
+            Searches all patterns in data
+
+            Parameters:
+                data: bytes-like
+                    The bytes (a memoryview or mmap is only copied block by block)
+                address: int (default=0)
+                    Address of data[0], added to all match positions
+                start: int (default=0)
+                    First position where a match may start
+                end: int (default=None)
+                    Matches have to start before end (default: end of data). Matches may extend beyond end
+
+            Returns:
+                list[tuple[int, int]]
+                    (index of the pattern, address) of all matches, ordered by address and pattern
+        """
+        end = len(data) if end is None else end
+        singles = self.singles
+        matches = []
+
+        # Positions of anchors, the probes may read up to reach bytes further
+        first = start + self.min_anchor
+        last = min(len(data), end + self.max_anchor) if self.anchored else first
+        reach = self.probes[-1]
+        # Probes beyond the data allow every bucket, the regular expressions check the length
+        padding = b"\xff" * reach
+        mask = int.from_bytes(bytes([self.lane_mask]) * BLOCK_SIZE, "little")
+        for block in range(first, last, BLOCK_SIZE):
+            size = min(BLOCK_SIZE, last - block)
+            translated = bytes(data[block:block + size + reach]).translate(self.table)
+            value = int.from_bytes(translated + padding[:size + reach - len(translated)], "little")
+            if size < BLOCK_SIZE:
+                mask = int.from_bytes(bytes([self.lane_mask]) * size, "little")
+            hits = mask
+            for shift in self.shifts:
+                hits &= value >> shift
+            if not hits:
+                continue
+
+            lanes = hits.to_bytes(size, "little")
+            for lane, buckets in self.lanes:
+                found = lanes.find(lane)
+                while found >= 0:
+                    anchor_position = block + found
+                    for bucket, members in buckets:
+                        if bucket.match(data, anchor_position) is None:
+                            continue
+                        # The bucket only tells that one of its patterns matches from the anchor on, check all of them
+                        for index, anchor in members:
+                            position = anchor_position - anchor
+                            if start <= position < end and singles[index].match(data, position):
+                                matches.append((index, address + position))
+                    found = lanes.find(lane, found + 1)
+
+        for index, regex in self.unanchored:
+            for match in regex.finditer(data, start):
+                if match.start() >= end:
+                    break
+                matches.append((index, address + match.start()))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
+
+
+def search_file_range(path: str, offset: int, size: int, address: int, patterns: list, start: int, end: int) -> list[tuple[int, int]]:
+    """
+        Searches a range of a file in a worker process. The file is memory-mapped, so only the range is read
+
+        Parameters:
+            path: str
+                Path to the file
+            offset: int
+                Offset of the range in the file
+            size: int
+                Size of the range
+            address: int
+                Virtual address of the range
+            patterns: list[bytes | str]
+                The patterns
+            start: int
+                First position (relative to offset) where a match may start
+            end: int
+                Matches have to start before end (relative to offset)
+
+        Returns:
+            list[tuple[int, int]]
+                (index of the pattern, address) of all matches
+    """
+    with open(path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        view = memoryview(mapping)[offset:offset + size]
+        try:
+            return BYTE_SEARCH(patterns).scan(view, address, start, end)
+        finally:
+            view.release()
+    finally:
+        mapping.close()
+
+
+def search_file_parallel(path: str, regions: list[tuple[int, int, int]], patterns: list,
+                         workers: int, chunk_size: int = 16 * 1024 * 1024) -> list[tuple[int, int]]:
+    """
+        Searches regions of a file (offset, size, address) in worker processes.
+        Regions are split into chunks, which overlap by the length of the longest pattern
+
+        Returns:
+            list[tuple[int, int]]
+                (index of the pattern, address) of all matches
+    """
+    overlap = max((pattern_length(pattern) for pattern in patterns), default=1) - 1
+    tasks = []
+    for offset, size, address in regions:
+        for chunk_start in range(0, size, chunk_size):
+            chunk_end = min(size, chunk_start + chunk_size)
+            read_end = min(size, chunk_end + overlap)
+            tasks.append((path, offset + chunk_start, read_end - chunk_start, address + chunk_start, patterns,
+                          0, chunk_end - chunk_start))
+
+    matches = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(search_file_range, *zip(*tasks)):
+            matches.extend(result)
+    return matches
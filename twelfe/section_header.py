@@ -1,53 +1,123 @@
 """
     Represent a section header.
-    Note: all fields are strings. They are reversed (little endian) already.
+    Note: fields are decoded into integers (named like in the ELF specification, for example sh_addr).
+    The former string fields (for example addr) are still available as properties.
+    They show the value, independent of the byte order of the file. Setting a field writes it into the table.
 """
 
 
-from .util import read_bytes
+from .layouts import SECTION_HEADER_LAYOUTS, SECTION_HEADER_FIELDS
+from .table import ENTRY_TABLE
+from .util import column_field, hex_field
 
 
 class SECTION_HEADER(object):
-    def __init__(self, bytes: bytearray, index: int, isThirtyTwo: bool) -> None:
-        self.bytes = bytes
+    # No __dict__ and no copy of the fields: the header only references its table (see ENTRY_TABLE) and its index.
+    # Fields are read from the columns of the table
+    __slots__ = ("table", "index", "name")
+
+    sh_name = column_field("sh_name")
+    sh_type = column_field("sh_type")
+    sh_flags = column_field("sh_flags")
+    sh_addr = column_field("sh_addr")
+    sh_offset = column_field("sh_offset")
+    sh_size = column_field("sh_size")
+    sh_link = column_field("sh_link")
+    sh_info = column_field("sh_info")
+    sh_addralign = column_field("sh_addralign")
+    sh_entsize = column_field("sh_entsize")
+
+    # String representations of the integer fields
+    name_offset = hex_field("sh_name", 4)
+    type = hex_field("sh_type", 4)
+    flags = hex_field("sh_flags")
+    addr = hex_field("sh_addr")
+    offset = hex_field("sh_offset")
+    size = hex_field("sh_size")
+    link = hex_field("sh_link", 4)
+    info = hex_field("sh_info", 4)
+    align = hex_field("sh_addralign")
+    size_entry = hex_field("sh_entsize")
+
+    def __init__(self, table: ENTRY_TABLE, index: int, isThirtyTwo: bool = None, isLittleEndian: bool = True,
+                 values: tuple = None) -> None:
+        """
+            Creates the section header of an entry of a section header table. The name is set by the creator of the header.
+            The former signature SECTION_HEADER(bytes, index, isThirtyTwo, isLittleEndian=True, values=None) is still
+            supported, see from_bytes
+        """
+        if isThirtyTwo is not None:
+            table = ENTRY_TABLE.from_entry(table, index, SECTION_HEADER_LAYOUTS[(isThirtyTwo, isLittleEndian)],
+                                           SECTION_HEADER_FIELDS[isThirtyTwo], SECTION_HEADER, values,
+                                           isThirtyTwo, isLittleEndian)
+        self.table = table
         self.index = index
-        self.isThirtyTwo = isThirtyTwo
-        self.name_offset = read_bytes(self.bytes, 0, end=4)
         self.name = None
-        self.type = read_bytes(self.bytes, 4, end=8)
-        self.flags = None
-        self.addr = None
-        self.offset = None
-        self.size = None
-        self.link = None
-        self.info = None
-        self.align = None
-        self.size_entry = None
-
-        if self.isThirtyTwo:
-            self.parse_thirty_two()
-        else:
-            self.parse_sixty_four()
-
-    def parse_thirty_two(self):
-        self.flags = read_bytes(self.bytes, 8, end=12)
-        self.addr = read_bytes(self.bytes, 12, end=16)
-        self.offset = read_bytes(self.bytes, 16, end=20)
-        self.size = read_bytes(self.bytes, 20, end=24)
-        self.link = read_bytes(self.bytes, 24, end=28)
-        self.info = read_bytes(self.bytes, 28, end=32)
-        self.align = read_bytes(self.bytes, 32, end=36)
-        self.size_entry = read_bytes(self.bytes, 36, end=40)
-
-    def parse_sixty_four(self):
-        self.flags = read_bytes(self.bytes, 8, end=16)
-        self.addr = read_bytes(self.bytes, 16, end=24)
-        self.offset = read_bytes(self.bytes, 24, end=32)
-        self.size = read_bytes(self.bytes, 32, end=40)
-        self.link = read_bytes(self.bytes, 40, end=44)
-        self.info = read_bytes(self.bytes, 44, end=48)
-        self.align = read_bytes(self.bytes, 48, end=56)
-        self.size_entry = read_bytes(self.bytes, 56, end=64)
+
+    @classmethod
+    def from_bytes(cls, bytes: bytearray, index: int, isThirtyTwo: bool, isLittleEndian: bool = True,
+                   values: tuple = None) -> "SECTION_HEADER":
+        """
+            Decodes a single section header from its bytes (or the already decoded values) into a table of its own
+
+            Parameters:
+                bytes: bytearray
+                    The bytes of the header
+                index: int
+                    Index of the header in the section header table
+                isThirtyTwo: bool
+                    Class of the file
+                isLittleEndian: bool (default=True)
+                    Byte order of the file
+                values: tuple (default=None)
+                    Already decoded fields in the order of the layout. If passed, bytes are not decoded
+        """
+        return cls(bytes, index, isThirtyTwo, isLittleEndian, values)
+
+    @property
+    def isThirtyTwo(self) -> bool:
+        return self.table.isThirtyTwo
+
+    @property
+    def isLittleEndian(self) -> bool:
+        return self.table.isLittleEndian
+
+    @property
+    def layout(self):
+        return self.table.layout
+
+    @property
+    def position(self) -> int:
+        """
+            Offset of the header in the file
+        """
+        return self.table.position(self.index)
+
+    @property
+    def bytes(self):
+        """
+            The raw bytes of the header (a slice of the buffer it was decoded from)
+        """
+        position = self.position
+        return self.table.source[position:position + self.layout.size]
+
+    # Both classes share the field order, only the field sizes differ (see layouts)
+    def parse_thirty_two(self, values: tuple = None) -> None:
+        """
+            Decodes the header as 32-bit header from its bytes (or sets the passed values) and writes the fields into the table
+        """
+        self.assign(True, values)
+
+    def parse_sixty_four(self, values: tuple = None) -> None:
+        """
+            Decodes the header as 64-bit header from its bytes (or sets the passed values) and writes the fields into the table
+        """
+        self.assign(False, values)
+
+    def assign(self, isThirtyTwo: bool, values: tuple = None) -> None:
+        if values is None:
+            values = SECTION_HEADER_LAYOUTS[(isThirtyTwo, self.isLittleEndian)].unpack_from(self.bytes)
+        self.table.assign(self.index, values, SECTION_HEADER_FIELDS[isThirtyTwo])
 
     def type_to_string(self) -> str:
         if self.type == "00000000":
@@ -88,7 +158,7 @@ class SECTION_HEADER(object):
             return "GROUP"
         elif self.type == "00000012":
             return "SYMTAB_SHNDX"
-        elif self.type == "000000013":
+        elif self.type == "00000013":
             return "NUM"
         elif self.type == "6ffffff6":
             return "GNU_HASH"
@@ -100,43 +170,28 @@ class SECTION_HEADER(object):
             return f"Unknown type (read {self.type})"
 
     def flags_to_string(self) -> str:
-        flag_str = []
-        # String to hex, convert to binary, reverse
-        binary_flag = format(int(self.flags, 16), "032b")[::-1]
-
-        if binary_flag[0] == "1":
-            flag_str.append("W")
-
-        if binary_flag[1] == "1":
-            flag_str.append("A")
-
-        if binary_flag[2] == "1":
-            flag_str.append("X")
-
-        if binary_flag[4] == "1":
-            flag_str.append("M")
-
-        if binary_flag[5] == "1":
-            flag_str.append("S")
-
-        if binary_flag[6] == "1":
-            flag_str.append("I")
-
-        if binary_flag[7] == "1":
-            flag_str.append("O")
-
-        if binary_flag[8] == "8":
-            flag_str.append("N")
-
-        if binary_flag[9] == "1":
-            flag_str.append("G")
-
-        if binary_flag[10] == "1":
-            flag_str.append("T")
-
-        # Currently ignoring the rare flags
-
-        return "".join(flag_str)
+        return flags_to_string(self.sh_flags)
+
+    def to_dict(self) -> dict:
+        """
+            Returns the section header as dictionary of the integer fields and their string representations
+        """
+        return {
+            "index": self.index,
+            "name": self.name,
+            "type": self.type_to_string(),
+            "flags": self.flags_to_string(),
+            "sh_name": self.sh_name,
+            "sh_type": self.sh_type,
+            "sh_flags": self.sh_flags,
+            "sh_addr": self.sh_addr,
+            "sh_offset": self.sh_offset,
+            "sh_size": self.sh_size,
+            "sh_link": self.sh_link,
+            "sh_info": self.sh_info,
+            "sh_addralign": self.sh_addralign,
+            "sh_entsize": self.sh_entsize,
+        }
 
     def __str__(self):
         return f"{self.index:<5}"\
@@ -150,3 +205,43 @@ class SECTION_HEADER(object):
             f"0x{self.link.lstrip('0'):<10}"\
             f"0x{self.align.lstrip('0'):<10}"\
             f"0x{self.size_entry.lstrip('0'):<10}"
+
+
+def flags_to_string(sh_flags: int) -> str:
+    flag_str = []
+    # String to hex, convert to binary, reverse
+    binary_flag = format(sh_flags, "032b")[::-1]
+
+    if binary_flag[0] == "1":
+        flag_str.append("W")
+
+    if binary_flag[1] == "1":
+        flag_str.append("A")
+
+    if binary_flag[2] == "1":
+        flag_str.append("X")
+
+    if binary_flag[4] == "1":
+        flag_str.append("M")
+
+    if binary_flag[5] == "1":
+        flag_str.append("S")
+
+    if binary_flag[6] == "1":
+        flag_str.append("I")
+
+    if binary_flag[7] == "1":
+        flag_str.append("O")
+
+    if binary_flag[8] == "8":
+        flag_str.append("N")
+
+    if binary_flag[9] == "1":
+        flag_str.append("G")
+
+    if binary_flag[10] == "1":
+        flag_str.append("T")
+
+    # Currently ignoring the rare flags
+
+    return "".join(flag_str)
@@ -0,0 +1,88 @@
+"""
+    Lookup indexes over the section header table.
+    The indexes are built from the integer columns of the table, so sections are only created for the results.
+"""
+
+from bisect import bisect_right
+
+from .section_header import SECTION_HEADER, flags_to_string
+from .string_table import STRING_TABLE
+from .table import ENTRY_TABLE
+
+SHF_ALLOC = 0x2
+SHF_TLS = 0x400
+SHT_NOBITS = 8
+
+
+class SECTION_INDEX(object):
+    def __init__(self, section_headers: ENTRY_TABLE, shstrtab: STRING_TABLE) -> None:
+        """
+            Builds the type, flag and address indexes. The name index is built on the first lookup by name,
+            because it needs all section names.
+
+            Parameters:
+                section_headers: ENTRY_TABLE
+                    The section header table
+                shstrtab: STRING_TABLE
+                    The section header string table or None, if the file has none. Lookups by name return None then
+        """
+        self.section_headers = section_headers
+        self.shstrtab = shstrtab
+        self.names: dict[str, int] = None
+
+        types = section_headers.column("sh_type")
+        flags = section_headers.column("sh_flags")
+        addrs = section_headers.column("sh_addr")
+        sizes = section_headers.column("sh_size")
+
+        # type -> section indexes, flag bitmask -> section indexes
+        self.types: dict[int, list[int]] = {}
+        self.flags: dict[int, list[int]] = {}
+        for i in range(len(section_headers)):
+            self.types.setdefault(types[i], []).append(i)
+            self.flags.setdefault(flags[i], []).append(i)
+
+        # flag string of every distinct bitmask, computed once
+        self.flag_strings = {mask: flags_to_string(mask) for mask in self.flags}
+
+        # Sorted intervals [start, end) of all sections, which occupy memory at runtime
+        intervals = sorted(
+            (addrs[i], addrs[i] + sizes[i], i) for i in range(len(section_headers))
+            if flags[i] & SHF_ALLOC and sizes[i] > 0
+            and not (types[i] == SHT_NOBITS and flags[i] & SHF_TLS))
+        self.starts = [interval[0] for interval in intervals]
+        self.ends = [interval[1] for interval in intervals]
+        self.address_indexes = [interval[2] for interval in intervals]
+
+    def by_index(self, index: int) -> SECTION_HEADER:
+        if 0 <= index < len(self.section_headers):
+            return self.section_headers[index]
+        return None
+
+    def by_name(self, name: str) -> SECTION_HEADER:
+        if self.names is None:
+            # Built completely before it is published, threads sharing the index never see a partial one
+            names = {}
+            if self.shstrtab is not None:
+                for i, sh_name in enumerate(self.section_headers.column("sh_name")):
+                    names.setdefault(self.shstrtab.get(sh_name), i)
+            self.names = names
+
+        index = self.names.get(name)
+        return None if index is None else self.section_headers[index]
+
+    def by_type(self, sh_type: int) -> list[SECTION_HEADER]:
+        return [self.section_headers[i] for i in self.types.get(sh_type, [])]
+
+    def by_flag(self, flag: str) -> list[SECTION_HEADER]:
+        indexes = []
+        for mask, flag_string in self.flag_strings.items():
+            if flag in flag_string:
+                indexes.extend(self.flags[mask])
+        return [self.section_headers[i] for i in sorted(indexes)]
+
+    def by_address(self, address: int) -> SECTION_HEADER:
+        position = bisect_right(self.starts, address) - 1
+        if position >= 0 and address < self.ends[position]:
+            return self.section_headers[self.address_indexes[position]]
+        return None
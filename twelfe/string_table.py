@@ -0,0 +1,64 @@
+"""
+    Represent a string table section (for example .shstrtab, .strtab or .dynstr).
+    Strings are NULL terminated and referenced by their offset into the table.
+"""
+
+from . import instrumentation
+
+
+class STRING_TABLE(object):
+    def __init__(self, bytes: bytearray, offset: int, size: int) -> None:
+        """
+            Wraps the string table. No bytes are copied, if the underlying object supports find (bytes, bytearray, mmap)
+
+            Parameters:
+                bytes: bytearray
+                    The bytes of the ELF file (or a memoryview of them)
+                offset: int
+                    Offset of the string table in the file
+                size: int
+                    Size of the string table
+        """
+        source = bytes.obj if isinstance(bytes, memoryview) else bytes
+        if hasattr(source, "find") and len(source) == len(bytes):
+            self.source = source
+            self.start = offset
+        else:
+            # Fall back to a copy of just the string table
+            self.source = bytearray(bytes[offset:offset + size])
+            self.start = 0
+        self.size = size
+        self.end = min(self.start + size, len(self.source))
+        self.strings: dict[int, str] = {}
+
+    def get(self, offset: int) -> str:
+        """
+            Returns the string at an offset into the table. Resolved strings are cached
+
+            Parameters:
+                offset: int
+                    Offset of the string into the table (for example sh_name)
+
+            Returns:
+                str
+                    The string until the next NULL byte (or the end of the table)
+        """
+        string = self.strings.get(offset)
+        if instrumentation.active is not None:
+            instrumentation.active.count("string_lookups")
+            if string is not None:
+                instrumentation.active.count("string_cache_hits")
+        if string is None:
+            start = self.start + offset
+            if start > self.end:
+                print(f"[!] Offset {hex(offset)} exceeds the string table")
+                return ""
+            end = self.source.find(b"\0", start, self.end)
+            if end == -1:
+                end = self.end
+            string = bytes(self.source[start:end]).decode("utf-8", errors="replace")
+            self.strings[offset] = string
+        return string
+
+    def __getitem__(self, offset: int) -> str:
+        return self.get(offset)
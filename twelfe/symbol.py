@@ -0,0 +1,98 @@
+"""
+    Represent a symbol of a symbol table (.symtab or .dynsym).
+    Note: fields are integers (named like in the ELF specification, for example st_value).
+    The name is resolved through the linked string table, when it is accessed.
+"""
+
+from .string_table import STRING_TABLE
+
+
+class SYMBOL(object):
+    __slots__ = ("index", "st_name", "st_value", "st_size", "st_info", "st_other", "st_shndx", "string_table")
+
+    def __init__(self, index: int, values: tuple, isThirtyTwo: bool, string_table: STRING_TABLE) -> None:
+        """
+            Creates the symbol from its decoded values (in the order of the layout, see SYMBOL_LAYOUTS)
+        """
+        self.index = index
+        self.string_table = string_table
+        if isThirtyTwo:
+            (self.st_name, self.st_value, self.st_size, self.st_info, self.st_other, self.st_shndx) = values
+        else:
+            (self.st_name, self.st_info, self.st_other, self.st_shndx, self.st_value, self.st_size) = values
+
+    @property
+    def name(self) -> str:
+        if self.string_table is None:
+            return None
+        return self.string_table.get(self.st_name)
+
+    @property
+    def bind(self) -> int:
+        return self.st_info >> 4
+
+    @property
+    def type(self) -> int:
+        return self.st_info & 0xf
+
+    @property
+    def visibility(self) -> int:
+        return self.st_other & 0x3
+
+    def type_to_string(self) -> str:
+        if self.type == 0:
+            return "NOTYPE"
+        elif self.type == 1:
+            return "OBJECT"
+        elif self.type == 2:
+            return "FUNC"
+        elif self.type == 3:
+            return "SECTION"
+        elif self.type == 4:
+            return "FILE"
+        elif self.type == 5:
+            return "COMMON"
+        elif self.type == 6:
+            return "TLS"
+        elif self.type == 10:
+            return "GNU_IFUNC"
+        else:
+            return f"Unknown type (read {self.type})"
+
+    def bind_to_string(self) -> str:
+        if self.bind == 0:
+            return "LOCAL"
+        elif self.bind == 1:
+            return "GLOBAL"
+        elif self.bind == 2:
+            return "WEAK"
+        elif self.bind == 10:
+            return "GNU_UNIQUE"
+        else:
+            return f"Unknown bind (read {self.bind})"
+
+    def to_dict(self) -> dict:
+        """
+            Returns the symbol as dictionary of the integer fields and their string representations
+        """
+        return {
+            "index": self.index,
+            "name": self.name,
+            "type": self.type_to_string(),
+            "bind": self.bind_to_string(),
+            "st_name": self.st_name,
+            "st_value": self.st_value,
+            "st_size": self.st_size,
+            "st_info": self.st_info,
+            "st_other": self.st_other,
+            "st_shndx": self.st_shndx,
+        }
+
+    def __str__(self):
+        return f"{self.index:<7}"\
+            f"0x{self.st_value:<18x}"\
+            f"{self.st_size:<8}"\
+            f"{self.type_to_string():<10}"\
+            f"{self.bind_to_string():<8}"\
+            f"{self.st_shndx:<7}"\
+            f"{self.name}"
@@ -0,0 +1,108 @@
+"""
+    Lookup indexes over a symbol table.
+    Addresses are looked up with bisect over the symbols sorted by address. Names are looked up through the
+    hash table of the symbol table (.gnu.hash or .hash), if there is one. Otherwise a dictionary is built on the first lookup.
+"""
+
+from bisect import bisect_right
+
+from .string_table import STRING_TABLE
+from .symbol import SYMBOL
+from .table import ENTRY_TABLE
+
+SHN_UNDEF = 0
+# Symbols of these types have addresses: NOTYPE, OBJECT, FUNC, GNU_IFUNC
+ADDRESS_TYPES = (0, 1, 2, 10)
+
+
+class SYMBOL_INDEX(object):
+    def __init__(self, symbols: ENTRY_TABLE, string_table: STRING_TABLE, hash_table=None, intervals: tuple = None) -> None:
+        """
+            Builds the address index. The name dictionary is only built, if there is no hash table.
+
+            Parameters:
+                symbols: ENTRY_TABLE
+                    The symbol table (see ELF.read_symbol_table)
+                string_table: STRING_TABLE
+                    The linked string table
+                hash_table: GNU_HASH_TABLE | HASH_TABLE (default=None)
+                    The hash table of the symbol table
+                intervals: tuple (default=None)
+                    Already built address index (starts, ends, address_indexes, max_ends), for example from a cache
+        """
+        self.symbols = symbols
+        self.string_table = string_table
+        self.hash_table = hash_table
+        self.names: dict[str, int] = None
+
+        if intervals is not None:
+            self.starts, self.ends, self.address_indexes, self.max_ends = intervals
+            return
+
+        values = symbols.column("st_value")
+        sizes = symbols.column("st_size")
+        infos = symbols.column("st_info")
+        shndxs = symbols.column("st_shndx")
+        intervals = sorted(
+            (values[i], values[i] + sizes[i], i) for i in range(len(symbols))
+            if sizes[i] > 0 and shndxs[i] != SHN_UNDEF and infos[i] & 0xf in ADDRESS_TYPES)
+        self.starts = [interval[0] for interval in intervals]
+        self.ends = [interval[1] for interval in intervals]
+        self.address_indexes = [interval[2] for interval in intervals]
+
+        # Largest end of all symbols up to a position. Lookups stop walking back, once no earlier symbol can contain the address
+        self.max_ends = []
+        max_end = 0
+        for end in self.ends:
+            max_end = max(max_end, end)
+            self.max_ends.append(max_end)
+
+    def symbol_name(self, index: int) -> str:
+        return self.string_table.get(self.symbols.column("st_name")[index])
+
+    def by_address(self, address: int) -> SYMBOL:
+        """
+            Returns the symbol containing an address. For nested symbols the one starting closest to the address is returned
+
+            Parameters:
+                address: int
+                    The virtual address
+
+            Returns:
+                SYMBOL
+                    The symbol or None, if no symbol contains the address
+        """
+        position = bisect_right(self.starts, address) - 1
+        while position >= 0 and self.max_ends[position] > address:
+            if address < self.ends[position]:
+                return self.symbols[self.address_indexes[position]]
+            position -= 1
+        return None
+
+    def by_name(self, name: str) -> SYMBOL:
+        """
+            Returns the symbol with a name
+
+            Parameters:
+                name: str
+                    The symbol name
+
+            Returns:
+                SYMBOL
+                    The symbol or None, if there is no such symbol
+        """
+        if self.hash_table is not None:
+            index = self.hash_table.lookup(name, self.symbol_name)
+        else:
+            if self.names is None:
+                # Built completely before it is published (see SECTION_INDEX.by_name)
+                names = {}
+                shndxs = self.symbols.column("st_shndx")
+                for i, st_name in enumerate(self.symbols.column("st_name")):
+                    # Prefer defined symbols over undefined references with the same name
+                    string = self.string_table.get(st_name)
+                    if string not in names or shndxs[names[string]] == SHN_UNDEF:
+                        names[string] = i
+                self.names = names
+            index = self.names.get(name)
+        return None if index is None else self.symbols[index]
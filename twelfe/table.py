@@ -0,0 +1,164 @@
+"""
+    Represent a table of fixed size ELF entries, for example the section header table.
+    The whole table is decoded in one pass into integer columns (array.array).
+    Row objects (for example SECTION_HEADER) are only created when they are accessed.
+    Everything the rows have in common (source, layout, class and byte order) is stored once on the table.
+    Rows are not kept by the table: rows reference their table, so keeping them would form a reference cycle,
+    which keeps the table (and the file it reads from) alive until the garbage collector runs.
+"""
+
+import struct
+from array import array
+from typing import Any, Callable
+
+
+class ENTRY_TABLE(object):
+    def __init__(self, bytes: bytearray, start: int, count: int, entry_size: int,
+                 layout: struct.Struct, fields: tuple[str, ...], row_factory: Callable[["ENTRY_TABLE", int], Any],
+                 columns: dict[str, array] = None, isThirtyTwo: bool = None, isLittleEndian: bool = None,
+                 string_table=None) -> None:
+        """
+            Decodes the table.
+
+            Parameters:
+                bytes: bytearray
+                    The bytes of the ELF file
+                start: int
+                    Offset of the table in the file
+                count: int
+                    Number of entries in the table
+                entry_size: int
+                    Size of one entry in bytes. Can be larger than the layout, the rest of the entry is skipped
+                layout: struct.Struct
+                    Layout of one entry
+                fields: tuple[str, ...]
+                    Names of the fields, in the order of the layout
+                row_factory: Callable[[ENTRY_TABLE, int], Any]
+                    Creates the row object from the table and its index. Called on every access of a row.
+                    Should not reference the owner of the table (for example a bound method of ELF), else they form
+                    a reference cycle
+                columns: dict[str, array] (default=None)
+                    Already decoded columns (for example from a cache). If passed, bytes are not decoded
+                isThirtyTwo: bool (default=None)
+                    Class of the file, for the rows
+                isLittleEndian: bool (default=None)
+                    Byte order of the file, for the rows
+                string_table: STRING_TABLE (default=None)
+                    String table of the names of the entries (for example .shstrtab for the section header table)
+        """
+        self.source = bytes
+        self.start = start
+        self.entry_size = entry_size
+        self.layout = layout
+        self.fields = fields
+        self.row_factory = row_factory
+        self.isThirtyTwo = isThirtyTwo
+        self.isLittleEndian = isLittleEndian
+        self.string_table = string_table
+
+        if columns is not None:
+            self.columns = columns
+            self.count = len(columns[fields[0]]) if fields else 0
+            return
+
+        if count > 0 and entry_size < layout.size:
+            print(f"[!] Entry size {entry_size} is smaller than the expected size {layout.size}")
+            count = 0
+        elif start + count * entry_size > len(bytes):
+            print("[!] Table exceeds the file. Reading available entries only")
+            count = max(0, (len(bytes) - start) // entry_size)
+        self.count = count
+
+        if entry_size > layout.size:
+            layout = struct.Struct(f"{layout.format}{entry_size - layout.size}x")
+
+        values = zip(*layout.iter_unpack(bytes[start:start + count * entry_size]))
+        self.columns = {field: array("Q", column) for field, column in zip(fields, values)}
+        if count == 0:
+            self.columns = {field: array("Q") for field in fields}
+
+    @classmethod
+    def from_entry(cls, bytes: bytearray, index: int, layout: struct.Struct, fields: tuple[str, ...],
+                   row_factory: Callable[["ENTRY_TABLE", int], Any], values: tuple = None, isThirtyTwo: bool = None,
+                   isLittleEndian: bool = None) -> "ENTRY_TABLE":
+        """
+            Creates the table of a single entry, for example to decode one header on its own.
+            The entry keeps its index: the table starts index entries before bytes, the columns are 0 before the entry
+
+            Parameters:
+                bytes: bytearray
+                    The bytes of the entry
+                index: int
+                    Index of the entry
+                values: tuple (default=None)
+                    Already decoded values of the entry, in the order of the layout. If passed, bytes are not decoded
+                (see __init__ for the other parameters)
+
+            Returns:
+                ENTRY_TABLE
+                    The table with index + 1 entries
+        """
+        if values is None:
+            values = layout.unpack_from(bytes)
+        columns = {field: array("Q", [0]) * index + array("Q", [value]) for field, value in zip(fields, values)}
+        return cls(bytes, -index * layout.size, index + 1, layout.size, layout, fields, row_factory, columns,
+                   isThirtyTwo, isLittleEndian)
+
+    def column(self, field: str) -> array:
+        """
+            Returns all values of one field
+
+            Parameters:
+                field: str
+                    Name of the field, for example "sh_addr"
+
+            Returns:
+                array
+                    The values of the field, indexed by entry index
+        """
+        return self.columns[field]
+
+    def position(self, index: int) -> int:
+        """
+            Returns the offset of an entry in the file
+        """
+        return self.start + index * self.entry_size
+
+    def values(self, index: int) -> tuple:
+        """
+            Returns the decoded values of one entry, in the order of the layout
+        """
+        return tuple(self.columns[field][index] for field in self.fields)
+
+    def assign(self, index: int, values: tuple, fields: tuple[str, ...] = None) -> None:
+        """
+            Writes the values of one entry into the columns (the counterpart of values)
+
+            Parameters:
+                index: int
+                    Index of the entry
+                values: tuple
+                    The values, in the order of fields
+                fields: tuple[str, ...] (default=None)
+                    Names of the fields. Default: the fields of the table
+        """
+        for field, value in zip(fields or self.fields, values):
+            self.columns[field][index] = value
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError("Table index out of range")
+
+        return self.row_factory(self, index)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
@@ -1,9 +1,9 @@
 """
-    Contains utilities for reading bytes into hex strings
+    Contains utilities for reading bytes into hex strings and formatting integer fields as hex strings
 """
 
 
-def read_bytes(all_bytes: bytearray, start, end=0, count=0) -> str:
+def read_bytes(all_bytes: bytearray, start, end=0, count=0, isLittleEndian=True) -> str:
     """
         Reads a certain amount of bytes from a given bytearray.
 
@@ -16,26 +16,29 @@ def read_bytes(all_bytes: bytearray, start, end=0, count=0) -> str:
                 End address to read to (all_bytes[end] is *NOT* included in the output)
             count : int
                 Amount of bytes to read. (all_bytes[start+count] is *NOT* included in the output))
+            isLittleEndian : bool (default=True)
+                Byte order of the bytes. Only little endian bytes are reversed
 
         Returns:
             str
-                Returns the read bytes as a hexadecimal string in *REVERSED* order
-                If start, end or start+count are arger than the length of all_bytes, return all_bytes as a hexadecimal string in *REVERSED* order
+                Returns the read bytes as a hexadecimal string of the value (*REVERSED* order for little endian)
+                If start, end or start+count are arger than the length of all_bytes, return all_bytes as a hexadecimal string
     """
+    step = -1 if isLittleEndian else 1
     if start > len(all_bytes) or end > len(all_bytes) or start+count > len(all_bytes):
         print("[!] Index too large. Returning all bytes")
-        return all_bytes[::-1].hex()
+        return all_bytes[::step].hex()
 
     if end == 0 and count == 0:
         end = start+1
 
     if end != 0:
-        return all_bytes[start:end][::-1].hex()
+        return all_bytes[start:end][::step].hex()
 
     if count != 0:
-        return all_bytes[start:start+count][::-1].hex()
+        return all_bytes[start:start+count][::step].hex()
 
-    return all_bytes[::-1].hex()
+    return all_bytes[::step].hex()
 
 
 def read_until_nullbyte(all_bytes: bytearray, start):
@@ -63,3 +66,71 @@ def read_until_nullbyte(all_bytes: bytearray, start):
             return bytearray(read_bytes)[::-1].hex()
         else:
             read_bytes.append(b)
+
+
+def to_hex(value: int, size: int) -> str:
+    """
+        Formats an integer as hexadecimal string, zero padded to the size of the field
+
+        Parameters:
+            value: int
+                The value to format
+            size : int
+                Size of the field in bytes
+
+        Returns:
+            str
+                The value as hexadecimal string with 2*size digits (same format as read_bytes)
+    """
+    return format(value, f"0{size * 2}x")
+
+
+def column_field(field: str) -> property:
+    """
+        Creates a property which returns an integer field of a row from the columns of its table
+        (see ENTRY_TABLE). Used by rows which only store their table and their index.
+        Setting the property writes the value into the column, so every row of the same entry sees it.
+
+        Parameters:
+            field: str
+                Name of the column
+
+        Returns:
+            property
+                The property returning the value of the field
+    """
+    def getter(self) -> int:
+        return self.table.columns[field][self.index]
+
+    def setter(self, value: int) -> None:
+        self.table.columns[field][self.index] = value
+
+    return property(getter, setter)
+
+
+def hex_field(field: str, size: int = 0) -> property:
+    """
+        Creates a property which returns an integer field as hexadecimal string.
+        Used to keep the string fields of the headers available. They are only computed on access.
+        Setting the property parses the hexadecimal string and sets the integer field.
+
+        Parameters:
+            field: str
+                Name of the integer attribute
+            size : int (default=0)
+                Size of the field in bytes. 0 means word size (4 bytes for 32-bit, 8 bytes for 64-bit)
+
+        Returns:
+            property
+                The property returning the hexadecimal string (or None, if the field is not set)
+    """
+    def getter(self) -> str:
+        value = getattr(self, field)
+        if value is None:
+            return None
+        return to_hex(value, size or (4 if self.isThirtyTwo else 8))
+
+    def setter(self, value: str) -> None:
+        setattr(self, field, None if value is None else int(value, 16))
+
+    return property(getter, setter)